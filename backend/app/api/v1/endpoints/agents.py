@@ -1,24 +1,41 @@
+from datetime import date
 from uuid import UUID
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 
 from app.application.dto.agent import AgentCreate, AgentResponse, AgentStats, AgentUpdate
 from app.application.services.agent_service import AgentService
+from app.api.v1.fields import fields_param, list_response
+from app.api.v1.pagination import PageParams, set_page_headers
 from app.core.deps import AdminUser, InternalUser
 
 router = APIRouter()
 
 
 @router.get("", response_model=list[AgentResponse])
-async def list_agents(_: InternalUser):
+async def list_agents(
+    response: Response,
+    page: PageParams,
+    _: InternalUser,
+    fields: set[str] | None = Depends(fields_param(AgentResponse)),
+):
     service = AgentService()
-    return await service.get_all()
+    if page is None:
+        return list_response(response, await service.get_all(fields), fields)
+    result = await service.get_page(page, fields)
+    set_page_headers(response, result)
+    return list_response(response, result.items, fields)
 
 
 @router.get("/stats", response_model=list[AgentStats])
-async def get_agent_stats(_: InternalUser):
+async def get_agent_stats(
+    company_id: UUID | None = None,
+    date_from: date | None = None,
+    date_to: date | None = None,
+    _: InternalUser = None,
+):
     service = AgentService()
-    return await service.get_stats()
+    return await service.get_stats(company_id=company_id, date_from=date_from, date_to=date_to)
 
 
 @router.get("/{agent_id}", response_model=AgentResponse)
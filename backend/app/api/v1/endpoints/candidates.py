@@ -1,6 +1,7 @@
+from datetime import date
 from uuid import UUID
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 
 from app.application.dto.candidate import (
     CandidateCreate,
@@ -11,6 +12,8 @@ from app.application.dto.candidate import (
     FunnelStats,
 )
 from app.application.services.candidate_service import CandidateService
+from app.api.v1.fields import fields_param, list_response
+from app.api.v1.pagination import PageParams, set_page_headers
 from app.core.deps import InternalUser
 from app.domain.entities.user import UserRole
 
@@ -19,25 +22,47 @@ router = APIRouter()
 
 @router.get("", response_model=list[CandidateWithRelations])
 async def list_candidates(
+    response: Response,
+    page: PageParams,
     company_id: UUID | None = None,
     job_position_id: UUID | None = None,
     agent_id: UUID | None = None,
     owner_user_id: UUID | None = None,
+    fields: set[str] | None = Depends(fields_param(CandidateWithRelations)),
     _: InternalUser = None,
 ):
     service = CandidateService()
-    return await service.get_all(
+    filters = dict(
         company_id=company_id,
         job_position_id=job_position_id,
         agent_id=agent_id,
         owner_user_id=owner_user_id,
+        fields=fields,
     )
+    if page is None:
+        return list_response(response, await service.get_all(**filters), fields)
+    result = await service.get_page(page, **filters)
+    set_page_headers(response, result)
+    return list_response(response, result.items, fields)
 
 
 @router.get("/funnel", response_model=FunnelStats)
-async def get_funnel_stats(company_id: UUID | None = None, _: InternalUser = None):
+async def get_funnel_stats(
+    company_id: UUID | None = None,
+    job_position_id: UUID | None = None,
+    agent_id: UUID | None = None,
+    date_from: date | None = None,
+    date_to: date | None = None,
+    _: InternalUser = None,
+):
     service = CandidateService()
-    return await service.get_funnel_stats(company_id)
+    return await service.get_funnel_stats(
+        company_id=company_id,
+        job_position_id=job_position_id,
+        agent_id=agent_id,
+        date_from=date_from,
+        date_to=date_to,
+    )
 
 
 @router.get("/dashboard-stats", response_model=DashboardStats)
@@ -1,7 +1,9 @@
 from uuid import UUID
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request, Response
 
+from app.api.v1.etag import is_not_modified, make_etag
+from app.api.v1.rendering import rendered_report_response
 from app.application.dto.candidate import ClientCandidateWithRelations
 from app.application.dto.criteria import CriteriaGroupWithItems
 from app.application.dto.interview import (
@@ -14,6 +16,7 @@ from app.application.services.candidate_service import CandidateService
 from app.application.services.criteria_service import CriteriaService
 from app.application.services.interview_service import InterviewService
 from app.application.services.job_position_service import JobPositionService
+from app.application.services.report_renderer import RenderFormat
 from app.application.services.report_service import ReportService
 from app.core.deps import CurrentUser
 from app.domain.entities.user import UserRole
@@ -69,7 +72,12 @@ async def list_client_job_positions(current_user: CurrentUser):
 
 
 @router.get("/criteria/groups/with-items", response_model=list[CriteriaGroupWithItems])
-async def list_client_criteria_groups_with_items(job_position_id: UUID, current_user: CurrentUser):
+async def list_client_criteria_groups_with_items(
+    job_position_id: UUID,
+    request: Request,
+    response: Response,
+    current_user: CurrentUser,
+):
     company_id = require_client(current_user)
     position_service = JobPositionService()
     position = await position_service.get_by_id(job_position_id)
@@ -77,7 +85,12 @@ async def list_client_criteria_groups_with_items(job_position_id: UUID, current_
         raise HTTPException(status_code=404, detail="Job position not found")
 
     service = CriteriaService()
-    return await service.get_groups_with_items(job_position_id)
+    tree = await service.get_tree(job_position_id)
+    etag = make_etag(tree.version)
+    if is_not_modified(request, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    return list(tree.groups)
 
 
 @router.get(
@@ -112,10 +125,7 @@ async def get_client_interview_by_candidate(candidate_id: UUID, current_user: Cu
     )
 
 
-@router.get("/reports/{interview_id}")
-async def get_client_report(interview_id: UUID, current_user: CurrentUser):
-    company_id = require_client(current_user)
-
+async def _get_client_report_markdown(interview_id: UUID, company_id: UUID) -> str:
     interview_service = InterviewService()
     interview = await interview_service.get_by_id(interview_id)
     if not interview:
@@ -127,7 +137,24 @@ async def get_client_report(interview_id: UUID, current_user: CurrentUser):
         raise HTTPException(status_code=404, detail="Interview not found")
 
     report_service = ReportService()
-    markdown = await report_service.generate_client_report(interview_id)
+    markdown = await report_service.get_client_report(interview_id)
     if not markdown:
         raise HTTPException(status_code=404, detail="Interview not found")
+    return markdown
+
+
+# /reports/{interview_id} より先に登録する
+@router.get("/reports/{interview_id}.{format}")
+async def render_client_report(
+    interview_id: UUID, format: RenderFormat, request: Request, current_user: CurrentUser
+):
+    company_id = require_client(current_user)
+    markdown = await _get_client_report_markdown(interview_id, company_id)
+    return await rendered_report_response(request, markdown, format, f"report_{interview_id}")
+
+
+@router.get("/reports/{interview_id}")
+async def get_client_report(interview_id: UUID, current_user: CurrentUser):
+    company_id = require_client(current_user)
+    markdown = await _get_client_report_markdown(interview_id, company_id)
     return {"markdown": markdown}
@@ -1,12 +1,15 @@
 from uuid import UUID, uuid4
 
-from fastapi import APIRouter, Depends, HTTPException
-import httpx
-from pydantic import BaseModel, EmailStr
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Response
+from pydantic import BaseModel, EmailStr, Field
 
 from app.application.dto.company import CompanyCreate, CompanyResponse, CompanyUpdate
 from app.application.services.company_service import CompanyService
-from app.core.deps import AdminUser, InternalUser
+from app.api.v1.fields import fields_param, list_response
+from app.api.v1.pagination import PageParams, set_page_headers
+from app.core.clerk import create_clerk_invitation
+from app.core.concurrency import gather_limited
+from app.core.deps import AdminUser, InternalUser, invalidate_principals, sync_client_display_name
 from app.core.config import Settings, get_settings
 from app.domain.entities.user import User, UserRole
 from app.infrastructure.repositories.user_repository import UserRepository
@@ -18,10 +21,23 @@ class CompanyInviteRequest(BaseModel):
     email: EmailStr
 
 
+class CompanyBulkInviteRequest(BaseModel):
+    emails: list[EmailStr] = Field(min_length=1, max_length=500)
+
+
 @router.get("", response_model=list[CompanyResponse])
-async def list_companies(_: InternalUser):
+async def list_companies(
+    response: Response,
+    page: PageParams,
+    _: InternalUser,
+    fields: set[str] | None = Depends(fields_param(CompanyResponse)),
+):
     service = CompanyService()
-    return await service.get_all()
+    if page is None:
+        return list_response(response, await service.get_all(fields), fields)
+    result = await service.get_page(page, fields)
+    set_page_headers(response, result)
+    return list_response(response, result.items, fields)
 
 
 @router.get("/{company_id}", response_model=CompanyResponse)
@@ -40,11 +56,20 @@ async def create_company(data: CompanyCreate, _: AdminUser):
 
 
 @router.patch("/{company_id}", response_model=CompanyResponse)
-async def update_company(company_id: UUID, data: CompanyUpdate, _: AdminUser):
+async def update_company(
+    company_id: UUID,
+    data: CompanyUpdate,
+    _: AdminUser,
+    background_tasks: BackgroundTasks,
+):
     service = CompanyService()
     company = await service.update(company_id, data)
     if not company:
         raise HTTPException(status_code=404, detail="Company not found")
+    # クライアントユーザーの表示名は企業名に追従する
+    invalidate_principals(company_id=company_id)
+    if data.name is not None:
+        background_tasks.add_task(sync_client_display_name, company_id, company.name)
     return company
 
 
@@ -54,6 +79,7 @@ async def delete_company(company_id: UUID, _: AdminUser):
     result = await service.delete(company_id)
     if not result:
         raise HTTPException(status_code=404, detail="Company not found")
+    invalidate_principals(company_id=company_id)
     return {"message": "Company deleted"}
 
 
@@ -64,7 +90,37 @@ async def invite_company_user(
     _: AdminUser,
     settings: Settings = Depends(get_settings),
 ):
-    invited_email = data.email.lower()
+    company = await _get_company_for_invite(company_id, settings)
+    return await _invite_company_user(company, data.email.lower(), settings)
+
+
+@router.post("/{company_id}/invites")
+async def bulk_invite_company_users(
+    company_id: UUID,
+    data: CompanyBulkInviteRequest,
+    _: AdminUser,
+    settings: Settings = Depends(get_settings),
+):
+    company = await _get_company_for_invite(company_id, settings)
+    emails = list(dict.fromkeys(email.lower() for email in data.emails))
+
+    async def invite(email: str) -> dict:
+        try:
+            invitation = await _invite_company_user(company, email, settings)
+            return {"email": email, "status": "invited", "invitation": invitation}
+        except HTTPException as e:
+            return {"email": email, "status": "failed", "detail": e.detail}
+        except Exception as e:
+            return {"email": email, "status": "failed", "detail": str(e)}
+
+    # ClerkのレートリミットとSupabaseへの同時書き込みを考慮して同時実行数を制限する
+    results = await gather_limited(
+        *(invite(email) for email in emails), limit=settings.clerk_invite_concurrency
+    )
+    return {"results": results}
+
+
+async def _get_company_for_invite(company_id: UUID, settings: Settings) -> CompanyResponse:
     service = CompanyService()
     company = await service.get_by_id(company_id)
     if not company:
@@ -72,6 +128,11 @@ async def invite_company_user(
 
     if not settings.clerk_secret_key:
         raise HTTPException(status_code=500, detail="CLERK_SECRET_KEY is not configured")
+    return company
+
+
+async def _invite_company_user(company: CompanyResponse, invited_email: str, settings: Settings) -> dict:
+    company_id = company.id
 
     # When a redirect URL is set for an invitation, Clerk will send the user there to accept it.
     # We point to our SignUp page which contains the Clerk <SignUp /> component.
@@ -84,12 +145,7 @@ async def invite_company_user(
         "notify": True,
     }
 
-    async with httpx.AsyncClient() as client:
-        response = await client.post(
-            "https://api.clerk.com/v1/invitations",
-            headers={"Authorization": f"Bearer {settings.clerk_secret_key}"},
-            json=payload,
-        )
+    response = await create_clerk_invitation(payload, settings.clerk_secret_key)
 
     if response.status_code >= 400:
         raise HTTPException(
@@ -98,7 +154,6 @@ async def invite_company_user(
         )
 
     invitation = response.json()
-
     # Pre-provision an invite-only client user in Supabase so the app can link the Clerk account by email later.
     user_repo = UserRepository()
     existing = await user_repo.find_by_email(invited_email)
@@ -112,6 +167,7 @@ async def invite_company_user(
         if existing.name != company.name:
             existing.name = company.name
         await user_repo.update(existing)
+        invalidate_principals(clerk_id=existing.clerk_id)
     else:
         invitation_id = invitation.get("id") or uuid4()
         placeholder_clerk_id = f"invitation:{invitation_id}"
@@ -1,6 +1,6 @@
 from uuid import UUID
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request, Response
 
 from app.application.dto.criteria import (
     CriteriaGroupCreate,
@@ -11,6 +11,7 @@ from app.application.dto.criteria import (
     CriteriaItemResponse,
     CriteriaItemUpdate,
 )
+from app.api.v1.etag import is_not_modified, make_etag
 from app.application.services.criteria_service import CriteriaService
 from app.core.deps import AdminUser, InternalUser
 
@@ -24,9 +25,19 @@ async def list_criteria_groups(job_position_id: UUID, _: InternalUser):
 
 
 @router.get("/groups/with-items", response_model=list[CriteriaGroupWithItems])
-async def list_criteria_groups_with_items(job_position_id: UUID, _: InternalUser):
+async def list_criteria_groups_with_items(
+    job_position_id: UUID,
+    request: Request,
+    response: Response,
+    _: InternalUser,
+):
     service = CriteriaService()
-    return await service.get_groups_with_items(job_position_id)
+    tree = await service.get_tree(job_position_id)
+    etag = make_etag(tree.version)
+    if is_not_modified(request, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    return list(tree.groups)
 
 
 @router.post("/groups", response_model=CriteriaGroupResponse)
@@ -1,21 +1,128 @@
+import importlib.util
+from datetime import datetime, timezone
 from uuid import UUID
 
-from fastapi import APIRouter
+from fastapi import APIRouter, HTTPException
 from fastapi.responses import StreamingResponse
 
+from app.application.dto.export import ExportJobCreate, ExportJobResponse
+from app.application.services.export_job_runner import EXPORT_FORMATS, get_export_job_runner
 from app.application.services.export_service import ExportService
+from app.domain.entities.export_job import ExportJobKind, ExportJobStatus
 from app.core.deps import InternalUser
+from app.infrastructure.artifact_storage import ArtifactNotFoundError
 
 router = APIRouter()
 
 
+def _require_pyarrow() -> None:
+    if importlib.util.find_spec("pyarrow") is None:
+        raise HTTPException(
+            status_code=501,
+            detail="Parquet export requires the 'analytics' extra (pyarrow)",
+        )
+
+
 @router.get("/candidates")
 async def export_candidates_csv(company_id: UUID | None = None, _: InternalUser = None):
     service = ExportService()
-    csv_content = await service.export_candidates_csv(company_id)
-
     return StreamingResponse(
-        iter([csv_content]),
+        service.stream_candidates_csv(company_id),
         media_type="text/csv",
         headers={"Content-Disposition": "attachment; filename=candidates_export.csv"},
     )
+
+
+@router.get("/candidates/wide")
+async def export_candidates_wide_csv(
+    job_position_id: UUID,
+    company_id: UUID | None = None,
+    include_comments: bool = False,
+    _: InternalUser = None,
+):
+    service = ExportService()
+    return StreamingResponse(
+        service.stream_candidates_wide_csv(job_position_id, company_id, include_comments),
+        media_type="text/csv",
+        headers={"Content-Disposition": "attachment; filename=candidates_wide_export.csv"},
+    )
+
+
+@router.get("/candidates.parquet")
+async def export_candidates_parquet(
+    company_id: UUID | None = None,
+    job_position_id: UUID | None = None,
+    _: InternalUser = None,
+):
+    _require_pyarrow()
+    service = ExportService()
+    return StreamingResponse(
+        service.stream_candidates_parquet(company_id, job_position_id),
+        media_type="application/vnd.apache.parquet",
+        headers={"Content-Disposition": "attachment; filename=candidates_export.parquet"},
+    )
+
+
+@router.get("/delta")
+async def export_delta(since: datetime | None = None, _: InternalUser = None):
+    # since は前回レスポンス最終行の watermark。未指定なら全件
+    if since is not None and since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    service = ExportService()
+    until = await service.get_delta_watermark()
+    # 時計の戻りなどで since が上限を越えている場合は空の差分として since を返す
+    if since is not None and since > until:
+        until = since
+    if since is not None and since < service.delta_window_start(until):
+        raise HTTPException(
+            status_code=410,
+            detail="since is older than the maximum sync gap; run a full sync without since",
+        )
+    return StreamingResponse(
+        service.stream_delta(since, until),
+        media_type="application/x-ndjson",
+    )
+
+
+@router.post("/jobs", response_model=ExportJobResponse, status_code=202)
+async def create_export_job(data: ExportJobCreate, _: InternalUser = None):
+    if data.kind == ExportJobKind.CANDIDATES_WIDE_CSV and data.job_position_id is None:
+        raise HTTPException(
+            status_code=400, detail="job_position_id is required for candidates_wide_csv"
+        )
+    if data.kind == ExportJobKind.CANDIDATES_PARQUET:
+        _require_pyarrow()
+    job = await get_export_job_runner().submit(data)
+    return ExportJobResponse.model_validate(job.model_dump())
+
+
+@router.get("/jobs/{job_id}", response_model=ExportJobResponse)
+async def get_export_job(job_id: UUID, _: InternalUser = None):
+    job = get_export_job_runner().get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Export job not found")
+    return ExportJobResponse.model_validate(job.model_dump())
+
+
+@router.get("/jobs/{job_id}/download")
+async def download_export_job(job_id: UUID, _: InternalUser = None):
+    runner = get_export_job_runner()
+    job = runner.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Export job not found")
+    if job.status != ExportJobStatus.SUCCEEDED:
+        raise HTTPException(status_code=409, detail=f"Export job is {job.status.value}")
+    extension, media_type = EXPORT_FORMATS[job.kind]
+    try:
+        chunks = await runner.read_artifact(job)
+    except ArtifactNotFoundError:
+        # 保持期間切れの掃除と競合した場合
+        raise HTTPException(status_code=410, detail="Export artifact has expired")
+    return StreamingResponse(
+        chunks,
+        media_type=media_type,
+        headers={
+            "Content-Disposition": f"attachment; filename={job.kind.value}_export.{extension}",
+            "Content-Length": str(job.size_bytes),
+        },
+    )
@@ -1,5 +1,8 @@
 from fastapi import APIRouter
 
+from app.core.deps import AdminUser
+from app.infrastructure.cache import cache_stats
+
 router = APIRouter()
 
 
@@ -7,3 +10,7 @@ router = APIRouter()
 async def health_check():
     return {"status": "ok", "message": "API is running"}
 
+
+@router.get("/cache")
+async def get_cache_stats(_: AdminUser):
+    return cache_stats()
@@ -1,6 +1,6 @@
 from uuid import UUID
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 
 from app.application.dto.interview import (
     InterviewCreate,
@@ -10,13 +10,20 @@ from app.application.dto.interview import (
     InterviewQuestionResponseDTO,
     InterviewQuestionResponseUpdate,
     InterviewResponse,
+    InterviewSummary,
+    InterviewTranscript,
     InterviewUpdate,
     InterviewWithDetails,
 )
+from app.application.dto.pagination import PageRequest
 from app.application.services.candidate_service import CandidateService
 from app.application.services.interview_service import InterviewService
+from app.api.v1.fields import fields_param, list_response
+from app.api.v1.pagination import PageParams, set_page_headers
+from app.core.config import get_settings
 from app.core.deps import InternalUser
 from app.domain.entities.user import UserRole
+from app.infrastructure.repositories.interview_repository import INTERVIEW_HEAVY_COLUMNS
 
 router = APIRouter()
 
@@ -31,6 +38,25 @@ async def check_candidate_access(candidate_id: UUID, current_user: InternalUser)
     return candidate
 
 
+@router.get("", response_model=list[InterviewSummary])
+async def list_interviews(
+    response: Response,
+    page: PageParams,
+    _: InternalUser,
+    fields: set[str] | None = Depends(
+        fields_param(InterviewResponse, exclude=INTERVIEW_HEAVY_COLUMNS)
+    ),
+):
+    # 面談一覧は常にページングする（limit省略時は既定のページサイズ）
+    page = page or PageRequest(limit=get_settings().page_size_default)
+    # 文字起こし全文・レポート本文は GET /interviews/{id}/transcript 等の詳細APIで取得する
+    fields = fields or set(InterviewSummary.model_fields)
+    service = InterviewService()
+    result = await service.get_page(page, fields)
+    set_page_headers(response, result)
+    return list_response(response, result.items, fields)
+
+
 @router.get("/by-candidate/{candidate_id}", response_model=InterviewWithDetails | None)
 async def get_interview_by_candidate(candidate_id: UUID, _: InternalUser):
     service = InterviewService()
@@ -46,6 +72,15 @@ async def get_interview(interview_id: UUID, _: InternalUser):
     return interview
 
 
+@router.get("/{interview_id}/transcript", response_model=InterviewTranscript)
+async def get_interview_transcript(interview_id: UUID, _: InternalUser):
+    service = InterviewService()
+    transcript = await service.get_transcript(interview_id)
+    if not transcript:
+        raise HTTPException(status_code=404, detail="Interview not found")
+    return transcript
+
+
 @router.post("", response_model=InterviewResponse)
 async def create_interview(data: InterviewCreate, current_user: InternalUser):
     await check_candidate_access(data.candidate_id, current_user)
@@ -1,17 +1,35 @@
 from uuid import UUID
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import StreamingResponse
 
+from app.api.v1.rendering import rendered_report_response
+from app.application.dto.report import BulkReportRequest
+from app.application.services.report_renderer import RenderFormat
 from app.application.services.report_service import ReportService
 from app.core.deps import InternalUser
 
 router = APIRouter()
 
 
+# /client/{interview_id} より先に登録する（後だと "<id>.pdf" が面談IDとして扱われる）
+@router.get("/client/{interview_id}.{format}")
+async def render_client_report(
+    interview_id: UUID, format: RenderFormat, request: Request, _: InternalUser
+):
+    service = ReportService()
+    markdown = await service.get_client_report(interview_id)
+    if not markdown:
+        raise HTTPException(status_code=404, detail="Interview not found")
+    return await rendered_report_response(
+        request, markdown, format, f"client_report_{interview_id}"
+    )
+
+
 @router.get("/client/{interview_id}")
 async def generate_client_report(interview_id: UUID, _: InternalUser):
     service = ReportService()
-    markdown = await service.generate_client_report(interview_id)
+    markdown = await service.get_client_report(interview_id)
     if not markdown:
         raise HTTPException(status_code=404, detail="Interview not found")
     return {"markdown": markdown}
@@ -20,7 +38,24 @@ async def generate_client_report(interview_id: UUID, _: InternalUser):
 @router.get("/agent/{interview_id}")
 async def generate_agent_report(interview_id: UUID, _: InternalUser):
     service = ReportService()
-    markdown = await service.generate_agent_report(interview_id)
+    markdown = await service.get_agent_report(interview_id)
     if not markdown:
         raise HTTPException(status_code=404, detail="Interview not found")
     return {"markdown": markdown}
+
+
+@router.post("/bulk")
+async def generate_bulk_reports(data: BulkReportRequest, _: InternalUser):
+    if (data.interview_ids is None) == (data.job_position_id is None):
+        raise HTTPException(
+            status_code=400, detail="Specify exactly one of interview_ids or job_position_id"
+        )
+    service = ReportService()
+    return StreamingResponse(
+        service.stream_bulk_reports(
+            list(dict.fromkeys(data.report_types)),
+            interview_ids=list(dict.fromkeys(data.interview_ids)) if data.interview_ids else None,
+            job_position_id=data.job_position_id,
+        ),
+        media_type="application/x-ndjson",
+    )
@@ -5,7 +5,7 @@ from fastapi import APIRouter, HTTPException
 from app.application.dto.user import UserCreate, UserResponse, UserUpdate
 from app.core.deps import AdminUser, CurrentUser
 from app.domain.entities.user import User
-from app.core.deps import is_allowed_email_domain
+from app.core.deps import invalidate_principals, is_allowed_email_domain
 from app.domain.entities.user import UserRole
 from app.infrastructure.repositories.company_repository import CompanyRepository
 from app.infrastructure.repositories.user_repository import UserRepository
@@ -55,6 +55,7 @@ async def create_user(data: UserCreate, _: AdminUser):
         updated_at=now,
     )
     created = await repo.create(user)
+    invalidate_principals(clerk_id=created.clerk_id)
     return UserResponse.model_validate(created.model_dump())
 
 
@@ -91,4 +92,5 @@ async def update_user(user_id: UUID, data: UserUpdate, _: AdminUser):
         user.name = company.name
 
     updated = await repo.update(user)
+    invalidate_principals(clerk_id=updated.clerk_id)
     return UserResponse.model_validate(updated.model_dump())
@@ -0,0 +1,57 @@
+from fastapi import APIRouter, Depends, HTTPException, Request
+
+from app.application.services.user_provisioning_service import (
+    UserProvisioningError,
+    UserProvisioningService,
+)
+from app.core.clerk import WEBHOOK_TOLERANCE_SECONDS, WebhookVerificationError, verify_webhook
+from app.core.config import Settings, get_settings
+from app.core.deps import invalidate_principals
+from app.infrastructure.cache import TTLCache
+
+router = APIRouter()
+
+USER_EVENTS = {"user.created", "user.updated"}
+
+# 処理済みの svix-id。タイムスタンプの許容範囲内に同じメッセージが再び届いても（リプレイ）処理しない。
+# 失敗した配信はSvixが同じ svix-id で再送するため、記録するのは処理が終わってから。
+# インスタンスごとの記録なので、別インスタンスへの再送はユーザー作成の冪等性で吸収する
+_processed_messages: TTLCache[str, bool] = TTLCache(
+    "clerk_webhook_messages", maxsize=10000, ttl=2 * WEBHOOK_TOLERANCE_SECONDS
+)
+
+
+@router.post("/clerk")
+async def receive_clerk_webhook(request: Request, settings: Settings = Depends(get_settings)):
+    if not settings.clerk_webhook_secret:
+        raise HTTPException(status_code=500, detail="CLERK_WEBHOOK_SECRET is not configured")
+
+    body = await request.body()
+    try:
+        event = verify_webhook(settings.clerk_webhook_secret, request.headers, body)
+    except WebhookVerificationError as e:
+        raise HTTPException(status_code=401, detail=f"Invalid webhook: {e}")
+
+    message_id = request.headers["svix-id"]
+    if _processed_messages.get(message_id):
+        return {"status": "duplicate"}
+    result = await _handle_event(event)
+    _processed_messages.set(message_id, True)
+    return result
+
+
+async def _handle_event(event: dict) -> dict:
+    event_type = event.get("type")
+    data = event.get("data") or {}
+    clerk_user_id = data.get("id")
+    if event_type not in USER_EVENTS or not clerk_user_id:
+        return {"status": "ignored"}
+
+    try:
+        user = await UserProvisioningService().provision(clerk_user_id, data)
+    except UserProvisioningError as e:
+        # 招待されていない外部ユーザー等。再送されても結果は変わらないため2xxで返す
+        return {"status": "skipped", "reason": str(e)}
+
+    invalidate_principals(clerk_id=clerk_user_id)
+    return {"status": "ok", "user_id": str(user.id)}
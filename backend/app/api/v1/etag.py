@@ -0,0 +1,14 @@
+from fastapi import Request
+
+
+def make_etag(version: str) -> str:
+    return f'"{version}"'
+
+
+def is_not_modified(request: Request, etag: str) -> bool:
+    """If-None-Match ヘッダーが現在のETagと一致するか判定する"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = [value.strip().removeprefix("W/") for value in header.split(",")]
+    return "*" in candidates or etag in candidates
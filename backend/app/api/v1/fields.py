@@ -0,0 +1,46 @@
+from collections.abc import Callable, Iterable
+from typing import Annotated
+
+from fastapi import HTTPException, Query, Response
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+from app.api.v1.pagination import NEXT_CURSOR_HEADER, TOTAL_COUNT_HEADER
+
+
+def fields_param(
+    model: type[BaseModel], exclude: Iterable[str] = ()
+) -> Callable[[str | None], set[str] | None]:
+    """
+    `fields=name,company_name` 形式のスパースフィールドセットを受け取る依存関数を作る。
+    id は常に含める。exclude の項目は一覧では指定できない（詳細エンドポイントで取得する）。
+    """
+    allowed = {name for name in model.model_fields if name not in set(exclude)}
+
+    def dependency(
+        fields: Annotated[
+            str | None, Query(description="カンマ区切りで返却する項目を指定する")
+        ] = None,
+    ) -> set[str] | None:
+        if fields is None:
+            return None
+        requested = {name.strip() for name in fields.split(",") if name.strip()}
+        unknown = requested - allowed
+        if unknown:
+            raise HTTPException(
+                status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}"
+            )
+        return requested | {"id"}
+
+    return dependency
+
+
+def list_response(response: Response, items: list[BaseModel], fields: set[str] | None):
+    """fields 指定時は指定項目のみのJSONを返す（ページングヘッダーは引き継ぐ）"""
+    if fields is None:
+        return items
+    sparse = JSONResponse([item.model_dump(mode="json", include=fields) for item in items])
+    for header in (NEXT_CURSOR_HEADER, TOTAL_COUNT_HEADER):
+        if header in response.headers:
+            sparse.headers[header] = response.headers[header]
+    return sparse
@@ -0,0 +1,43 @@
+from typing import Annotated
+
+from fastapi import Depends, HTTPException, Query, Response
+
+from app.application.dto.pagination import Page, PageRequest
+from app.core.config import get_settings
+from app.infrastructure.pagination import InvalidCursorError, decode_cursor
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+TOTAL_COUNT_HEADER = "X-Total-Count"
+
+
+def page_params(
+    cursor: str | None = None,
+    limit: Annotated[int | None, Query(ge=1)] = None,
+    include_count: bool = False,
+) -> PageRequest | None:
+    """
+    cursor / limit のどちらも指定されない場合は None（従来どおり全件を返す互換動作）。
+    """
+    if cursor is None and limit is None:
+        return None
+    if cursor is not None:
+        try:
+            decode_cursor(cursor)
+        except InvalidCursorError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    settings = get_settings()
+    return PageRequest(
+        cursor=cursor,
+        limit=min(limit or settings.page_size_default, settings.page_size_max),
+        include_count=include_count,
+    )
+
+
+PageParams = Annotated[PageRequest | None, Depends(page_params)]
+
+
+def set_page_headers(response: Response, page: Page) -> None:
+    if page.next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = page.next_cursor
+    if page.total_count is not None:
+        response.headers[TOTAL_COUNT_HEADER] = str(page.total_count)
@@ -0,0 +1,43 @@
+import importlib.util
+
+from fastapi import HTTPException, Request, Response
+
+from app.api.v1.etag import is_not_modified, make_etag
+from app.application.services.report_renderer import (
+    MEDIA_TYPES,
+    RenderFormat,
+    RenderQueueFullError,
+    RenderWorkerCrashedError,
+    content_hash,
+    get_report_renderer,
+)
+
+RENDER_RETRY_AFTER_SECONDS = 5
+
+
+async def rendered_report_response(
+    request: Request, markdown: str, format: RenderFormat, filename: str
+) -> Response:
+    """レポートMarkdownをHTML/PDFに変換して返す。ETagは内容ハッシュ"""
+    if format == "pdf" and importlib.util.find_spec("reportlab") is None:
+        raise HTTPException(
+            status_code=501, detail="PDF rendering requires the 'reports' extra (reportlab)"
+        )
+
+    etag = make_etag(f"{content_hash(markdown)[:32]}.{format}")
+    if is_not_modified(request, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+
+    try:
+        data = await get_report_renderer().render(markdown, format)
+    except (RenderQueueFullError, RenderWorkerCrashedError) as e:
+        raise HTTPException(
+            status_code=503,
+            detail=str(e),
+            headers={"Retry-After": str(RENDER_RETRY_AFTER_SECONDS)},
+        )
+    return Response(
+        content=data,
+        media_type=MEDIA_TYPES[format],
+        headers={"ETag": etag, "Content-Disposition": f'inline; filename="{filename}.{format}"'},
+    )
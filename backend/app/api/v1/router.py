@@ -12,6 +12,7 @@ from app.api.v1.endpoints import (
     job_positions,
     reports,
     users,
+    webhooks,
 )
 
 api_router = APIRouter()
@@ -27,3 +28,4 @@ api_router.include_router(interviews.router, prefix="/interviews", tags=["interv
 api_router.include_router(reports.router, prefix="/reports", tags=["reports"])
 api_router.include_router(export.router, prefix="/export", tags=["export"])
 api_router.include_router(client.router, prefix="/client", tags=["client"])
+api_router.include_router(webhooks.router, prefix="/webhooks", tags=["webhooks"])
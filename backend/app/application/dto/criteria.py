@@ -1,7 +1,7 @@
 from datetime import datetime
 from uuid import UUID
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 
 class CriteriaGroupCreate(BaseModel):
@@ -45,6 +45,9 @@ class CriteriaItemUpdate(BaseModel):
 
 
 class CriteriaItemResponse(BaseModel):
+    # 定性要件ツリーのキャッシュに入るため不変にする
+    model_config = ConfigDict(frozen=True)
+
     id: UUID
     criteria_group_id: UUID
     label: str
@@ -57,10 +60,22 @@ class CriteriaItemResponse(BaseModel):
 
 
 class CriteriaGroupWithItems(BaseModel):
+    # 定性要件ツリーのキャッシュに入るため不変にする（呼び出し側の変更が他のリクエストに漏れない）
+    model_config = ConfigDict(frozen=True)
+
     id: UUID
     job_position_id: UUID
     label: str
     description: str | None
     sort_order: int
-    items: list[CriteriaItemResponse]
+    items: tuple[CriteriaItemResponse, ...]
+
 
+class CriteriaTree(BaseModel):
+    """ポジション単位の定性要件ツリー（キャッシュ用の不変スナップショット）"""
+
+    model_config = ConfigDict(frozen=True)
+
+    job_position_id: UUID
+    version: str
+    groups: tuple[CriteriaGroupWithItems, ...]
@@ -0,0 +1,29 @@
+from datetime import datetime
+from uuid import UUID
+
+from pydantic import BaseModel
+
+from app.domain.entities.export_job import ExportJobKind, ExportJobStatus
+
+
+class ExportJobCreate(BaseModel):
+    kind: ExportJobKind
+    company_id: UUID | None = None
+    job_position_id: UUID | None = None
+    include_comments: bool = False
+
+
+class ExportJobResponse(BaseModel):
+    id: UUID
+    kind: ExportJobKind
+    company_id: UUID | None = None
+    job_position_id: UUID | None = None
+    include_comments: bool = False
+    status: ExportJobStatus
+    rows_written: int
+    total_rows: int | None = None
+    size_bytes: int | None = None
+    error: str | None = None
+    created_at: datetime
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
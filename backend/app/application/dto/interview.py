@@ -43,6 +43,26 @@ class InterviewResponse(BaseModel):
     updated_at: datetime
 
 
+class InterviewSummary(BaseModel):
+    """一覧用。文字起こし全文・レポート本文・社内コメントは含めない"""
+
+    id: UUID
+    candidate_id: UUID
+    interviewer_id: UUID
+    interview_date: date
+    transcript_source: str | None
+    transcript_url: str | None
+    created_at: datetime
+    updated_at: datetime
+
+
+class InterviewTranscript(BaseModel):
+    id: UUID
+    transcript_raw_text: str | None
+    transcript_source: str | None
+    transcript_url: str | None
+
+
 class InterviewDetailCreate(BaseModel):
     criteria_item_id: UUID
     score_value: int
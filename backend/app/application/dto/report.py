@@ -0,0 +1,13 @@
+from typing import Literal
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+ReportType = Literal["client", "agent"]
+
+
+class BulkReportRequest(BaseModel):
+    # interview_ids と job_position_id のどちらか一方を指定する
+    interview_ids: list[UUID] | None = Field(default=None, min_length=1, max_length=1000)
+    job_position_id: UUID | None = None
+    report_types: list[ReportType] = Field(default=["client", "agent"], min_length=1)
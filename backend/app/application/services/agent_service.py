@@ -1,21 +1,32 @@
-from datetime import datetime, timezone
+from datetime import date, datetime, timezone
 from uuid import UUID, uuid4
 
 from app.application.dto.agent import AgentCreate, AgentResponse, AgentStats, AgentUpdate
+from app.application.dto.pagination import Page, PageRequest
 from app.domain.entities.agent import Agent
 from app.infrastructure.repositories.agent_repository import AgentRepository
-from app.infrastructure.repositories.candidate_repository import CandidateRepository
 
 
 class AgentService:
     def __init__(self):
         self.repository = AgentRepository()
-        self.candidate_repository = CandidateRepository()
 
-    async def get_all(self) -> list[AgentResponse]:
-        agents = await self.repository.find_all()
+    async def get_all(self, fields: set[str] | None = None) -> list[AgentResponse]:
+        agents = await self.repository.find_all(columns=fields)
         return [AgentResponse.model_validate(a.model_dump()) for a in agents]
 
+    async def get_page(
+        self, page: PageRequest, fields: set[str] | None = None
+    ) -> Page[AgentResponse]:
+        agents, next_cursor, total = await self.repository.find_page(
+            page.cursor, page.limit, page.include_count, columns=fields
+        )
+        return Page(
+            items=[AgentResponse.model_validate(a.model_dump()) for a in agents],
+            next_cursor=next_cursor,
+            total_count=total,
+        )
+
     async def get_by_id(self, id: UUID) -> AgentResponse | None:
         agent = await self.repository.find_by_id(id)
         if agent:
@@ -53,42 +64,15 @@ class AgentService:
     async def delete(self, id: UUID) -> bool:
         return await self.repository.delete(id)
 
-    async def get_stats(self) -> list[AgentStats]:
-        agents = await self.repository.find_all()
-        stats_list = []
-
-        for agent in agents:
-            candidates = await self.candidate_repository.find_all(agent_id=agent.id)
-            total = len(candidates)
-            if total == 0:
-                stats_list.append(
-                    AgentStats(
-                        id=agent.id,
-                        company_name=agent.company_name,
-                        contact_name=agent.contact_name,
-                        referral_count=0,
-                        stage_0_5_pass_rate=0.0,
-                        final_offer_rate=0.0,
-                        mismatch_rate=0.0,
-                    )
-                )
-                continue
-
-            stage_0_5_passed = sum(1 for c in candidates if c.stage_0_5_result.value == "passed")
-            final_offer = sum(1 for c in candidates if c.stage_final_result.value == "offer")
-            mismatch = sum(1 for c in candidates if c.mismatch_flag)
-
-            stats_list.append(
-                AgentStats(
-                    id=agent.id,
-                    company_name=agent.company_name,
-                    contact_name=agent.contact_name,
-                    referral_count=total,
-                    stage_0_5_pass_rate=round(stage_0_5_passed / total * 100, 1),
-                    final_offer_rate=round(final_offer / total * 100, 1),
-                    mismatch_rate=round(mismatch / total * 100, 1),
-                )
-            )
-
-        return stats_list
-
+    async def get_stats(
+        self,
+        company_id: UUID | None = None,
+        date_from: date | None = None,
+        date_to: date | None = None,
+    ) -> list[AgentStats]:
+        rows = await self.repository.get_stats(
+            company_id=company_id,
+            date_from=date_from,
+            date_to=date_to,
+        )
+        return [AgentStats(**row) for row in rows]
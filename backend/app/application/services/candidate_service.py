@@ -1,4 +1,4 @@
-from datetime import date, datetime, timezone
+from datetime import date, datetime, timedelta, timezone
 from uuid import UUID, uuid4
 
 from app.application.dto.candidate import (
@@ -10,21 +10,36 @@ from app.application.dto.candidate import (
     FunnelStats,
     MonthlyStats,
 )
+from app.application.dto.pagination import Page, PageRequest
+from app.core.concurrency import gather_limited
 from app.domain.entities.candidate import Candidate
-from app.infrastructure.repositories.agent_repository import AgentRepository
 from app.infrastructure.repositories.candidate_repository import CandidateRepository
-from app.infrastructure.repositories.company_repository import CompanyRepository
-from app.infrastructure.repositories.job_position_repository import JobPositionRepository
-from app.infrastructure.repositories.user_repository import UserRepository
+from app.infrastructure.repositories.candidate_rollup_repository import CandidateRollupRepository
+
+
+# 一覧の関連項目と、それを得るために埋め込む関連テーブル
+RELATION_FIELDS = {
+    "company_name": "companies",
+    "job_position_name": "job_positions",
+    "agent_company_name": "agents",
+    "agent_contact_name": "agents",
+    "owner_user_name": "users",
+}
+
+
+def _projection(fields: set[str] | None) -> dict:
+    if fields is None:
+        return {}
+    return {
+        "columns": fields - RELATION_FIELDS.keys(),
+        "relations": {RELATION_FIELDS[name] for name in fields & RELATION_FIELDS.keys()},
+    }
 
 
 class CandidateService:
     def __init__(self):
         self.repository = CandidateRepository()
-        self.company_repository = CompanyRepository()
-        self.position_repository = JobPositionRepository()
-        self.agent_repository = AgentRepository()
-        self.user_repository = UserRepository()
+        self.rollup_repository = CandidateRollupRepository()
 
     async def get_all(
         self,
@@ -32,49 +47,64 @@ class CandidateService:
         job_position_id: UUID | None = None,
         agent_id: UUID | None = None,
         owner_user_id: UUID | None = None,
+        fields: set[str] | None = None,
     ) -> list[CandidateWithRelations]:
-        candidates = await self.repository.find_all(
+        rows = await self.repository.find_all_with_relations(
             company_id=company_id,
             job_position_id=job_position_id,
             agent_id=agent_id,
             owner_user_id=owner_user_id,
+            **_projection(fields),
+        )
+        return [self._with_relations(c, relations) for c, relations in rows]
+
+    async def get_page(
+        self,
+        page: PageRequest,
+        company_id: UUID | None = None,
+        job_position_id: UUID | None = None,
+        agent_id: UUID | None = None,
+        owner_user_id: UUID | None = None,
+        fields: set[str] | None = None,
+    ) -> Page[CandidateWithRelations]:
+        rows, next_cursor, total = await self.repository.find_page_with_relations(
+            page.cursor,
+            page.limit,
+            page.include_count,
+            company_id=company_id,
+            job_position_id=job_position_id,
+            agent_id=agent_id,
+            owner_user_id=owner_user_id,
+            **_projection(fields),
+        )
+        return Page(
+            items=[self._with_relations(c, relations) for c, relations in rows],
+            next_cursor=next_cursor,
+            total_count=total,
         )
-        result = []
-        for c in candidates:
-            company = await self.company_repository.find_by_id(c.company_id)
-            position = await self.position_repository.find_by_id(c.job_position_id)
-            agent = await self.agent_repository.find_by_id(c.agent_id) if c.agent_id else None
-            owner = await self.user_repository.find_by_id(c.owner_user_id)
-
-            result.append(
-                CandidateWithRelations(
-                    **c.model_dump(),
-                    company_name=company.name if company else None,
-                    job_position_name=position.name if position else None,
-                    agent_company_name=agent.company_name if agent else None,
-                    agent_contact_name=agent.contact_name if agent else None,
-                    owner_user_name=owner.name if owner else None,
-                )
-            )
-        return result
 
     async def get_by_id(self, id: UUID) -> CandidateWithRelations | None:
-        candidate = await self.repository.find_by_id(id)
-        if not candidate:
+        row = await self.repository.find_by_id_with_relations(id)
+        if not row:
             return None
-
-        company = await self.company_repository.find_by_id(candidate.company_id)
-        position = await self.position_repository.find_by_id(candidate.job_position_id)
-        agent = await self.agent_repository.find_by_id(candidate.agent_id) if candidate.agent_id else None
-        owner = await self.user_repository.find_by_id(candidate.owner_user_id)
-
+        candidate, relations = row
+        return self._with_relations(candidate, relations)
+
+    def _with_relations(self, candidate: Candidate, relations: dict) -> CandidateWithRelations:
+        # 論理削除済みの企業・エージェントは個別取得時と同様に未設定として扱う
+        company = relations["companies"]
+        if company.get("deleted_flag"):
+            company = {}
+        agent = relations["agents"]
+        if agent.get("deleted_flag"):
+            agent = {}
         return CandidateWithRelations(
             **candidate.model_dump(),
-            company_name=company.name if company else None,
-            job_position_name=position.name if position else None,
-            agent_company_name=agent.company_name if agent else None,
-            agent_contact_name=agent.contact_name if agent else None,
-            owner_user_name=owner.name if owner else None,
+            company_name=company.get("name"),
+            job_position_name=relations["job_positions"].get("name"),
+            agent_company_name=agent.get("company_name"),
+            agent_contact_name=agent.get("contact_name"),
+            owner_user_name=relations["users"].get("name"),
         )
 
     async def create(self, data: CandidateCreate) -> CandidateResponse:
@@ -111,24 +141,43 @@ class CandidateService:
     async def delete(self, id: UUID) -> bool:
         return await self.repository.delete(id)
 
-    async def get_funnel_stats(self, company_id: UUID | None = None) -> FunnelStats:
-        stats = await self.repository.get_funnel_stats(company_id)
+    async def get_funnel_stats(
+        self,
+        company_id: UUID | None = None,
+        job_position_id: UUID | None = None,
+        agent_id: UUID | None = None,
+        date_from: date | None = None,
+        date_to: date | None = None,
+    ) -> FunnelStats:
+        if date_from is None and date_to is None:
+            # 期間指定がなければ集計テーブルから読む
+            stats = await self.rollup_repository.get_totals(
+                company_id=company_id,
+                job_position_id=job_position_id,
+                agent_id=agent_id,
+            )
+        else:
+            stats = await self.repository.get_funnel_stats(
+                company_id=company_id,
+                job_position_id=job_position_id,
+                agent_id=agent_id,
+                date_from=date_from,
+                date_to=date_to,
+            )
         return FunnelStats(**stats)
 
     async def get_dashboard_stats(self) -> DashboardStats:
-        today = date.today()
-        current_year, current_month = today.year, today.month
-        if current_month == 1:
-            prev_year, prev_month = current_year - 1, 12
-        else:
-            prev_year, prev_month = current_year, current_month - 1
-
-        active_candidates = await self.repository.get_active_candidates_count()
-        pending_interviews = await self.repository.get_pending_interviews_count()
-        funnel = await self.repository.get_funnel_stats()
+        current_key = date.today().replace(day=1)
+        previous_key = (current_key - timedelta(days=1)).replace(day=1)
 
-        current_stats = await self.repository.get_monthly_stats(current_year, current_month)
-        previous_stats = await self.repository.get_monthly_stats(prev_year, prev_month)
+        funnel, monthly = await gather_limited(
+            self.rollup_repository.get_totals(),
+            self.rollup_repository.get_monthly_stats([current_key, previous_key]),
+        )
+        active_candidates = funnel["active"]
+        pending_interviews = funnel["pending_interviews"]
+        current_stats = monthly[current_key]
+        previous_stats = monthly[previous_key]
 
         pass_rate = 0.0
         if funnel["stage_0_5_done"] > 0:
@@ -0,0 +1,107 @@
+"""
+BI取り込み向けのParquet書き出し（pyarrow は analytics extra の任意依存）。
+
+ParquetWriter はヘッダー・行グループ・フッターを順に書き出すため、
+ページごとに行グループを書いてその都度バイト列を取り出せばストリーミングできる。
+"""
+
+from collections import Counter
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from app.application.dto.criteria import CriteriaGroupWithItems, CriteriaItemResponse
+
+# 値の種類が少ない名称・区分列は辞書エンコードする
+DICT_STRING = pa.dictionary(pa.int32(), pa.string())
+
+CANDIDATE_FIELDS = [
+    pa.field("candidate_id", pa.string(), nullable=False),
+    pa.field("name", pa.string(), nullable=False),
+    pa.field("company_name", DICT_STRING),
+    pa.field("job_position_name", DICT_STRING),
+    pa.field("agent_company_name", DICT_STRING),
+    pa.field("agent_contact_name", DICT_STRING),
+    pa.field("owner_user_name", DICT_STRING),
+    pa.field("stage_0_5_result", DICT_STRING, nullable=False),
+    pa.field("stage_0_5_date", pa.date32()),
+    pa.field("stage_first_result", DICT_STRING, nullable=False),
+    pa.field("stage_first_date", pa.date32()),
+    pa.field("stage_second_result", DICT_STRING, nullable=False),
+    pa.field("stage_final_result", DICT_STRING, nullable=False),
+    pa.field("stage_final_decision_date", pa.date32()),
+    pa.field("hire_status", DICT_STRING, nullable=False),
+    pa.field("mismatch_flag", pa.bool_(), nullable=False),
+    pa.field("will_text_external", pa.string()),
+    pa.field("attract_text_external", pa.string()),
+    pa.field("created_at", pa.timestamp("us", tz="UTC"), nullable=False),
+]
+
+
+def score_columns(
+    criteria: list[tuple[CriteriaGroupWithItems, CriteriaItemResponse]],
+) -> list[str]:
+    """
+    中項目ごとのスコア列名。大項目/中項目の名称が重なる列には中項目IDを付けて区別する
+    （同名の列は pa.Table.from_pydict で1列にまとまってしまう）。
+    """
+    labels = [f"score:{group.label}/{item.label}" for group, item in criteria]
+    counts = Counter(labels)
+    return [
+        label if counts[label] == 1 else f"{label}#{item.id}"
+        for label, (_, item) in zip(labels, criteria)
+    ]
+
+
+def build_schema(
+    criteria: list[tuple[CriteriaGroupWithItems, CriteriaItemResponse]],
+) -> pa.Schema:
+    score_fields = [
+        pa.field(name, pa.int8(), metadata={"criteria_item_id": str(item.id)})
+        for name, (_, item) in zip(score_columns(criteria), criteria)
+    ]
+    return pa.schema(CANDIDATE_FIELDS + score_fields)
+
+
+class _ChunkSink:
+    """書き込まれたバイト列を溜め、drain() で取り出すだけの出力先"""
+
+    def __init__(self):
+        self._buffer = bytearray()
+        self._position = 0
+        self.closed = False
+
+    def write(self, data: bytes) -> int:
+        self._buffer += data
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def drain(self) -> bytes:
+        chunk = bytes(self._buffer)
+        self._buffer.clear()
+        return chunk
+
+
+class ParquetChunkWriter:
+    def __init__(self, schema: pa.Schema):
+        self.schema = schema
+        self._sink = _ChunkSink()
+        self._writer = pq.ParquetWriter(self._sink, schema, compression="zstd")
+
+    def write(self, columns: dict[str, list]) -> bytes:
+        """1ページ分を1行グループとして書き、ここまでに出力されたバイト列を返す"""
+        self._writer.write_table(pa.Table.from_pydict(columns, schema=self.schema))
+        return self._sink.drain()
+
+    def close(self) -> bytes:
+        self._writer.close()
+        return self._sink.drain()
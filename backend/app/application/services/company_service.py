@@ -2,6 +2,7 @@ from datetime import datetime, timezone
 from uuid import UUID, uuid4
 
 from app.application.dto.company import CompanyCreate, CompanyResponse, CompanyUpdate
+from app.application.dto.pagination import Page, PageRequest
 from app.domain.entities.company import Company
 from app.infrastructure.repositories.company_repository import CompanyRepository
 
@@ -10,10 +11,22 @@ class CompanyService:
     def __init__(self):
         self.repository = CompanyRepository()
 
-    async def get_all(self) -> list[CompanyResponse]:
-        companies = await self.repository.find_all()
+    async def get_all(self, fields: set[str] | None = None) -> list[CompanyResponse]:
+        companies = await self.repository.find_all(columns=fields)
         return [CompanyResponse.model_validate(c.model_dump()) for c in companies]
 
+    async def get_page(
+        self, page: PageRequest, fields: set[str] | None = None
+    ) -> Page[CompanyResponse]:
+        companies, next_cursor, total = await self.repository.find_page(
+            page.cursor, page.limit, page.include_count, columns=fields
+        )
+        return Page(
+            items=[CompanyResponse.model_validate(c.model_dump()) for c in companies],
+            next_cursor=next_cursor,
+            total_count=total,
+        )
+
     async def get_by_id(self, id: UUID) -> CompanyResponse | None:
         company = await self.repository.find_by_id(id)
         if company:
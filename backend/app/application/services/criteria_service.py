@@ -1,3 +1,4 @@
+import hashlib
 from datetime import datetime, timezone
 from uuid import UUID, uuid4
 
@@ -9,13 +10,17 @@ from app.application.dto.criteria import (
     CriteriaItemCreate,
     CriteriaItemResponse,
     CriteriaItemUpdate,
+    CriteriaTree,
 )
 from app.domain.entities.criteria import CriteriaGroup, CriteriaItem
+from app.infrastructure.cache import TTLCache
 from app.infrastructure.repositories.criteria_repository import (
     CriteriaGroupRepository,
     CriteriaItemRepository,
 )
 
+_tree_cache: TTLCache[UUID, CriteriaTree] = TTLCache("criteria_trees")
+
 
 class CriteriaService:
     def __init__(self):
@@ -27,21 +32,41 @@ class CriteriaService:
         return [CriteriaGroupResponse.model_validate(g.model_dump()) for g in groups]
 
     async def get_groups_with_items(self, job_position_id: UUID) -> list[CriteriaGroupWithItems]:
-        groups = await self.group_repository.find_by_job_position_id(job_position_id)
-        result = []
-        for group in groups:
-            items = await self.item_repository.find_by_group_id(group.id)
-            result.append(
-                CriteriaGroupWithItems(
-                    id=group.id,
-                    job_position_id=group.job_position_id,
-                    label=group.label,
-                    description=group.description,
-                    sort_order=group.sort_order,
-                    items=[CriteriaItemResponse.model_validate(i.model_dump()) for i in items],
-                )
+        tree = await self.get_tree(job_position_id)
+        return list(tree.groups)
+
+    async def get_tree(self, job_position_id: UUID, use_cache: bool = True) -> CriteriaTree:
+        """use_cache=False でもDBから組み立てた結果でキャッシュは更新する"""
+        tree = _tree_cache.get(job_position_id) if use_cache else None
+        if tree is not None:
+            return tree
+
+        rows = await self.group_repository.find_tree_by_job_position_id(job_position_id)
+        groups = tuple(
+            CriteriaGroupWithItems(
+                id=group.id,
+                job_position_id=group.job_position_id,
+                label=group.label,
+                description=group.description,
+                sort_order=group.sort_order,
+                items=tuple(CriteriaItemResponse.model_validate(i.model_dump()) for i in items),
             )
-        return result
+            for group, items in rows
+        )
+        # 内容から算出するため、どのインスタンスで組み立てても同じversionになる
+        payload = "".join(g.model_dump_json() for g in groups)
+        version = hashlib.sha256(payload.encode()).hexdigest()[:16]
+        tree = CriteriaTree(job_position_id=job_position_id, version=version, groups=groups)
+        _tree_cache.set(job_position_id, tree)
+        return tree
+
+    def _invalidate_tree(self, job_position_id: UUID) -> None:
+        _tree_cache.invalidate(job_position_id)
+
+    async def _invalidate_tree_for_group(self, criteria_group_id: UUID) -> None:
+        group = await self.group_repository.find_by_id(criteria_group_id)
+        if group:
+            self._invalidate_tree(group.job_position_id)
 
     async def create_group(self, data: CriteriaGroupCreate) -> CriteriaGroupResponse:
         now = datetime.now(timezone.utc)
@@ -56,6 +81,7 @@ class CriteriaService:
             deleted_flag=False,
         )
         created = await self.group_repository.create(group)
+        self._invalidate_tree(created.job_position_id)
         return CriteriaGroupResponse.model_validate(created.model_dump())
 
     async def update_group(self, id: UUID, data: CriteriaGroupUpdate) -> CriteriaGroupResponse | None:
@@ -69,10 +95,16 @@ class CriteriaService:
         group.updated_at = datetime.now(timezone.utc)
 
         updated = await self.group_repository.update(group)
+        self._invalidate_tree(updated.job_position_id)
         return CriteriaGroupResponse.model_validate(updated.model_dump())
 
     async def delete_group(self, id: UUID) -> bool:
-        return await self.group_repository.delete(id)
+        group = await self.group_repository.find_by_id(id)
+        if not group:
+            return False
+        deleted = await self.group_repository.delete(id)
+        self._invalidate_tree(group.job_position_id)
+        return deleted
 
     async def get_items_by_group(self, criteria_group_id: UUID) -> list[CriteriaItemResponse]:
         items = await self.item_repository.find_by_group_id(criteria_group_id)
@@ -92,6 +124,7 @@ class CriteriaService:
             updated_at=now,
         )
         created = await self.item_repository.create(item)
+        await self._invalidate_tree_for_group(created.criteria_group_id)
         return CriteriaItemResponse.model_validate(created.model_dump())
 
     async def update_item(self, id: UUID, data: CriteriaItemUpdate) -> CriteriaItemResponse | None:
@@ -105,5 +138,6 @@ class CriteriaService:
         item.updated_at = datetime.now(timezone.utc)
 
         updated = await self.item_repository.update(item)
+        await self._invalidate_tree_for_group(updated.criteria_group_id)
         return CriteriaItemResponse.model_validate(updated.model_dump())
 
@@ -0,0 +1,46 @@
+import asyncio
+import logging
+from functools import lru_cache
+
+from app.application.services.export_service import ExportService
+
+logger = logging.getLogger(__name__)
+
+# 差分エクスポートの削除記録を掃除する間隔
+PURGE_INTERVAL_SECONDS = 3600.0
+
+
+class DeltaRetention:
+    """
+    差分エクスポートの削除記録を保持期間（DELTA_EXPORT_MAX_GAP_DAYS）が過ぎたものから定期的に消す。
+    同期のGETは読み取りだけにし、削除はここでまとめて行う。
+    複数インスタンスで同時に動いても、同じ境界より古い行を消すだけなので結果は変わらない。
+    """
+
+    def __init__(self):
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._purge_periodically())
+
+    async def _purge_periodically(self) -> None:
+        while True:
+            try:
+                purged = await ExportService().purge_delta_deletions()
+                if purged:
+                    logger.info("Purged %d expired delta deletion records", purged)
+            except Exception:
+                logger.exception("Failed to purge delta deletion records")
+            await asyncio.sleep(PURGE_INTERVAL_SECONDS)
+
+    async def shutdown(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+
+@lru_cache
+def get_delta_retention() -> DeltaRetention:
+    return DeltaRetention()
@@ -0,0 +1,160 @@
+import asyncio
+import logging
+import time
+from collections.abc import AsyncIterator
+from datetime import datetime, timezone
+from functools import lru_cache
+from uuid import UUID, uuid4
+
+from app.application.dto.export import ExportJobCreate
+from app.application.services.export_service import ExportService
+from app.core.config import get_settings
+from app.domain.entities.export_job import ExportJob, ExportJobKind, ExportJobStatus
+from app.infrastructure.artifact_storage import ArtifactStorage, get_artifact_storage
+
+logger = logging.getLogger(__name__)
+
+# 種別ごとの (拡張子, Content-Type)
+EXPORT_FORMATS = {
+    ExportJobKind.CANDIDATES_CSV: ("csv", "text/csv"),
+    ExportJobKind.CANDIDATES_WIDE_CSV: ("csv", "text/csv"),
+    ExportJobKind.CANDIDATES_PARQUET: ("parquet", "application/vnd.apache.parquet"),
+}
+
+# 保持期間切れのジョブと成果物を掃除する間隔
+PRUNE_INTERVAL_SECONDS = 60.0
+
+
+def _dedup_key(job: ExportJob) -> tuple:
+    return (job.kind, job.company_id, job.job_position_id, job.include_comments)
+
+
+class ExportJobRunner:
+    """
+    プロセス内のエクスポートジョブ実行。同時実行数をセマフォで抑え、成果物はストレージに書く。
+    同じ条件のジョブが待機中・実行中なら新たに起動せずそのジョブを返す。
+    ジョブの状態はインスタンスのメモリ上にしかないため、複数インスタンス構成ではセッションアフィニティが必要。
+    保持期間切れのジョブと成果物は定期的に削除する。再起動前の成果物はどのジョブからも参照されないため、
+    保存先に残っているファイルも更新時刻が保持期間を過ぎたものは消す。
+    """
+
+    def __init__(self, storage: ArtifactStorage, concurrency: int, ttl: float):
+        self.storage = storage
+        self.ttl = ttl
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._jobs: dict[UUID, ExportJob] = {}
+        self._finished_at: dict[UUID, float] = {}
+        self._active: dict[tuple, UUID] = {}
+        self._tasks: dict[UUID, asyncio.Task] = {}
+        self._prune_task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        if self._prune_task is None:
+            self._prune_task = asyncio.create_task(self._prune_periodically())
+
+    def get(self, job_id: UUID) -> ExportJob | None:
+        return self._jobs.get(job_id)
+
+    async def submit(self, request: ExportJobCreate) -> ExportJob:
+        # 種別ごとに使わない条件は落としてから重複判定する
+        job = ExportJob(
+            id=uuid4(),
+            kind=request.kind,
+            company_id=request.company_id,
+            job_position_id=(
+                request.job_position_id if request.kind != ExportJobKind.CANDIDATES_CSV else None
+            ),
+            include_comments=(
+                request.include_comments and request.kind == ExportJobKind.CANDIDATES_WIDE_CSV
+            ),
+            created_at=datetime.now(timezone.utc),
+        )
+        key = _dedup_key(job)
+        if key in self._active:
+            return self._jobs[self._active[key]]
+
+        self._jobs[job.id] = job
+        self._active[key] = job.id
+        self._tasks[job.id] = asyncio.create_task(self._run(job, key))
+        return job
+
+    def artifact_key(self, job: ExportJob) -> str:
+        extension, _ = EXPORT_FORMATS[job.kind]
+        return f"{job.id}.{extension}"
+
+    async def read_artifact(self, job: ExportJob) -> AsyncIterator[bytes]:
+        return await self.storage.read(self.artifact_key(job))
+
+    async def _run(self, job: ExportJob, key: tuple) -> None:
+        try:
+            async with self._semaphore:
+                job.status = ExportJobStatus.RUNNING
+                job.started_at = datetime.now(timezone.utc)
+                job.size_bytes = await self.storage.write(
+                    self.artifact_key(job), self._stream(job)
+                )
+            job.status = ExportJobStatus.SUCCEEDED
+        except asyncio.CancelledError:
+            job.status = ExportJobStatus.FAILED
+            job.error = "Cancelled"
+            raise
+        except Exception as e:
+            logger.exception("Export job %s failed", job.id)
+            job.status = ExportJobStatus.FAILED
+            job.error = str(e)
+        finally:
+            job.finished_at = datetime.now(timezone.utc)
+            self._finished_at[job.id] = time.monotonic()
+            self._active.pop(key, None)
+            self._tasks.pop(job.id, None)
+
+    def _stream(self, job: ExportJob) -> AsyncIterator[bytes]:
+        def on_progress(rows_written: int, total_rows: int | None) -> None:
+            job.rows_written = rows_written
+            job.total_rows = total_rows
+
+        service = ExportService(on_progress=on_progress)
+        if job.kind == ExportJobKind.CANDIDATES_WIDE_CSV:
+            return service.stream_candidates_wide_csv(
+                job.job_position_id, job.company_id, job.include_comments
+            )
+        if job.kind == ExportJobKind.CANDIDATES_PARQUET:
+            return service.stream_candidates_parquet(job.company_id, job.job_position_id)
+        return service.stream_candidates_csv(job.company_id)
+
+    async def _prune_periodically(self) -> None:
+        while True:
+            try:
+                await self._prune()
+            except Exception:
+                logger.exception("Failed to prune export jobs")
+            await asyncio.sleep(PRUNE_INTERVAL_SECONDS)
+
+    async def _prune(self) -> None:
+        """保持期間を過ぎた完了済みジョブと成果物、どのジョブにも属さない古い成果物を削除する"""
+        deadline = time.monotonic() - self.ttl
+        for job_id in [i for i, at in self._finished_at.items() if at < deadline]:
+            job = self._jobs.pop(job_id)
+            del self._finished_at[job_id]
+            if job.status == ExportJobStatus.SUCCEEDED:
+                await self.storage.delete(self.artifact_key(job))
+        await self.storage.purge(older_than=self.ttl)
+
+    async def shutdown(self) -> None:
+        if self._prune_task is not None:
+            self._prune_task.cancel()
+            self._prune_task = None
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+@lru_cache
+def get_export_job_runner() -> ExportJobRunner:
+    settings = get_settings()
+    return ExportJobRunner(
+        get_artifact_storage(),
+        concurrency=settings.export_job_concurrency,
+        ttl=settings.export_job_ttl_seconds,
+    )
@@ -1,7 +1,17 @@
+import asyncio
 import csv
 import io
+import json
+from collections.abc import AsyncIterator, Callable
+from datetime import datetime, timedelta
 from uuid import UUID
 
+from app.application.services.criteria_service import CriteriaService
+from app.application.services.relation_loader import BATCH_SIZE, RelationLoader
+from app.core.concurrency import gather_limited
+from app.core.config import get_settings
+from app.domain.entities.candidate import Candidate
+from app.domain.entities.interview import Interview, InterviewDetail
 from app.infrastructure.repositories.agent_repository import AgentRepository
 from app.infrastructure.repositories.candidate_repository import CandidateRepository
 from app.infrastructure.repositories.company_repository import CompanyRepository
@@ -9,6 +19,7 @@ from app.infrastructure.repositories.criteria_repository import (
     CriteriaGroupRepository,
     CriteriaItemRepository,
 )
+from app.infrastructure.repositories.delta_repository import DELTA_TABLES, DeltaRepository
 from app.infrastructure.repositories.interview_repository import (
     InterviewDetailRepository,
     InterviewRepository,
@@ -17,8 +28,49 @@ from app.infrastructure.repositories.job_position_repository import JobPositionR
 from app.infrastructure.repositories.user_repository import UserRepository
 
 
+CSV_HEADERS = [
+    "候補者ID",
+    "氏名",
+    "企業名",
+    "ポジション名",
+    "エージェント会社",
+    "エージェント担当",
+    "担当者",
+    "0.5次結果",
+    "0.5次日付",
+    "一次結果",
+    "一次日付",
+    "二次結果",
+    "最終結果",
+    "最終決定日",
+    "入社状況",
+    "ミスマッチ",
+    "Will（外向き）",
+    "アトラクト（外向き）",
+]
+
+INTERVIEW_EXPORT_COLUMNS = ("will_text_external", "attract_text_external")
+
+
+def _batches(ids: list[UUID]) -> list[list[UUID]]:
+    return [ids[i : i + BATCH_SIZE] for i in range(0, len(ids), BATCH_SIZE)]
+
+
+def _candidate_deleted(row: dict) -> bool:
+    """行が論理削除された候補者（子テーブルは埋め込んだ親候補者）のものか。埋め込みは行から外す"""
+    if "interviews" in row:
+        interview = row.pop("interviews")
+        return interview is not None and _candidate_deleted(interview)
+    if "candidates" in row:
+        candidate = row.pop("candidates")
+        return candidate is not None and bool(candidate["deleted_flag"])
+    return bool(row.get("deleted_flag"))
+
+
 class ExportService:
-    def __init__(self):
+    def __init__(self, on_progress: Callable[[int, int | None], None] | None = None):
+        # on_progress(書き出した行数, 推定総行数) はページごとに呼ばれる（エクスポートジョブの進捗用）
+        self.on_progress = on_progress
         self.candidate_repository = CandidateRepository()
         self.company_repository = CompanyRepository()
         self.position_repository = JobPositionRepository()
@@ -28,70 +80,320 @@ class ExportService:
         self.detail_repository = InterviewDetailRepository()
         self.group_repository = CriteriaGroupRepository()
         self.item_repository = CriteriaItemRepository()
+        self.criteria_service = CriteriaService()
+        self.delta_repository = DeltaRepository()
 
     def _score_to_label(self, score: int) -> str:
         labels = {1: "×", 2: "△", 3: "◯", 4: "◎"}
         return labels.get(score, "-")
 
-    async def export_candidates_csv(self, company_id: UUID | None = None) -> str:
-        candidates = await self.candidate_repository.find_all(company_id=company_id)
-
-        output = io.StringIO()
-        writer = csv.writer(output)
-
-        headers = [
-            "候補者ID",
-            "氏名",
-            "企業名",
-            "ポジション名",
-            "エージェント会社",
-            "エージェント担当",
-            "担当者",
-            "0.5次結果",
-            "0.5次日付",
-            "一次結果",
-            "一次日付",
-            "二次結果",
-            "最終結果",
-            "最終決定日",
-            "入社状況",
-            "ミスマッチ",
-            "Will（外向き）",
-            "アトラクト（外向き）",
-        ]
+    async def stream_candidates_csv(self, company_id: UUID | None = None) -> AsyncIterator[bytes]:
+        """候補者CSVをページ単位でエンコードしながら返す（全件をメモリに載せない）"""
+
+        async def row_pages() -> AsyncIterator[list[list[str]]]:
+            async for candidates, loader, interviews in self._candidate_pages(company_id):
+                yield [self._candidate_row(c, loader, interviews.get(c.id)) for c in candidates]
+
+        async for chunk in self._stream_csv(CSV_HEADERS, row_pages()):
+            yield chunk
+
+    async def stream_candidates_wide_csv(
+        self,
+        job_position_id: UUID,
+        company_id: UUID | None = None,
+        include_comments: bool = False,
+    ) -> AsyncIterator[bytes]:
+        """
+        ポジションの定性要件（中項目）ごとにスコア列を持つ横持ちCSV。
+        面談詳細はページ単位でまとめて取得し、面談×中項目にピボットする。
+        """
+        tree = await self.criteria_service.get_tree(job_position_id)
+        items = [(group, item) for group in tree.groups for item in group.items]
+
+        headers = list(CSV_HEADERS)
+        for group, item in items:
+            headers.append(f"{group.label}/{item.label}")
+            if include_comments:
+                headers.append(f"{group.label}/{item.label}（コメント）")
+
+        detail_columns = ("comment_external",) if include_comments else ()
+
+        async def row_pages() -> AsyncIterator[list[list[str]]]:
+            async for candidates, loader, interviews in self._candidate_pages(
+                company_id, job_position_id
+            ):
+                details = await self._load_details(
+                    [i.id for i in interviews.values()], detail_columns
+                )
+                rows = []
+                for c in candidates:
+                    interview = interviews.get(c.id)
+                    scores = details.get(interview.id, {}) if interview else {}
+                    row = self._candidate_row(c, loader, interview)
+                    for _, item in items:
+                        detail = scores.get(item.id)
+                        row.append(str(detail.score_value) if detail else "")
+                        if include_comments:
+                            row.append((detail.comment_external or "") if detail else "")
+                    rows.append(row)
+                yield rows
+
+        async for chunk in self._stream_csv(headers, row_pages()):
+            yield chunk
+
+    async def stream_candidates_parquet(
+        self, company_id: UUID | None = None, job_position_id: UUID | None = None
+    ) -> AsyncIterator[bytes]:
+        """
+        BI取り込み向けのParquet。列は型付き（日付・区分・真偽値）で、名称列は辞書エンコード。
+        ページごとに1行グループとして書き出す。ポジション指定時は中項目ごとのスコア列を付ける。
+        """
+        # pyarrow は analytics extra の任意依存のため、ここで初めて読み込む
+        from app.application.services.columnar_export import ParquetChunkWriter, build_schema
+
+        items = []
+        if job_position_id:
+            tree = await self.criteria_service.get_tree(job_position_id)
+            items = [(group, item) for group in tree.groups for item in group.items]
+        writer = ParquetChunkWriter(build_schema(items))
+        score_names = writer.schema.names[len(writer.schema.names) - len(items) :]
+
+        async for candidates, loader, interviews in self._candidate_pages(
+            company_id, job_position_id
+        ):
+            details = {}
+            if items:
+                details = await self._load_details([i.id for i in interviews.values()], ())
+
+            columns: dict[str, list] = {name: [] for name in writer.schema.names}
+            for c in candidates:
+                interview = interviews.get(c.id)
+                for name, value in self._candidate_record(c, loader, interview).items():
+                    columns[name].append(value)
+                scores = details.get(interview.id, {}) if interview else {}
+                for name, (_, item) in zip(score_names, items):
+                    detail = scores.get(item.id)
+                    columns[name].append(detail.score_value if detail else None)
+
+            yield await asyncio.to_thread(writer.write, columns)
+
+        yield await asyncio.to_thread(writer.close)
+
+    async def get_delta_watermark(self) -> datetime:
+        return await self.delta_repository.get_watermark(get_settings().delta_export_lag_seconds)
+
+    def delta_window_start(self, until: datetime) -> datetime:
+        """受け付ける最も古い since。これより前の削除記録は残っている保証がない"""
+        return until - timedelta(days=get_settings().delta_export_max_gap_days)
+
+    async def purge_delta_deletions(self) -> int:
+        """受け付ける since の範囲より古い削除記録を消し、消した件数を返す"""
+        until = await self.get_delta_watermark()
+        # 上限ぎりぎりの since で進行中の同期から記録が消えないよう、1日の猶予を残す
+        return await self.delta_repository.purge_deleted(
+            self.delta_window_start(until) - timedelta(days=1)
+        )
+
+    async def stream_delta(self, since: datetime | None, until: datetime) -> AsyncIterator[bytes]:
+        """
+        (since, until] に変更された候補者・面談・評価・Q&AをNDJSONで返す。
+        1行1レコードで {"table", "op": "upsert", "row"} か削除の {"table", "op": "delete", "id"}。
+        論理削除された候補者は、その面談・評価・Q&Aも削除として返す（受け手側での連鎖削除は不要）。
+        最終行の {"watermark"} が次回の since。最終行まで受け取れなかった場合は同じ since で再取得する。
+        """
+        page_size = get_settings().export_page_size
+
+        def encode(records: list[dict]) -> bytes:
+            return "".join(
+                json.dumps(r, ensure_ascii=False, separators=(",", ":")) + "\n" for r in records
+            ).encode("utf-8")
+
+        for table in DELTA_TABLES:
+            after = None
+            while True:
+                rows = await self.delta_repository.find_changed(
+                    table, since, until, after, page_size
+                )
+                if not rows:
+                    break
+                yield encode([self._delta_record(table, row) for row in rows])
+                if len(rows) < page_size:
+                    break
+                after = (rows[-1]["updated_at"], rows[-1]["id"])
+
+        after = None
+        while True:
+            rows = await self.delta_repository.find_deleted(since, until, after, page_size)
+            if not rows:
+                break
+            yield encode(
+                [
+                    {
+                        "table": row["table_name"],
+                        "op": "delete",
+                        "id": row["record_id"],
+                        "deleted_at": row["deleted_at"],
+                    }
+                    for row in rows
+                ]
+            )
+            if len(rows) < page_size:
+                break
+            after = (rows[-1]["deleted_at"], str(rows[-1]["id"]))
+
+        yield encode([{"watermark": until.isoformat()}])
+
+    def _delta_record(self, table: str, row: dict) -> dict:
+        # 論理削除された候補者とその子レコードは削除として返す
+        if _candidate_deleted(row):
+            return {
+                "table": table, "op": "delete", "id": row["id"], "deleted_at": row["updated_at"]
+            }
+        return {"table": table, "op": "upsert", "row": row}
+
+    async def _stream_csv(
+        self, headers: list[str], row_pages: AsyncIterator[list[list[str]]]
+    ) -> AsyncIterator[bytes]:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+
+        def flush() -> bytes:
+            chunk = buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+            return chunk
+
         writer.writerow(headers)
+        yield flush()
+
+        async for rows in row_pages:
+            writer.writerows(rows)
+            yield flush()
+
+    async def _candidate_pages(
+        self, company_id: UUID | None, job_position_id: UUID | None = None
+    ) -> AsyncIterator[tuple[list[Candidate], RelationLoader, dict[UUID, Interview]]]:
+        """候補者をキーセットで読み、ページごとに関連・面談をまとめて解決する"""
+        loader = RelationLoader(
+            company_repository=self.company_repository,
+            position_repository=self.position_repository,
+            agent_repository=self.agent_repository,
+            user_repository=self.user_repository,
+        )
+        page_size = get_settings().export_page_size
+        cursor = None
+        rows_written = 0
+        total = None
+        while True:
+            candidates, cursor, count = await self.candidate_repository.find_page(
+                cursor,
+                page_size,
+                include_count=self.on_progress is not None and total is None,
+                company_id=company_id,
+                job_position_id=job_position_id,
+            )
+            if not candidates:
+                return
+            total = total if total is not None else count
+
+            _, interviews = await asyncio.gather(
+                loader.load_for_candidates(candidates),
+                self._load_interviews([c.id for c in candidates]),
+            )
+            yield candidates, loader, interviews
+
+            rows_written += len(candidates)
+            if self.on_progress:
+                self.on_progress(rows_written, total)
+            if cursor is None:
+                return
+
+    async def _load_interviews(self, candidate_ids: list[UUID]) -> dict[UUID, Interview]:
+        results = await gather_limited(
+            *(
+                self.interview_repository.find_by_candidate_ids(
+                    batch, columns=INTERVIEW_EXPORT_COLUMNS
+                )
+                for batch in _batches(candidate_ids)
+            )
+        )
+        return {i.candidate_id: i for interviews in results for i in interviews}
+
+    async def _load_details(
+        self, interview_ids: list[UUID], columns: tuple[str, ...]
+    ) -> dict[UUID, dict[UUID, InterviewDetail]]:
+        """面談ID → 中項目ID → 評価 の対応表"""
+        results = await gather_limited(
+            *(
+                self.detail_repository.find_by_interview_ids(batch, columns=columns)
+                for batch in _batches(interview_ids)
+            )
+        )
+        pivot: dict[UUID, dict[UUID, InterviewDetail]] = {}
+        for details in results:
+            for d in details:
+                pivot.setdefault(d.interview_id, {})[d.criteria_item_id] = d
+        return pivot
+
+    def _candidate_row(
+        self, c: Candidate, loader: RelationLoader, interview: Interview | None
+    ) -> list[str]:
+        company = loader.companies.get(c.company_id)
+        position = loader.positions.get(c.job_position_id)
+        agent = loader.agents.get(c.agent_id) if c.agent_id else None
+        owner = loader.users.get(c.owner_user_id)
+
+        will_external = interview.will_text_external if interview else ""
+        attract_external = interview.attract_text_external if interview else ""
+
+        return [
+            str(c.id),
+            c.name,
+            company.name if company else "",
+            position.name if position else "",
+            agent.company_name if agent else "",
+            agent.contact_name if agent else "",
+            owner.name if owner else "",
+            c.stage_0_5_result.value,
+            str(c.stage_0_5_date) if c.stage_0_5_date else "",
+            c.stage_first_result.value,
+            str(c.stage_first_date) if c.stage_first_date else "",
+            c.stage_second_result.value,
+            c.stage_final_result.value,
+            str(c.stage_final_decision_date) if c.stage_final_decision_date else "",
+            c.hire_status.value,
+            "あり" if c.mismatch_flag else "",
+            will_external or "",
+            attract_external or "",
+        ]
 
-        for c in candidates:
-            company = await self.company_repository.find_by_id(c.company_id)
-            position = await self.position_repository.find_by_id(c.job_position_id)
-            agent = await self.agent_repository.find_by_id(c.agent_id) if c.agent_id else None
-            owner = await self.user_repository.find_by_id(c.owner_user_id)
-            interview = await self.interview_repository.find_by_candidate_id(c.id)
-
-            will_external = interview.will_text_external if interview else ""
-            attract_external = interview.attract_text_external if interview else ""
-
-            row = [
-                str(c.id),
-                c.name,
-                company.name if company else "",
-                position.name if position else "",
-                agent.company_name if agent else "",
-                agent.contact_name if agent else "",
-                owner.name if owner else "",
-                c.stage_0_5_result.value,
-                str(c.stage_0_5_date) if c.stage_0_5_date else "",
-                c.stage_first_result.value,
-                str(c.stage_first_date) if c.stage_first_date else "",
-                c.stage_second_result.value,
-                c.stage_final_result.value,
-                str(c.stage_final_decision_date) if c.stage_final_decision_date else "",
-                c.hire_status.value,
-                "あり" if c.mismatch_flag else "",
-                will_external or "",
-                attract_external or "",
-            ]
-            writer.writerow(row)
-
-        return output.getvalue()
+    def _candidate_record(
+        self, c: Candidate, loader: RelationLoader, interview: Interview | None
+    ) -> dict:
+        """_candidate_row の型付き版（Parquetの列名 → 値）"""
+        company = loader.companies.get(c.company_id)
+        position = loader.positions.get(c.job_position_id)
+        agent = loader.agents.get(c.agent_id) if c.agent_id else None
+        owner = loader.users.get(c.owner_user_id)
 
+        return {
+            "candidate_id": str(c.id),
+            "name": c.name,
+            "company_name": company.name if company else None,
+            "job_position_name": position.name if position else None,
+            "agent_company_name": agent.company_name if agent else None,
+            "agent_contact_name": agent.contact_name if agent else None,
+            "owner_user_name": owner.name if owner else None,
+            "stage_0_5_result": c.stage_0_5_result.value,
+            "stage_0_5_date": c.stage_0_5_date,
+            "stage_first_result": c.stage_first_result.value,
+            "stage_first_date": c.stage_first_date,
+            "stage_second_result": c.stage_second_result.value,
+            "stage_final_result": c.stage_final_result.value,
+            "stage_final_decision_date": c.stage_final_decision_date,
+            "hire_status": c.hire_status.value,
+            "mismatch_flag": c.mismatch_flag,
+            "will_text_external": interview.will_text_external if interview else None,
+            "attract_text_external": interview.attract_text_external if interview else None,
+            "created_at": c.created_at,
+        }
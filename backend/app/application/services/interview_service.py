@@ -9,11 +9,14 @@ from app.application.dto.interview import (
     InterviewQuestionResponseDTO,
     InterviewQuestionResponseUpdate,
     InterviewResponse,
+    InterviewTranscript,
     InterviewUpdate,
     InterviewWithDetails,
 )
+from app.application.dto.pagination import Page, PageRequest
 from app.domain.entities.interview import Interview, InterviewDetail, InterviewQuestionResponse
 from app.infrastructure.repositories.interview_repository import (
+    INTERVIEW_LIGHT_COLUMNS,
     InterviewDetailRepository,
     InterviewQuestionResponseRepository,
     InterviewRepository,
@@ -26,6 +29,22 @@ class InterviewService:
         self.detail_repository = InterviewDetailRepository()
         self.qr_repository = InterviewQuestionResponseRepository()
 
+    async def get_page(
+        self, page: PageRequest, fields: set[str] | None = None
+    ) -> Page[InterviewResponse]:
+        # 未指定の項目は読まない（fields 外の項目は None になる）
+        interviews, next_cursor, total = await self.repository.find_page(
+            page.cursor,
+            page.limit,
+            page.include_count,
+            columns=fields if fields is not None else INTERVIEW_LIGHT_COLUMNS,
+        )
+        return Page(
+            items=[InterviewResponse.model_validate(i.model_dump()) for i in interviews],
+            next_cursor=next_cursor,
+            total_count=total,
+        )
+
     async def get_by_id(self, id: UUID) -> InterviewWithDetails | None:
         interview = await self.repository.find_by_id(id)
         if not interview:
@@ -40,6 +59,14 @@ class InterviewService:
             question_responses=[InterviewQuestionResponseDTO.model_validate(q.model_dump()) for q in qrs],
         )
 
+    async def get_transcript(self, id: UUID) -> InterviewTranscript | None:
+        interview = await self.repository.find_by_id(
+            id, columns=InterviewTranscript.model_fields.keys()
+        )
+        if not interview:
+            return None
+        return InterviewTranscript.model_validate(interview.model_dump())
+
     async def get_by_candidate_id(self, candidate_id: UUID) -> InterviewWithDetails | None:
         interview = await self.repository.find_by_candidate_id(candidate_id)
         if not interview:
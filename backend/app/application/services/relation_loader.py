@@ -0,0 +1,86 @@
+import asyncio
+from uuid import UUID
+
+from app.application.dto.candidate import CandidateWithRelations
+from app.core.concurrency import gather_limited
+from app.domain.entities.agent import Agent
+from app.domain.entities.candidate import Candidate
+from app.domain.entities.company import Company
+from app.domain.entities.job_position import JobPosition
+from app.domain.entities.user import User
+from app.infrastructure.repositories.agent_repository import AgentRepository
+from app.infrastructure.repositories.company_repository import CompanyRepository
+from app.infrastructure.repositories.job_position_repository import JobPositionRepository
+from app.infrastructure.repositories.user_repository import UserRepository
+
+# in.(...) フィルタのURL長を抑えるため、1クエリあたりのID数を制限する
+BATCH_SIZE = 100
+
+
+class RelationLoader:
+    """
+    候補者に紐づく企業・ポジション・エージェント・担当者をまとめて解決するローダー。
+    リクエスト単位で生成し、一度解決したIDは再問い合わせしない。
+    """
+
+    def __init__(
+        self,
+        company_repository: CompanyRepository | None = None,
+        position_repository: JobPositionRepository | None = None,
+        agent_repository: AgentRepository | None = None,
+        user_repository: UserRepository | None = None,
+    ):
+        self.company_repository = company_repository or CompanyRepository()
+        self.position_repository = position_repository or JobPositionRepository()
+        self.agent_repository = agent_repository or AgentRepository()
+        self.user_repository = user_repository or UserRepository()
+        self.companies: dict[UUID, Company | None] = {}
+        self.positions: dict[UUID, JobPosition | None] = {}
+        self.agents: dict[UUID, Agent | None] = {}
+        self.users: dict[UUID, User | None] = {}
+
+    async def load_for_candidates(self, candidates: list[Candidate]) -> None:
+        await asyncio.gather(
+            self._load(self.company_repository, self.companies, {c.company_id for c in candidates}),
+            self._load(
+                self.position_repository, self.positions, {c.job_position_id for c in candidates}
+            ),
+            self._load(
+                self.agent_repository, self.agents, {c.agent_id for c in candidates if c.agent_id}
+            ),
+            self._load(self.user_repository, self.users, {c.owner_user_id for c in candidates}),
+        )
+
+    async def load_companies_and_positions(self, candidates: list[Candidate]) -> None:
+        await asyncio.gather(
+            self._load(self.company_repository, self.companies, {c.company_id for c in candidates}),
+            self._load(
+                self.position_repository, self.positions, {c.job_position_id for c in candidates}
+            ),
+        )
+
+    async def _load(self, repository, store: dict, ids: set[UUID]) -> None:
+        missing = [id for id in ids if id not in store]
+        if not missing:
+            return
+        batches = [missing[i : i + BATCH_SIZE] for i in range(0, len(missing), BATCH_SIZE)]
+        results = await gather_limited(*(repository.find_by_ids(batch) for batch in batches))
+        for id in missing:
+            store[id] = None
+        for entities in results:
+            for entity in entities:
+                store[entity.id] = entity
+
+    def with_relations(self, candidate: Candidate) -> CandidateWithRelations:
+        company = self.companies.get(candidate.company_id)
+        position = self.positions.get(candidate.job_position_id)
+        agent = self.agents.get(candidate.agent_id) if candidate.agent_id else None
+        owner = self.users.get(candidate.owner_user_id)
+        return CandidateWithRelations(
+            **candidate.model_dump(),
+            company_name=company.name if company else None,
+            job_position_name=position.name if position else None,
+            agent_company_name=agent.company_name if agent else None,
+            agent_contact_name=agent.contact_name if agent else None,
+            owner_user_name=owner.name if owner else None,
+        )
@@ -0,0 +1,196 @@
+import asyncio
+from collections.abc import AsyncIterator
+from uuid import UUID
+
+from pydantic import BaseModel
+
+from app.application.dto.criteria import CriteriaTree
+from app.application.services.criteria_service import CriteriaService
+from app.application.services.relation_loader import BATCH_SIZE, RelationLoader
+from app.domain.entities.candidate import Candidate
+from app.domain.entities.company import Company
+from app.domain.entities.interview import Interview, InterviewDetail, InterviewQuestionResponse
+from app.domain.entities.job_position import JobPosition
+from app.infrastructure.repositories.candidate_repository import CandidateRepository
+from app.infrastructure.repositories.company_repository import CompanyRepository
+from app.infrastructure.repositories.interview_repository import (
+    INTERVIEW_LIGHT_COLUMNS,
+    InterviewDetailRepository,
+    InterviewQuestionResponseRepository,
+    InterviewRepository,
+)
+from app.infrastructure.repositories.job_position_repository import JobPositionRepository
+
+
+class ReportContext(BaseModel):
+    """レポート1件の描画に必要なデータ一式"""
+
+    interview: Interview
+    candidate: Candidate
+    company: Company | None = None
+    position: JobPosition | None = None
+    details: list[InterviewDetail] = []
+    question_responses: list[InterviewQuestionResponse] = []
+    tree: CriteriaTree
+
+
+class ReportContextLoader:
+    """
+    面談1件のレポートコンテキストを最小の待ち合わせで解決する。
+    面談と候補者を埋め込みselectで1回取得し、企業・ポジション・評価・Q&A・定性要件ツリーは並行して読む。
+    インスタンス内で解決済みのコンテキストは使い回す（クライアント向け・エージェント向けで共有）。
+
+    生成結果はDBのフィンガープリントと一緒に保存され、他のインスタンスからも配信される。
+    このインスタンスのTTLキャッシュが他インスタンスでの編集を知らないまま古い内容を
+    新しいフィンガープリントで保存しないよう、企業・ポジション・定性要件ツリーもキャッシュを通さず読む。
+    """
+
+    def __init__(self):
+        self.interview_repository = InterviewRepository()
+        self.detail_repository = InterviewDetailRepository()
+        self.qr_repository = InterviewQuestionResponseRepository()
+        self.company_repository = CompanyRepository()
+        self.position_repository = JobPositionRepository()
+        self.criteria_service = CriteriaService()
+        self._contexts: dict[UUID, ReportContext | None] = {}
+
+    async def load(self, interview_id: UUID) -> ReportContext | None:
+        if interview_id not in self._contexts:
+            self._contexts[interview_id] = await self._load(interview_id)
+        return self._contexts[interview_id]
+
+    async def _load(self, interview_id: UUID) -> ReportContext | None:
+        found = await self.interview_repository.find_by_id_with_candidate(
+            interview_id, columns=INTERVIEW_LIGHT_COLUMNS
+        )
+        if not found or found[1] is None:
+            return None
+        interview, candidate = found
+
+        company, position, details, qrs, tree = await asyncio.gather(
+            self.company_repository.find_by_id(candidate.company_id, use_cache=False),
+            self.position_repository.find_by_id(candidate.job_position_id, use_cache=False),
+            self.detail_repository.find_by_interview_id(interview_id),
+            self.qr_repository.find_by_interview_id(interview_id),
+            self.criteria_service.get_tree(candidate.job_position_id, use_cache=False),
+        )
+        return ReportContext(
+            interview=interview,
+            candidate=candidate,
+            company=company,
+            position=position,
+            details=details,
+            question_responses=qrs,
+            tree=tree,
+        )
+
+
+class BulkReportContextLoader:
+    """
+    複数面談のレポートコンテキストを BATCH_SIZE 件ずつまとめて解決する。
+    企業・ポジションは RelationLoader、評価・Q&Aは in.(...) で一括取得し、
+    定性要件ツリーはポジションごとに1回だけ取得する。
+    """
+
+    def __init__(self, include_question_responses: bool = True):
+        self.include_question_responses = include_question_responses
+        self.interview_repository = InterviewRepository()
+        self.detail_repository = InterviewDetailRepository()
+        self.qr_repository = InterviewQuestionResponseRepository()
+        self.candidate_repository = CandidateRepository()
+        self.relations = RelationLoader()
+        self.criteria_service = CriteriaService()
+        self.trees: dict[UUID, CriteriaTree] = {}
+
+    async def by_interview_ids(
+        self, interview_ids: list[UUID]
+    ) -> AsyncIterator[list[tuple[UUID, ReportContext | None]]]:
+        """指定順に (面談ID, コンテキスト) を返す。見つからない面談はコンテキストが None"""
+        for i in range(0, len(interview_ids), BATCH_SIZE):
+            batch = interview_ids[i : i + BATCH_SIZE]
+            interviews = await self.interview_repository.find_by_ids(
+                batch, columns=INTERVIEW_LIGHT_COLUMNS
+            )
+            candidates = []
+            if interviews:
+                candidates = await self.candidate_repository.find_by_ids(
+                    list({interview.candidate_id for interview in interviews})
+                )
+            contexts = await self._build(interviews, candidates)
+            yield [(id, contexts.get(id)) for id in batch]
+
+    async def by_job_position(
+        self, job_position_id: UUID
+    ) -> AsyncIterator[list[tuple[UUID, ReportContext | None]]]:
+        """
+        ポジションの候補者のうち面談済みのものを、候補者の新しい順に返す。
+        候補者は max-rows で切り詰められないよう、キーセットで BATCH_SIZE 件ずつ読む。
+        """
+        cursor = None
+        while True:
+            batch, cursor, _ = await self.candidate_repository.find_page(
+                cursor, BATCH_SIZE, job_position_id=job_position_id
+            )
+            if not batch:
+                return
+            interviews = await self.interview_repository.find_by_candidate_ids(
+                [c.id for c in batch], columns=INTERVIEW_LIGHT_COLUMNS
+            )
+            contexts = await self._build(interviews, batch)
+            by_candidate = {ctx.candidate.id: ctx for ctx in contexts.values()}
+            yield [
+                (by_candidate[c.id].interview.id, by_candidate[c.id])
+                for c in batch
+                if c.id in by_candidate
+            ]
+            if cursor is None:
+                return
+
+    async def _build(
+        self, interviews: list[Interview], candidates: list[Candidate]
+    ) -> dict[UUID, ReportContext]:
+        candidates_by_id = {c.id: c for c in candidates}
+        interviews = [i for i in interviews if i.candidate_id in candidates_by_id]
+        if not interviews:
+            return {}
+
+        interview_ids = [i.id for i in interviews]
+        _, details, qrs, _ = await asyncio.gather(
+            self.relations.load_companies_and_positions(candidates),
+            self.detail_repository.find_by_interview_ids(interview_ids),
+            self._load_question_responses(interview_ids),
+            self._load_trees({c.job_position_id for c in candidates}),
+        )
+
+        details_by_interview: dict[UUID, list[InterviewDetail]] = {}
+        for d in details:
+            details_by_interview.setdefault(d.interview_id, []).append(d)
+        qrs_by_interview: dict[UUID, list[InterviewQuestionResponse]] = {}
+        for q in qrs:
+            qrs_by_interview.setdefault(q.interview_id, []).append(q)
+
+        contexts = {}
+        for interview in interviews:
+            candidate = candidates_by_id[interview.candidate_id]
+            contexts[interview.id] = ReportContext(
+                interview=interview,
+                candidate=candidate,
+                company=self.relations.companies.get(candidate.company_id),
+                position=self.relations.positions.get(candidate.job_position_id),
+                details=details_by_interview.get(interview.id, []),
+                question_responses=qrs_by_interview.get(interview.id, []),
+                tree=self.trees[candidate.job_position_id],
+            )
+        return contexts
+
+    async def _load_question_responses(
+        self, interview_ids: list[UUID]
+    ) -> list[InterviewQuestionResponse]:
+        if not self.include_question_responses:
+            return []
+        return await self.qr_repository.find_by_interview_ids(interview_ids)
+
+    async def _load_trees(self, job_position_ids: set[UUID]) -> None:
+        missing = [id for id in job_position_ids if id not in self.trees]
+        trees = await asyncio.gather(*(self.criteria_service.get_tree(id) for id in missing))
+        self.trees.update(zip(missing, trees))
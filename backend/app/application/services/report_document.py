@@ -0,0 +1,143 @@
+"""
+レポートMarkdownのHTML/PDF変換（プロセスプールのワーカーで実行する純粋関数）。
+
+対象は ReportService が生成する範囲のMarkdown（見出し・箇条書き・太字・斜体の行・段落）。
+入力者のコメントはエスケープしてから装飾タグを付ける。
+PDFは reportlab（reports extra の任意依存）の日本語CIDフォントを使うため、フォントファイルは不要。
+"""
+
+import html
+import io
+import re
+
+from pydantic import BaseModel
+
+PDF_FONT = "HeiseiKakuGo-W5"
+
+_BOLD = re.compile(r"\*\*(.+?)\*\*")
+
+
+class Block(BaseModel):
+    kind: str  # h1 / h2 / h3 / li / p
+    text: str  # <b> / <i> のみを含むエスケープ済みテキスト
+    level: int = 0
+
+
+def _inline(text: str) -> str:
+    escaped = _BOLD.sub(r"<b>\1</b>", html.escape(text, quote=False))
+    if len(escaped) > 2 and escaped.startswith("_") and escaped.endswith("_"):
+        escaped = f"<i>{escaped[1:-1]}</i>"
+    return escaped
+
+
+def parse_blocks(markdown: str) -> list[Block]:
+    blocks = []
+    for line in markdown.splitlines():
+        stripped = line.strip()
+        if not stripped:
+            continue
+        heading = re.match(r"(#{1,3}) (.*)", stripped)
+        if heading:
+            blocks.append(Block(kind=f"h{len(heading.group(1))}", text=_inline(heading.group(2))))
+        elif stripped.startswith("- "):
+            level = 1 if line.startswith("  ") else 0
+            blocks.append(Block(kind="li", text=_inline(stripped[2:]), level=level))
+        else:
+            blocks.append(Block(kind="p", text=_inline(stripped)))
+    return blocks
+
+
+HTML_STYLE = """
+body { font-family: "Hiragino Kaku Gothic ProN", "Noto Sans JP", "Yu Gothic", sans-serif;
+       max-width: 800px; margin: 2em auto; line-height: 1.7; color: #222; }
+h1 { font-size: 1.5em; border-bottom: 2px solid #333; padding-bottom: .3em; }
+h2 { font-size: 1.2em; border-left: 4px solid #333; padding-left: .5em; margin-top: 1.5em; }
+h3 { font-size: 1.05em; margin-top: 1.2em; }
+"""
+
+
+def render_html(markdown: str) -> bytes:
+    blocks = parse_blocks(markdown)
+    title = next((b.text for b in blocks if b.kind == "h1"), "")
+    body = []
+    # 深さごとに <li> を開いたままか（入れ子の <ul> は親の <li> の中に置く）
+    open_items: list[bool] = []
+    for block in blocks:
+        target = block.level + 1 if block.kind == "li" else 0
+        while len(open_items) > target:
+            if open_items.pop():
+                body.append("</li>")
+            body.append("</ul>")
+        if block.kind != "li":
+            body.append(f"<{block.kind}>{block.text}</{block.kind}>")
+            continue
+        if len(open_items) == target and open_items[-1]:
+            body.append("</li>")
+        while len(open_items) < target:
+            body.append("<ul>")
+            open_items.append(False)
+        body.append(f"<li>{block.text}")
+        open_items[-1] = True
+    while open_items:
+        if open_items.pop():
+            body.append("</li>")
+        body.append("</ul>")
+
+    document = (
+        '<!DOCTYPE html>\n<html lang="ja">\n<head>\n<meta charset="utf-8">\n'
+        f"<title>{re.sub(r'<[^>]+>', '', title)}</title>\n"
+        f"<style>{HTML_STYLE}</style>\n</head>\n<body>\n"
+        + "\n".join(body)
+        + "\n</body>\n</html>\n"
+    )
+    return document.encode("utf-8")
+
+
+def render_pdf(markdown: str) -> bytes:
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.styles import ParagraphStyle
+    from reportlab.lib.units import mm
+    from reportlab.pdfbase import pdfmetrics
+    from reportlab.pdfbase.cidfonts import UnicodeCIDFont
+    from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer
+
+    pdfmetrics.registerFont(UnicodeCIDFont(PDF_FONT))
+    # CIDフォントには太字・斜体がないため、<b> / <i> も同じフォントに割り当てる
+    pdfmetrics.registerFontFamily(
+        PDF_FONT, normal=PDF_FONT, bold=PDF_FONT, italic=PDF_FONT, boldItalic=PDF_FONT
+    )
+
+    base = ParagraphStyle("base", fontName=PDF_FONT, fontSize=10.5, leading=17, wordWrap="CJK")
+    styles = {
+        "h1": ParagraphStyle("h1", parent=base, fontSize=16, leading=24, spaceAfter=8),
+        "h2": ParagraphStyle(
+            "h2", parent=base, fontSize=13, leading=20, spaceBefore=10, spaceAfter=4
+        ),
+        "h3": ParagraphStyle("h3", parent=base, fontSize=11.5, leading=18, spaceBefore=6),
+        "p": base,
+    }
+    list_styles = [
+        ParagraphStyle("li0", parent=base, leftIndent=12, bulletIndent=2),
+        ParagraphStyle("li1", parent=base, leftIndent=26, bulletIndent=16, textColor="#444444"),
+    ]
+
+    story = []
+    for block in parse_blocks(markdown):
+        if block.kind == "li":
+            bullet = "-" if block.level else "•"
+            story.append(Paragraph(block.text, list_styles[block.level], bulletText=bullet))
+        else:
+            story.append(Paragraph(block.text, styles[block.kind]))
+        if block.kind == "h1":
+            story.append(Spacer(1, 4 * mm))
+
+    buffer = io.BytesIO()
+    SimpleDocTemplate(
+        buffer,
+        pagesize=A4,
+        leftMargin=20 * mm,
+        rightMargin=20 * mm,
+        topMargin=20 * mm,
+        bottomMargin=20 * mm,
+    ).build(story)
+    return buffer.getvalue()
@@ -0,0 +1,103 @@
+import asyncio
+import hashlib
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
+from typing import Literal
+
+from app.application.services.report_document import render_html, render_pdf
+from app.core.config import get_settings
+from app.infrastructure.cache import TTLCache
+
+RenderFormat = Literal["html", "pdf"]
+
+RENDERERS = {"html": render_html, "pdf": render_pdf}
+
+MEDIA_TYPES = {"html": "text/html; charset=utf-8", "pdf": "application/pdf"}
+
+
+class RenderQueueFullError(Exception):
+    pass
+
+
+class RenderWorkerCrashedError(Exception):
+    pass
+
+
+def content_hash(markdown: str) -> str:
+    return hashlib.sha256(markdown.encode("utf-8")).hexdigest()
+
+
+class ReportRenderer:
+    """
+    レポートMarkdownのHTML/PDF変換をプロセスプールで実行する（イベントループを塞がない）。
+    実行中・待機中の合計を workers + queue_size 件に制限し、超えた分は RenderQueueFullError。
+    結果は内容ハッシュでキャッシュし、同じ内容の同時リクエストは1回の変換を共有する。
+    """
+
+    def __init__(self, workers: int, queue_size: int, cache: TTLCache[tuple[str, str], bytes]):
+        self.workers = workers
+        self.capacity = workers + queue_size
+        self.cache = cache
+        self._executor: ProcessPoolExecutor | None = None
+        self._inflight: dict[tuple[str, str], asyncio.Task] = {}
+
+    async def render(self, markdown: str, format: RenderFormat) -> bytes:
+        key = (content_hash(markdown), format)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        task = self._inflight.get(key)
+        if task is None:
+            if len(self._inflight) >= self.capacity:
+                raise RenderQueueFullError("Report rendering queue is full")
+            task = asyncio.create_task(self._render(key, markdown, format))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # 待っているリクエストが切断されても、他の待ち手のために変換は続ける
+        return await asyncio.shield(task)
+
+    async def _render(self, key: tuple[str, str], markdown: str, format: RenderFormat) -> bytes:
+        # 同時に走るのは workers 件まで。残りはプールのキューで待つ
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        try:
+            data = await loop.run_in_executor(executor, RENDERERS[format], markdown)
+        except BrokenProcessPool:
+            # ワーカーが異常終了（OOM・reportlab内のクラッシュ等）したプールは二度と使えないため、
+            # 次の変換で作り直す。同じ入力で再び落ちうるので、この変換自体は再試行しない
+            if self._executor is executor:
+                self._executor = None
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise RenderWorkerCrashedError("Report rendering worker crashed")
+        self.cache.set(key, data)
+        return data
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # イベントループのスレッドを引き継がないよう fork ではなく spawn で起動する
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._executor
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+@lru_cache
+def get_report_renderer() -> ReportRenderer:
+    settings = get_settings()
+    return ReportRenderer(
+        workers=settings.report_render_workers,
+        queue_size=settings.report_render_queue_size,
+        cache=TTLCache(
+            "rendered_reports",
+            maxsize=settings.report_render_cache_entries,
+            ttl=settings.report_render_cache_ttl_seconds,
+        ),
+    )
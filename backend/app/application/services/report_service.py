@@ -1,54 +1,112 @@
+import json
+from collections.abc import AsyncIterator, Awaitable, Callable
 from uuid import UUID
 
-from app.infrastructure.repositories.candidate_repository import CandidateRepository
-from app.infrastructure.repositories.company_repository import CompanyRepository
-from app.infrastructure.repositories.criteria_repository import (
-    CriteriaGroupRepository,
-    CriteriaItemRepository,
+from app.application.services.report_context import (
+    BulkReportContextLoader,
+    ReportContext,
+    ReportContextLoader,
 )
-from app.infrastructure.repositories.interview_repository import (
-    InterviewDetailRepository,
-    InterviewQuestionResponseRepository,
-    InterviewRepository,
-)
-from app.infrastructure.repositories.job_position_repository import JobPositionRepository
+from app.infrastructure.repositories.interview_repository import InterviewRepository
 
 
 class ReportService:
     def __init__(self):
         self.interview_repository = InterviewRepository()
-        self.detail_repository = InterviewDetailRepository()
-        self.qr_repository = InterviewQuestionResponseRepository()
-        self.candidate_repository = CandidateRepository()
-        self.company_repository = CompanyRepository()
-        self.position_repository = JobPositionRepository()
-        self.group_repository = CriteriaGroupRepository()
-        self.item_repository = CriteriaItemRepository()
+        # 同じインスタンスで両方のレポートを生成する場合はコンテキストを共有する
+        self.context_loader = ReportContextLoader()
 
     def _score_to_label(self, score: int) -> str:
         labels = {1: "×", 2: "△", 3: "◯", 4: "◎"}
         return labels.get(score, "-")
 
-    async def generate_client_report(self, interview_id: UUID) -> str:
-        interview = await self.interview_repository.find_by_id(interview_id)
-        if not interview:
-            return ""
+    async def get_client_report(self, interview_id: UUID) -> str:
+        return await self._get_cached_report("client", interview_id, self.generate_client_report)
+
+    async def get_agent_report(self, interview_id: UUID) -> str:
+        return await self._get_cached_report("agent", interview_id, self.generate_agent_report)
 
-        candidate = await self.candidate_repository.find_by_id(interview.candidate_id)
-        if not candidate:
+    async def _get_cached_report(
+        self,
+        report_type: str,
+        interview_id: UUID,
+        generate: Callable[[UUID], Awaitable[str]],
+    ) -> str:
+        cache = await self.interview_repository.get_report_cache(interview_id)
+        if not cache:
             return ""
 
-        company = await self.company_repository.find_by_id(candidate.company_id)
-        position = await self.position_repository.find_by_id(candidate.job_position_id)
-        details = await self.detail_repository.find_by_interview_id(interview_id)
-        qrs = await self.qr_repository.find_by_interview_id(interview_id)
+        fingerprint = cache["current_fingerprint"]
+        markdown = cache[f"{report_type}_report_markdown"]
+        if markdown and cache[f"{report_type}_report_fingerprint"] == fingerprint:
+            return markdown
 
-        groups = await self.group_repository.find_by_job_position_id(candidate.job_position_id)
-        items_by_group = {}
-        for g in groups:
-            items_by_group[g.id] = await self.item_repository.find_by_group_id(g.id)
+        # 生成中に入力が変わっても、保存するのは生成前のフィンガープリントなので次回再生成される
+        markdown = await generate(interview_id)
+        if markdown:
+            await self.interview_repository.save_report(
+                interview_id, report_type, markdown, fingerprint
+            )
+        return markdown
 
-        details_map = {d.criteria_item_id: d for d in details}
+    async def generate_client_report(self, interview_id: UUID) -> str:
+        context = await self.context_loader.load(interview_id)
+        if not context:
+            return ""
+        return self.render_client_report(context)
+
+    async def generate_agent_report(self, interview_id: UUID) -> str:
+        context = await self.context_loader.load(interview_id)
+        if not context:
+            return ""
+        return self.render_agent_report(context)
+
+    async def stream_bulk_reports(
+        self,
+        report_types: list[str],
+        interview_ids: list[UUID] | None = None,
+        job_position_id: UUID | None = None,
+    ) -> AsyncIterator[bytes]:
+        """
+        複数面談のレポートをNDJSONで返す（1行1レポート）。
+        BATCH_SIZE 件ごとに関連データをまとめて取得し、描画できた分から順に流す。
+        """
+        loader = BulkReportContextLoader(include_question_responses="client" in report_types)
+        if interview_ids is not None:
+            batches = loader.by_interview_ids(interview_ids)
+        else:
+            batches = loader.by_job_position(job_position_id)
+
+        renderers = {"client": self.render_client_report, "agent": self.render_agent_report}
+        async for batch in batches:
+            records = []
+            for interview_id, context in batch:
+                if context is None:
+                    records.append(
+                        {"interview_id": str(interview_id), "error": "Interview not found"}
+                    )
+                    continue
+                for report_type in report_types:
+                    records.append(
+                        {
+                            "interview_id": str(interview_id),
+                            "report_type": report_type,
+                            "markdown": renderers[report_type](context),
+                        }
+                    )
+            yield "".join(
+                json.dumps(r, ensure_ascii=False, separators=(",", ":")) + "\n" for r in records
+            ).encode("utf-8")
+
+    def render_client_report(self, context: ReportContext) -> str:
+        interview = context.interview
+        candidate = context.candidate
+        company = context.company
+        position = context.position
+        tree = context.tree
+        qrs = context.question_responses
+
+        details_map = {d.criteria_item_id: d for d in context.details}
 
         lines = [
             "# 0.5次面談 評価レポート（クライアント提出用）",
@@ -65,12 +123,11 @@ class ReportService:
             "## 定性要件別評価",
         ]
 
-        for g in groups:
+        for g in tree.groups:
             lines.append(f"\n### {g.label}")
             if g.description:
                 lines.append(f"_{g.description}_")
-            items = items_by_group.get(g.id, [])
-            for item in items:
+            for item in g.items:
                 detail = details_map.get(item.id)
                 score_label = self._score_to_label(detail.score_value) if detail else "-"
                 comment = detail.comment_external if detail and detail.comment_external else ""
@@ -96,25 +153,14 @@ class ReportService:
 
         return "\n".join(lines)
 
-    async def generate_agent_report(self, interview_id: UUID) -> str:
-        interview = await self.interview_repository.find_by_id(interview_id)
-        if not interview:
-            return ""
-
-        candidate = await self.candidate_repository.find_by_id(interview.candidate_id)
-        if not candidate:
-            return ""
-
-        company = await self.company_repository.find_by_id(candidate.company_id)
-        position = await self.position_repository.find_by_id(candidate.job_position_id)
-        details = await self.detail_repository.find_by_interview_id(interview_id)
-
-        groups = await self.group_repository.find_by_job_position_id(candidate.job_position_id)
-        items_by_group = {}
-        for g in groups:
-            items_by_group[g.id] = await self.item_repository.find_by_group_id(g.id)
+    def render_agent_report(self, context: ReportContext) -> str:
+        interview = context.interview
+        candidate = context.candidate
+        company = context.company
+        position = context.position
+        tree = context.tree
 
-        details_map = {d.criteria_item_id: d for d in details}
+        details_map = {d.criteria_item_id: d for d in context.details}
 
         result_text = "通過" if candidate.stage_0_5_result.value == "passed" else "見送り"
 
@@ -133,9 +179,8 @@ class ReportService:
         ]
 
         low_score_items = []
-        for g in groups:
-            items = items_by_group.get(g.id, [])
-            for item in items:
+        for g in tree.groups:
+            for item in g.items:
                 detail = details_map.get(item.id)
                 if detail and detail.score_value <= 2:
                     low_score_items.append((g.label, item.label, detail))
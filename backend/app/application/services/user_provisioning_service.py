@@ -0,0 +1,99 @@
+from typing import Optional
+from uuid import UUID
+
+from app.core.clerk import (
+    extract_client_claims,
+    extract_client_claims_from_clerk_user,
+    extract_primary_email,
+    is_allowed_email_domain,
+)
+from app.domain.entities.user import User, UserCreate, UserRole
+from app.infrastructure.repositories.company_repository import CompanyRepository
+from app.infrastructure.repositories.user_repository import UserRepository
+
+
+class UserProvisioningError(Exception):
+    """外部ユーザーがクライアントとして招待されていない等、ユーザーを作成できない場合"""
+
+
+class UserProvisioningService:
+    """Clerkのユーザー情報からusersテーブルの行を作成・更新する"""
+
+    def __init__(self):
+        self.user_repository = UserRepository()
+        self.company_repository = CompanyRepository()
+
+    async def provision(
+        self,
+        clerk_user_id: str,
+        clerk_user: dict,
+        token_claims: Optional[dict] = None,
+    ) -> User:
+        email = (extract_primary_email(clerk_user) or f"{clerk_user_id}@clerk.local").lower()
+        existing = await self.user_repository.find_by_clerk_id(clerk_user_id)
+
+        if existing is not None and existing.role != UserRole.CLIENT:
+            # 社内ユーザーのロールは /users で管理するため、プロフィールのみ反映する
+            role = existing.role
+            company_id = existing.company_id
+            name = self._display_name(clerk_user)
+        elif existing is None and is_allowed_email_domain(email):
+            # 最初の社内ユーザーのみ管理者にする
+            exists_any = await self.user_repository.exists_any()
+            role = UserRole.INTERVIEWER if exists_any else UserRole.ADMIN
+            company_id = None
+            name = self._display_name(clerk_user)
+        else:
+            company_id = await self._resolve_client_company_id(
+                email, clerk_user, token_claims or {}, existing
+            )
+            # Client users use the company name as display name.
+            company = await self.company_repository.find_by_id(company_id)
+            if not company:
+                raise UserProvisioningError("Company not found for company_id claim.")
+            role = UserRole.CLIENT
+            name = company.name
+
+        user_data = UserCreate(
+            clerk_id=clerk_user_id,
+            email=email,
+            name=name,
+            role=role,
+            company_id=company_id,
+        )
+        if existing is not None:
+            return await self.user_repository.upsert_from_clerk(user_data)
+        return await self.user_repository.create_from_clerk(user_data)
+
+    async def _resolve_client_company_id(
+        self,
+        email: str,
+        clerk_user: dict,
+        token_claims: dict,
+        existing: Optional[User],
+    ) -> UUID:
+        # External users must be explicitly marked as client with company_id claims
+        role_claim, company_claim = extract_client_claims(token_claims)
+        if not role_claim or not company_claim:
+            role_claim, company_claim = extract_client_claims_from_clerk_user(clerk_user)
+
+        if role_claim != UserRole.CLIENT.value or not company_claim:
+            if existing is not None and existing.company_id:
+                return existing.company_id
+            # Fallback: invite-only users can be linked by email (pre-provisioned in Supabase on invite).
+            existing_by_email = await self.user_repository.find_by_email(email)
+            if existing_by_email and existing_by_email.role == UserRole.CLIENT and existing_by_email.company_id:
+                return existing_by_email.company_id
+            raise UserProvisioningError(
+                "Access denied. External users must be invited as client users."
+            )
+
+        try:
+            return UUID(str(company_claim))
+        except Exception:
+            raise UserProvisioningError("Invalid company_id claim.")
+
+    def _display_name(self, clerk_user: dict) -> str:
+        first_name = clerk_user.get("first_name", "") or ""
+        last_name = clerk_user.get("last_name", "") or ""
+        return f"{first_name} {last_name}".strip() or "ユーザー"
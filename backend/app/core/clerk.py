@@ -0,0 +1,141 @@
+import base64
+import hashlib
+import hmac
+import json
+import time
+from typing import Mapping, Optional, Tuple
+
+import httpx
+
+from app.infrastructure.http_client import get_outbound_http_client
+
+ALLOWED_EMAIL_DOMAIN = "@bandq.jp"
+
+CLERK_API_BASE_URL = "https://api.clerk.com/v1"
+
+# Webhookのタイムスタンプ許容誤差（リプレイ対策）
+WEBHOOK_TOLERANCE_SECONDS = 300
+
+
+class WebhookVerificationError(Exception):
+    pass
+
+
+def is_allowed_email_domain(email: str) -> bool:
+    return email.lower().endswith(ALLOWED_EMAIL_DOMAIN)
+
+
+def extract_client_claims(payload: dict) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Extract client role/company claims from Clerk JWT.
+    Supports either root-level claims or nested public_metadata.
+    """
+    role = payload.get("role") or payload.get("user_role")
+    company_id = payload.get("company_id")
+
+    public_metadata = payload.get("public_metadata") or payload.get("publicMetadata") or payload.get("metadata")
+    if isinstance(public_metadata, str):
+        try:
+            public_metadata = json.loads(public_metadata)
+        except Exception:
+            public_metadata = {}
+    if isinstance(public_metadata, dict):
+        role = role or public_metadata.get("role")
+        company_id = company_id or public_metadata.get("company_id")
+
+    return role, company_id
+
+
+def extract_client_claims_from_clerk_user(clerk_user: dict) -> Tuple[Optional[str], Optional[str]]:
+    public_metadata = clerk_user.get("public_metadata") or clerk_user.get("publicMetadata") or {}
+    if isinstance(public_metadata, str):
+        try:
+            public_metadata = json.loads(public_metadata)
+        except Exception:
+            public_metadata = {}
+    if not isinstance(public_metadata, dict):
+        public_metadata = {}
+
+    role = public_metadata.get("role")
+    company_id = public_metadata.get("company_id")
+    return role, company_id
+
+
+def extract_primary_email(clerk_user: dict) -> Optional[str]:
+    """Clerkユーザーのプライマリメールアドレス（なければ先頭のアドレス）を返す"""
+    email_addresses = clerk_user.get("email_addresses") or []
+    for email_obj in email_addresses:
+        if email_obj.get("id") == clerk_user.get("primary_email_address_id"):
+            return email_obj.get("email_address")
+    if email_addresses:
+        return email_addresses[0].get("email_address")
+    return None
+
+
+async def get_clerk_user_info(
+    clerk_user_id: str,
+    secret_key: str,
+    http_client: Optional[httpx.AsyncClient] = None,
+) -> dict:
+    """Clerk Backend APIからユーザー情報を取得"""
+    client = http_client or get_outbound_http_client()
+    try:
+        response = await client.get(
+            f"{CLERK_API_BASE_URL}/users/{clerk_user_id}",
+            headers={"Authorization": f"Bearer {secret_key}"},
+        )
+        response.raise_for_status()
+        return response.json()
+    except Exception as e:
+        print(f"Error fetching Clerk user: {e}")
+        return {}
+
+
+async def create_clerk_invitation(
+    payload: dict,
+    secret_key: str,
+    http_client: Optional[httpx.AsyncClient] = None,
+) -> httpx.Response:
+    """Clerk Backend APIで招待を作成する（エラー判定は呼び出し側で行う）"""
+    client = http_client or get_outbound_http_client()
+    return await client.post(
+        f"{CLERK_API_BASE_URL}/invitations",
+        headers={"Authorization": f"Bearer {secret_key}"},
+        json=payload,
+    )
+
+
+def _webhook_secret_bytes(secret: str) -> bytes:
+    return base64.b64decode(secret.removeprefix("whsec_"))
+
+
+def sign_webhook(secret: str, msg_id: str, timestamp: str, body: bytes) -> str:
+    """Svix形式の署名（"v1,<base64>"）を生成する"""
+    signed_content = f"{msg_id}.{timestamp}.".encode() + body
+    digest = hmac.new(_webhook_secret_bytes(secret), signed_content, hashlib.sha256).digest()
+    return f"v1,{base64.b64encode(digest).decode()}"
+
+
+def verify_webhook(secret: str, headers: Mapping[str, str], body: bytes) -> dict:
+    """
+    ClerkのWebhook（Svix署名）を検証し、ペイロードを返す。
+    svix-signature には鍵ローテーション中は複数の署名がスペース区切りで入る。
+    """
+    msg_id = headers.get("svix-id")
+    timestamp = headers.get("svix-timestamp")
+    signatures = headers.get("svix-signature")
+    if not msg_id or not timestamp or not signatures:
+        raise WebhookVerificationError("Missing svix headers")
+
+    try:
+        sent_at = int(timestamp)
+    except ValueError:
+        raise WebhookVerificationError("Invalid svix-timestamp")
+    if abs(time.time() - sent_at) > WEBHOOK_TOLERANCE_SECONDS:
+        raise WebhookVerificationError("Timestamp outside tolerance")
+
+    expected = sign_webhook(secret, msg_id, timestamp, body)
+    if not any(hmac.compare_digest(expected, sig) for sig in signatures.split()):
+        raise WebhookVerificationError("Signature mismatch")
+
+    return json.loads(body)
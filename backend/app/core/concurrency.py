@@ -0,0 +1,16 @@
+import asyncio
+from collections.abc import Awaitable
+from typing import Any
+
+from app.core.config import get_settings
+
+
+async def gather_limited(*aws: Awaitable[Any], limit: int | None = None) -> list[Any]:
+    """asyncio.gather と同じ順序で結果を返しつつ、同時実行数を limit までに抑える"""
+    semaphore = asyncio.Semaphore(limit or get_settings().supabase_fanout_limit)
+
+    async def run(aw: Awaitable[Any]) -> Any:
+        async with semaphore:
+            return await aw
+
+    return list(await asyncio.gather(*(run(aw) for aw in aws)))
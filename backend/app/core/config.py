@@ -12,10 +12,42 @@ class Settings(BaseSettings):
     supabase_url: str = ""
     supabase_anon_key: str = ""
     supabase_service_role_key: str = ""
+    supabase_timeout_seconds: float = 30.0
+    supabase_max_connections: int = 100
+    supabase_max_keepalive_connections: int = 20
+    supabase_fanout_limit: int = 8
+    # PostgRESTの max-rows（Supabase既定は1000）。1リクエストで返る行数はこれで切り詰められる
+    supabase_max_rows: int = 1000
+
+    reference_cache_ttl_seconds: float = 60.0
+    reference_cache_max_entries: int = 2048
+    principal_cache_ttl_seconds: float = 60.0
+
+    page_size_default: int = 50
+    page_size_max: int = 500
+    export_page_size: int = 500
+    delta_export_lag_seconds: int = 60
+    # 差分エクスポートの since として受け付ける最大の間隔。これより古い削除記録は消える
+    delta_export_max_gap_days: int = 30
+    export_job_concurrency: int = 2
+    export_job_ttl_seconds: float = 3600.0
+    export_artifact_dir: str = "/tmp/exports"
+
+    report_render_workers: int = 2
+    report_render_queue_size: int = 8
+    report_render_cache_entries: int = 256
+    report_render_cache_ttl_seconds: float = 86400.0
 
     clerk_secret_key: str = ""
     clerk_publishable_key: str = ""
     clerk_jwt_issuer: str = ""
+    clerk_webhook_secret: str = ""
+
+    outbound_timeout_seconds: float = 10.0
+    outbound_connect_timeout_seconds: float = 5.0
+    outbound_max_connections: int = 50
+    outbound_max_keepalive_connections: int = 10
+    clerk_invite_concurrency: int = 5
 
     frontend_base_url: str = "http://localhost:3000"
 
@@ -1,104 +1,59 @@
-from typing import Annotated, Optional, Tuple
+import logging
+from typing import Annotated, Optional
 from uuid import UUID, uuid4
-import json
+import time
 
-from fastapi import Depends, HTTPException, Request, status
+from fastapi import BackgroundTasks, Depends, HTTPException, Request, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from jose import JWTError, jwt
-import httpx
 
+from app.application.services.user_provisioning_service import (
+    UserProvisioningError,
+    UserProvisioningService,
+)
+from app.core.clerk import ALLOWED_EMAIL_DOMAIN, get_clerk_user_info, is_allowed_email_domain
 from app.core.config import Settings, get_settings
-from app.domain.entities.user import User, UserRole, UserCreate
+from app.core.jwks import get_jwks_manager
+from app.domain.entities.user import User, UserRole
+from app.infrastructure.cache import TTLCache
 from app.infrastructure.repositories.company_repository import CompanyRepository
 from app.infrastructure.repositories.user_repository import UserRepository
 
-security = HTTPBearer(auto_error=False)
-
-_jwks_cache: Optional[dict] = None
-
-ALLOWED_EMAIL_DOMAIN = "@bandq.jp"
-
-
-def is_allowed_email_domain(email: str) -> bool:
-    return email.lower().endswith(ALLOWED_EMAIL_DOMAIN)
-
-
-def extract_client_claims(payload: dict) -> Tuple[Optional[str], Optional[str]]:
-    """
-    Extract client role/company claims from Clerk JWT.
-    Supports either root-level claims or nested public_metadata.
-    """
-    role = payload.get("role") or payload.get("user_role")
-    company_id = payload.get("company_id")
-
-    public_metadata = payload.get("public_metadata") or payload.get("publicMetadata") or payload.get("metadata")
-    if isinstance(public_metadata, str):
-        try:
-            public_metadata = json.loads(public_metadata)
-        except Exception:
-            public_metadata = {}
-    if isinstance(public_metadata, dict):
-        role = role or public_metadata.get("role")
-        company_id = company_id or public_metadata.get("company_id")
-
-    return role, company_id
-
+logger = logging.getLogger(__name__)
 
-def extract_client_claims_from_clerk_user(clerk_user: dict) -> Tuple[Optional[str], Optional[str]]:
-    public_metadata = clerk_user.get("public_metadata") or clerk_user.get("publicMetadata") or {}
-    if isinstance(public_metadata, str):
-        try:
-            public_metadata = json.loads(public_metadata)
-        except Exception:
-            public_metadata = {}
-    if not isinstance(public_metadata, dict):
-        public_metadata = {}
-
-    role = public_metadata.get("role")
-    company_id = public_metadata.get("company_id")
-    return role, company_id
-
-
-async def get_clerk_jwks(issuer: str) -> dict:
-    global _jwks_cache
-    if _jwks_cache is not None:
-        return _jwks_cache
+security = HTTPBearer(auto_error=False)
 
-    jwks_url = f"{issuer}/.well-known/jwks.json"
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.get(jwks_url)
-            response.raise_for_status()
-            _jwks_cache = response.json()
-            return _jwks_cache
-        except Exception:
-            return {"keys": []}
+# 検証済みトークン (clerk_id, exp) から解決済みユーザーへのキャッシュ
+_principal_cache: TTLCache[tuple[str, int], User] = TTLCache(
+    "principals", ttl=get_settings().principal_cache_ttl_seconds
+)
 
 
-def get_public_key_from_jwks(jwks: dict, kid: str) -> Optional[dict]:
-    for key in jwks.get("keys", []):
-        if key.get("kid") == kid:
-            return key
-    return jwks.get("keys", [None])[0] if jwks.get("keys") else None
+def invalidate_principals(
+    clerk_id: Optional[str] = None, company_id: Optional[UUID] = None
+) -> None:
+    """ユーザー行の変更時に呼び出す。引数を省略した場合は全件破棄する"""
+    if clerk_id is None and company_id is None:
+        _principal_cache.clear()
+        return
+    _principal_cache.invalidate_where(
+        lambda key, user: (clerk_id is not None and key[0] == clerk_id)
+        or (company_id is not None and user.company_id == company_id)
+    )
 
 
-async def get_clerk_user_info(clerk_user_id: str, secret_key: str) -> dict:
-    """Clerk Backend APIからユーザー情報を取得"""
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.get(
-                f"https://api.clerk.com/v1/users/{clerk_user_id}",
-                headers={"Authorization": f"Bearer {secret_key}"},
-            )
-            response.raise_for_status()
-            return response.json()
-        except Exception as e:
-            print(f"Error fetching Clerk user: {e}")
-            return {}
+async def sync_client_display_name(company_id: UUID, name: str) -> None:
+    """クライアントユーザーの表示名を企業名に揃える（レスポンス返却後に実行）"""
+    try:
+        await UserRepository().sync_client_names(company_id, name)
+    except Exception:
+        # バックグラウンドタスクのためレスポンスには現れない。ログで検知する
+        logger.exception("Failed to sync client display name for company %s", company_id)
 
 
 async def get_current_user(
     request: Request,
+    background_tasks: BackgroundTasks,
     credentials: Annotated[Optional[HTTPAuthorizationCredentials], Depends(security)],
     settings: Annotated[Settings, Depends(get_settings)],
 ) -> User:
@@ -134,8 +89,7 @@ async def get_current_user(
         kid = unverified_header.get("kid")
 
         if settings.clerk_jwt_issuer:
-            jwks = await get_clerk_jwks(settings.clerk_jwt_issuer)
-            public_key = get_public_key_from_jwks(jwks, kid)
+            public_key = await get_jwks_manager(settings.clerk_jwt_issuer).get_key(kid)
 
             if public_key is None:
                 raise HTTPException(
@@ -167,85 +121,26 @@ async def get_current_user(
             detail=f"Could not validate credentials: {str(e)}",
         )
 
+    exp = payload.get("exp")
+    cache_key = (clerk_user_id, exp) if isinstance(exp, int) else None
+    if cache_key is not None:
+        cached = _principal_cache.get(cache_key)
+        if cached is not None:
+            return cached.model_copy()
+
     user_repo = UserRepository()
     user = await user_repo.find_by_clerk_id(clerk_user_id)
 
     if user is None:
+        # 通常はWebhookで事前作成済み。未着の場合のみClerk APIにフォールバックする
         clerk_user = await get_clerk_user_info(clerk_user_id, settings.clerk_secret_key)
-        
-        email = None
-        if clerk_user.get("email_addresses"):
-            for email_obj in clerk_user.get("email_addresses", []):
-                if email_obj.get("id") == clerk_user.get("primary_email_address_id"):
-                    email = email_obj.get("email_address")
-                    break
-            if email is None and clerk_user.get("email_addresses"):
-                email = clerk_user["email_addresses"][0].get("email_address")
-        
-        if email is None:
-            email = f"{clerk_user_id}@clerk.local"
-        email = email.lower()
-
-        is_internal = is_allowed_email_domain(email)
-
-        # External users must be explicitly marked as client with company_id claims
-        if not is_internal:
-            role_claim, company_claim = extract_client_claims(payload)
-            if not role_claim or not company_claim:
-                role_claim, company_claim = extract_client_claims_from_clerk_user(clerk_user)
-
-            # Fallback: invite-only users can be linked by email (pre-provisioned in Supabase on invite).
-            if role_claim != UserRole.CLIENT.value or not company_claim:
-                existing_by_email = await user_repo.find_by_email(email)
-                if existing_by_email and existing_by_email.role == UserRole.CLIENT and existing_by_email.company_id:
-                    role_claim = UserRole.CLIENT.value
-                    company_claim = str(existing_by_email.company_id)
-                else:
-                    raise HTTPException(
-                        status_code=status.HTTP_403_FORBIDDEN,
-                        detail="Access denied. External users must be invited as client users.",
-                    )
-            try:
-                company_uuid = UUID(str(company_claim))
-            except Exception:
-                raise HTTPException(
-                    status_code=status.HTTP_403_FORBIDDEN,
-                    detail="Invalid company_id claim.",
-                )
-        else:
-            company_uuid = None
-        
-        first_name = clerk_user.get("first_name", "") or ""
-        last_name = clerk_user.get("last_name", "") or ""
-        name = f"{first_name} {last_name}".strip() or "ユーザー"
-
-        # Client users use the company name as display name.
-        if not is_internal and company_uuid is not None:
-            company_repo = CompanyRepository()
-            company = await company_repo.find_by_id(company_uuid)
-            if not company:
-                raise HTTPException(
-                    status_code=status.HTTP_403_FORBIDDEN,
-                    detail="Company not found for company_id claim.",
-                )
-            name = company.name
-
-        all_users = await user_repo.find_all()
-        if is_internal:
-            role = UserRole.ADMIN if len(all_users) == 0 else UserRole.INTERVIEWER
-        else:
-            role = UserRole.CLIENT
-
-        new_user = UserCreate(
-            clerk_id=clerk_user_id,
-            email=email,
-            name=name,
-            role=role,
-            company_id=company_uuid,
-        )
-        
         try:
-            user = await user_repo.create_from_clerk(new_user)
+            user = await UserProvisioningService().provision(clerk_user_id, clerk_user, payload)
+        except UserProvisioningError as e:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail=str(e),
+            )
         except Exception as e:
             user = await user_repo.find_by_clerk_id(clerk_user_id)
             if user is None:
@@ -267,11 +162,16 @@ async def get_current_user(
                     detail="Client user is not associated with a company.",
                 )
             # Keep client display name in sync with the company name.
+            # The write is deferred so the request itself never blocks on it.
             company_repo = CompanyRepository()
             company = await company_repo.find_by_id(user.company_id)
             if company and user.name != company.name:
                 user.name = company.name
-                await user_repo.update(user)
+                background_tasks.add_task(sync_client_display_name, company.id, company.name)
+
+    if cache_key is not None:
+        # トークンの有効期限を超えて保持しない
+        _principal_cache.set(cache_key, user.model_copy(), ttl=exp - time.time())
 
     return user
 
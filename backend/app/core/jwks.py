@@ -0,0 +1,111 @@
+import asyncio
+import logging
+import time
+from functools import lru_cache
+
+import httpx
+from jose import jwk
+from jose.backends.base import Key
+
+from app.infrastructure.http_client import get_outbound_http_client
+
+logger = logging.getLogger(__name__)
+
+JWKS_TTL_SECONDS = 3600.0
+# 未知のkidによる強制リフレッシュの最短間隔（不正トークンでJWKSエンドポイントを叩かせない）
+FORCED_REFRESH_INTERVAL_SECONDS = 30.0
+JWKS_FETCH_TIMEOUT_SECONDS = 5.0
+
+
+class JWKSKeyManager:
+    """
+    Clerk JWKSの公開鍵を kid ごとにパース済みで保持する。
+
+    - TTL切れ後は手元の鍵で検証を続けつつ、バックグラウンドで再取得する
+    - 未知の kid は間隔を空けて強制再取得する（鍵ローテーション直後の401を防ぐ）
+    - 同時に発生した再取得は1回のリクエストにまとめる
+    - 取得に失敗した後は、初回取得・TTL切れの再取得とも強制再取得と同じ間隔を空ける
+      （Clerk障害時に全リクエストを待たせたり、リクエストごとにJWKSを取得したりしない）
+    """
+
+    def __init__(
+        self,
+        issuer: str,
+        ttl: float = JWKS_TTL_SECONDS,
+        forced_refresh_interval: float = FORCED_REFRESH_INTERVAL_SECONDS,
+        http_client: httpx.AsyncClient | None = None,
+    ):
+        self.jwks_url = f"{issuer.rstrip('/')}/.well-known/jwks.json"
+        self.ttl = ttl
+        self.forced_refresh_interval = forced_refresh_interval
+        self.http_client = http_client
+        self._keys: dict[str, Key] = {}
+        self._fetched_at: float | None = None
+        self._last_attempt: float | None = None
+        self._refresh_task: asyncio.Task | None = None
+
+    async def get_key(self, kid: str | None) -> Key | None:
+        if self._fetched_at is None:
+            if self._is_refreshing() or self._can_force_refresh():
+                await self._refresh()
+        elif time.monotonic() - self._fetched_at > self.ttl and self._can_force_refresh():
+            # 取得に失敗しても _fetched_at は進まないため、再試行は前回の試行から間隔を空ける
+            self._start_refresh()
+
+        key = self._lookup(kid)
+        if key is None and self._can_force_refresh():
+            await self._refresh()
+            key = self._lookup(kid)
+        return key
+
+    def _lookup(self, kid: str | None) -> Key | None:
+        if kid is None:
+            # kidなしトークンは鍵が1つだけの場合に限り受け付ける
+            return next(iter(self._keys.values())) if len(self._keys) == 1 else None
+        return self._keys.get(kid)
+
+    def _can_force_refresh(self) -> bool:
+        if self._last_attempt is None:
+            return True
+        return time.monotonic() - self._last_attempt >= self.forced_refresh_interval
+
+    def _is_refreshing(self) -> bool:
+        return self._refresh_task is not None and not self._refresh_task.done()
+
+    def _start_refresh(self) -> asyncio.Task:
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self._fetch())
+        return self._refresh_task
+
+    async def _refresh(self) -> None:
+        # shieldにより、待機側のリクエストがキャンセルされても共有の取得処理は継続する
+        await asyncio.shield(self._start_refresh())
+
+    async def _fetch(self) -> None:
+        self._last_attempt = time.monotonic()
+        try:
+            client = self.http_client or get_outbound_http_client()
+            response = await client.get(self.jwks_url, timeout=JWKS_FETCH_TIMEOUT_SECONDS)
+            response.raise_for_status()
+            jwks = response.json()
+        except Exception as e:
+            # 取得失敗時は既存の鍵を維持し、次のリクエストで再試行する
+            logger.warning("Failed to fetch JWKS from %s: %s", self.jwks_url, e)
+            return
+
+        keys: dict[str, Key] = {}
+        for key_data in jwks.get("keys", []):
+            kid = key_data.get("kid")
+            if not kid:
+                continue
+            try:
+                keys[kid] = jwk.construct(key_data, key_data.get("alg", "RS256"))
+            except Exception as e:
+                logger.warning("Skipping unparsable JWK %s: %s", kid, e)
+        self._keys = keys
+        self._fetched_at = time.monotonic()
+
+
+@lru_cache
+def get_jwks_manager(issuer: str) -> JWKSKeyManager:
+    return JWKSKeyManager(issuer)
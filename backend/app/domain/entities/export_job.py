@@ -0,0 +1,36 @@
+from datetime import datetime
+from enum import Enum
+from uuid import UUID
+
+from pydantic import BaseModel
+
+
+class ExportJobKind(str, Enum):
+    CANDIDATES_CSV = "candidates_csv"
+    CANDIDATES_WIDE_CSV = "candidates_wide_csv"
+    CANDIDATES_PARQUET = "candidates_parquet"
+
+
+class ExportJobStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+class ExportJob(BaseModel):
+    id: UUID
+    kind: ExportJobKind
+    company_id: UUID | None = None
+    job_position_id: UUID | None = None
+    include_comments: bool = False
+
+    status: ExportJobStatus = ExportJobStatus.QUEUED
+    rows_written: int = 0
+    total_rows: int | None = None  # 推定値
+    size_bytes: int | None = None
+    error: str | None = None
+
+    created_at: datetime
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
@@ -0,0 +1,99 @@
+import asyncio
+import os
+import time
+from collections.abc import AsyncIterator
+from functools import lru_cache
+from pathlib import Path
+from typing import Protocol
+
+from app.core.config import get_settings
+
+READ_CHUNK_SIZE = 1024 * 1024
+
+
+class ArtifactNotFoundError(Exception):
+    pass
+
+
+class ArtifactStorage(Protocol):
+    """エクスポート成果物の保存先（GCS等に差し替える場合はこのインターフェースを実装する）"""
+
+    async def write(self, key: str, chunks: AsyncIterator[bytes]) -> int: ...
+
+    async def read(self, key: str) -> AsyncIterator[bytes]:
+        """開けた時点で返す。存在しなければ ArtifactNotFoundError"""
+        ...
+
+    async def delete(self, key: str) -> None: ...
+
+    async def purge(self, older_than: float) -> int:
+        """最終更新から older_than 秒を過ぎた成果物（書きかけを含む）を削除し、件数を返す"""
+        ...
+
+
+class LocalArtifactStorage:
+    """ローカルディレクトリへの保存。書き込み中は .part に書き、完了時にリネームする"""
+
+    def __init__(self, directory: str):
+        self.directory = Path(directory)
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key
+
+    async def write(self, key: str, chunks: AsyncIterator[bytes]) -> int:
+        path = self._path(key)
+        partial = path.with_name(path.name + ".part")
+        await asyncio.to_thread(self.directory.mkdir, parents=True, exist_ok=True)
+        f = await asyncio.to_thread(open, partial, "wb")
+        size = 0
+        try:
+            async for chunk in chunks:
+                await asyncio.to_thread(f.write, chunk)
+                size += len(chunk)
+        except BaseException:
+            await asyncio.to_thread(f.close)
+            await asyncio.to_thread(partial.unlink, missing_ok=True)
+            raise
+        await asyncio.to_thread(f.close)
+        await asyncio.to_thread(os.replace, partial, path)
+        return size
+
+    async def read(self, key: str) -> AsyncIterator[bytes]:
+        # 開いてしまえば、読み出し中に削除されても最後まで読める
+        try:
+            f = await asyncio.to_thread(open, self._path(key), "rb")
+        except FileNotFoundError:
+            raise ArtifactNotFoundError(key)
+        return self._read_chunks(f)
+
+    async def _read_chunks(self, f) -> AsyncIterator[bytes]:
+        try:
+            while chunk := await asyncio.to_thread(f.read, READ_CHUNK_SIZE):
+                yield chunk
+        finally:
+            await asyncio.to_thread(f.close)
+
+    async def delete(self, key: str) -> None:
+        await asyncio.to_thread(self._path(key).unlink, missing_ok=True)
+
+    async def purge(self, older_than: float) -> int:
+        return await asyncio.to_thread(self._purge, older_than)
+
+    def _purge(self, older_than: float) -> int:
+        if not self.directory.is_dir():
+            return 0
+        deadline = time.time() - older_than
+        purged = 0
+        for path in self.directory.iterdir():
+            try:
+                if path.is_file() and path.stat().st_mtime < deadline:
+                    path.unlink()
+                    purged += 1
+            except FileNotFoundError:
+                continue
+        return purged
+
+
+@lru_cache
+def get_artifact_storage() -> ArtifactStorage:
+    return LocalArtifactStorage(get_settings().export_artifact_dir)
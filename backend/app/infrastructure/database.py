@@ -1,12 +1,39 @@
 from functools import lru_cache
 
-from supabase import Client, create_client
+import httpx
+from supabase import AsyncClient, AsyncClientOptions
 
 from app.core.config import get_settings
 
 
 @lru_cache
-def get_supabase_client() -> Client:
+def get_supabase_http_client() -> httpx.AsyncClient:
+    """Supabase向けの共有HTTPクライアント（全リポジトリでコネクションプールを共有）"""
     settings = get_settings()
-    return create_client(settings.supabase_url, settings.supabase_service_role_key)
+    return httpx.AsyncClient(
+        timeout=httpx.Timeout(settings.supabase_timeout_seconds),
+        limits=httpx.Limits(
+            max_connections=settings.supabase_max_connections,
+            max_keepalive_connections=settings.supabase_max_keepalive_connections,
+        ),
+        follow_redirects=True,
+        http2=True,
+    )
 
+
+@lru_cache
+def get_supabase_client() -> AsyncClient:
+    settings = get_settings()
+    options = AsyncClientOptions(
+        auto_refresh_token=False,
+        persist_session=False,
+        httpx_client=get_supabase_http_client(),
+    )
+    return AsyncClient(settings.supabase_url, settings.supabase_service_role_key, options)
+
+
+async def close_supabase_client() -> None:
+    if get_supabase_http_client.cache_info().currsize:
+        await get_supabase_http_client().aclose()
+    get_supabase_http_client.cache_clear()
+    get_supabase_client.cache_clear()
@@ -0,0 +1,28 @@
+from functools import lru_cache
+
+import httpx
+
+from app.core.config import get_settings
+
+
+@lru_cache
+def get_outbound_http_client() -> httpx.AsyncClient:
+    """Clerk等の外部API向けの共有HTTPクライアント（アプリのライフサイクル内で使い回す）"""
+    settings = get_settings()
+    return httpx.AsyncClient(
+        timeout=httpx.Timeout(
+            settings.outbound_timeout_seconds,
+            connect=settings.outbound_connect_timeout_seconds,
+        ),
+        limits=httpx.Limits(
+            max_connections=settings.outbound_max_connections,
+            max_keepalive_connections=settings.outbound_max_keepalive_connections,
+        ),
+        http2=True,
+    )
+
+
+async def close_outbound_http_client() -> None:
+    if get_outbound_http_client.cache_info().currsize:
+        await get_outbound_http_client().aclose()
+    get_outbound_http_client.cache_clear()
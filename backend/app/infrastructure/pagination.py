@@ -0,0 +1,75 @@
+import base64
+import json
+from collections.abc import Callable
+from datetime import datetime
+from uuid import UUID
+
+from postgrest import CountMethod
+
+from app.core.config import get_settings
+
+
+class InvalidCursorError(ValueError):
+    pass
+
+
+def encode_cursor(created_at: str, id: str) -> str:
+    payload = json.dumps([created_at, id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[str, str]:
+    """カーソルを (created_at, id) に戻す。改ざん・不正な値は InvalidCursorError"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, id = json.loads(base64.urlsafe_b64decode(padded))
+        datetime.fromisoformat(created_at)
+        UUID(id)
+    except Exception:
+        raise InvalidCursorError("Invalid cursor")
+    return created_at, id
+
+
+def count_method(include_count: bool) -> CountMethod | None:
+    # 件数は pg_class の統計を使う推定値（大きなテーブルでも全件走査しない）
+    return CountMethod.estimated if include_count else None
+
+
+async def fetch_keyset_page(
+    query, cursor: str | None, limit: int
+) -> tuple[list[dict], str | None, int | None]:
+    """
+    (created_at, id) の降順でキーセットページングする。
+    query はフィルタ済みのselectビルダー。戻り値は (行, 次ページのカーソル, 推定件数)。
+    """
+    if cursor:
+        created_at, id = decode_cursor(cursor)
+        query = query.or_(
+            f'created_at.lt."{created_at}",'
+            f'and(created_at.eq."{created_at}",id.lt.{id})'
+        )
+    # 1件多く取得して次ページの有無を判定する
+    response = await (
+        query.order("created_at", desc=True).order("id", desc=True).limit(limit + 1).execute()
+    )
+    rows = response.data[:limit]
+    next_cursor = None
+    if len(response.data) > limit:
+        last = rows[-1]
+        next_cursor = encode_cursor(last["created_at"], last["id"])
+    return rows, next_cursor, response.count
+
+
+async def fetch_all_pages(build_query: Callable[[], object]) -> list[dict]:
+    """
+    max-rows で切り詰められないよう、短いページが返るまで .range() で読み進める。
+    build_query はページごとに新しいビルダーを返す関数で、一意に定まる並び順を付けておくこと。
+    """
+    page_size = get_settings().supabase_max_rows
+    rows: list[dict] = []
+    while True:
+        start = len(rows)
+        response = await build_query().range(start, start + page_size - 1).execute()
+        rows.extend(response.data)
+        if len(response.data) < page_size:
+            return rows
@@ -0,0 +1,21 @@
+from collections.abc import Iterable
+
+from pydantic import BaseModel
+
+
+def select_columns(
+    model: type[BaseModel],
+    fields: Iterable[str] | None = None,
+    exclude: Iterable[str] = (),
+) -> str:
+    """
+    エンティティの列からselect句を組み立てる。
+    fields 指定時はエンティティの必須列と指定列のみ、未指定時は exclude 以外の全列。
+    """
+    excluded = set(exclude)
+    wanted = set(fields) if fields is not None else None
+    return ",".join(
+        name
+        for name, field in model.model_fields.items()
+        if name not in excluded and (wanted is None or field.is_required() or name in wanted)
+    )
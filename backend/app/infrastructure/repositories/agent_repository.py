@@ -1,7 +1,14 @@
+from collections.abc import Iterable
+from datetime import date, timedelta
 from uuid import UUID
 
 from app.domain.entities.agent import Agent
+from app.infrastructure.cache import TTLCache
 from app.infrastructure.database import get_supabase_client
+from app.infrastructure.pagination import count_method, fetch_keyset_page
+from app.infrastructure.projection import select_columns
+
+_cache: TTLCache[UUID, Agent] = TTLCache("agents")
 
 
 class AgentRepository:
@@ -10,7 +17,10 @@ class AgentRepository:
         self.table = "agents"
 
     async def find_by_id(self, id: UUID) -> Agent | None:
-        response = (
+        cached = _cache.get(id)
+        if cached is not None:
+            return cached.model_copy()
+        response = await (
             self.client.table(self.table)
             .select("*")
             .eq("id", str(id))
@@ -18,37 +28,94 @@ class AgentRepository:
             .execute()
         )
         if response.data:
-            return Agent(**response.data[0])
+            agent = Agent(**response.data[0])
+            _cache.set(agent.id, agent.model_copy())
+            return agent
         return None
 
-    async def find_all(self) -> list[Agent]:
-        response = (
+    async def find_by_ids(self, ids: list[UUID]) -> list[Agent]:
+        found: list[Agent] = []
+        missing: list[UUID] = []
+        for id in ids:
+            cached = _cache.get(id)
+            if cached is None:
+                missing.append(id)
+            else:
+                found.append(cached.model_copy())
+        if not missing:
+            return found
+        response = await (
             self.client.table(self.table)
             .select("*")
+            .in_("id", [str(id) for id in missing])
+            .eq("deleted_flag", False)
+            .execute()
+        )
+        for row in response.data:
+            agent = Agent(**row)
+            _cache.set(agent.id, agent.model_copy())
+            found.append(agent)
+        return found
+
+    async def find_all(self, columns: Iterable[str] | None = None) -> list[Agent]:
+        response = await (
+            self.client.table(self.table)
+            .select(select_columns(Agent, columns))
             .eq("deleted_flag", False)
             .order("company_name")
             .execute()
         )
         return [Agent(**row) for row in response.data]
 
+    async def find_page(
+        self,
+        cursor: str | None,
+        limit: int,
+        include_count: bool = False,
+        columns: Iterable[str] | None = None,
+    ) -> tuple[list[Agent], str | None, int | None]:
+        query = (
+            self.client.table(self.table)
+            .select(select_columns(Agent, columns), count=count_method(include_count))
+            .eq("deleted_flag", False)
+        )
+        rows, next_cursor, total = await fetch_keyset_page(query, cursor, limit)
+        return [Agent(**row) for row in rows], next_cursor, total
+
     async def create(self, agent: Agent) -> Agent:
         data = agent.model_dump(mode="json")
-        response = self.client.table(self.table).insert(data).execute()
+        response = await self.client.table(self.table).insert(data).execute()
         return Agent(**response.data[0])
 
     async def update(self, agent: Agent) -> Agent:
         data = agent.model_dump(mode="json")
-        response = (
+        response = await (
             self.client.table(self.table).update(data).eq("id", str(agent.id)).execute()
         )
+        _cache.invalidate(agent.id)
         return Agent(**response.data[0])
 
     async def delete(self, id: UUID) -> bool:
-        response = (
+        response = await (
             self.client.table(self.table)
             .update({"deleted_flag": True})
             .eq("id", str(id))
             .execute()
         )
+        _cache.invalidate(id)
         return len(response.data) > 0
 
+    async def get_stats(
+        self,
+        company_id: UUID | None = None,
+        date_from: date | None = None,
+        date_to: date | None = None,
+    ) -> list[dict]:
+        # 集計は get_agent_stats() (007_agent_stats_function.sql) でDB側で行う
+        params = {
+            "p_company_id": str(company_id) if company_id else None,
+            "p_created_from": date_from.isoformat() if date_from else None,
+            "p_created_to": (date_to + timedelta(days=1)).isoformat() if date_to else None,
+        }
+        response = await self.client.rpc("get_agent_stats", params).execute()
+        return response.data
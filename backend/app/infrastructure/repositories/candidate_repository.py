@@ -1,8 +1,30 @@
+from collections.abc import Iterable
 from datetime import date, timedelta
 from uuid import UUID
 
+from postgrest import CountMethod
+
 from app.domain.entities.candidate import Candidate
 from app.infrastructure.database import get_supabase_client
+from app.infrastructure.pagination import count_method, fetch_keyset_page
+from app.infrastructure.projection import select_columns
+
+# 関連テーブルを埋め込んで1リクエストで取得するためのselect句
+RELATION_SELECTS = {
+    "companies": "companies(name,deleted_flag)",
+    "job_positions": "job_positions(name)",
+    "agents": "agents(company_name,contact_name,deleted_flag)",
+    "users": "users(name)",
+}
+RELATION_KEYS = tuple(RELATION_SELECTS)
+
+
+def relations_select(
+    columns: Iterable[str] | None = None, relations: Iterable[str] = RELATION_KEYS
+) -> str:
+    """columns は候補者の列の射影（None で全列）、relations は埋め込む関連テーブル"""
+    base = select_columns(Candidate, columns) if columns is not None else "*"
+    return ",".join([base, *(RELATION_SELECTS[key] for key in relations)])
 
 
 class CandidateRepository:
@@ -11,7 +33,7 @@ class CandidateRepository:
         self.table = "candidates"
 
     async def find_by_id(self, id: UUID) -> Candidate | None:
-        response = (
+        response = await (
             self.client.table(self.table)
             .select("*")
             .eq("id", str(id))
@@ -22,6 +44,28 @@ class CandidateRepository:
             return Candidate(**response.data[0])
         return None
 
+    async def find_by_ids(self, ids: list[UUID]) -> list[Candidate]:
+        response = await (
+            self.client.table(self.table)
+            .select("*")
+            .in_("id", [str(id) for id in ids])
+            .eq("deleted_flag", False)
+            .execute()
+        )
+        return [Candidate(**row) for row in response.data]
+
+    async def find_by_id_with_relations(self, id: UUID) -> tuple[Candidate, dict] | None:
+        response = await (
+            self.client.table(self.table)
+            .select(relations_select())
+            .eq("id", str(id))
+            .eq("deleted_flag", False)
+            .execute()
+        )
+        if response.data:
+            return self._split_relations(response.data[0])
+        return None
+
     async def find_all(
         self,
         company_id: UUID | None = None,
@@ -29,7 +73,84 @@ class CandidateRepository:
         agent_id: UUID | None = None,
         owner_user_id: UUID | None = None,
     ) -> list[Candidate]:
-        query = self.client.table(self.table).select("*").eq("deleted_flag", False)
+        query = self._filtered_query("*", company_id, job_position_id, agent_id, owner_user_id)
+        response = await query.order("created_at", desc=True).execute()
+        return [Candidate(**row) for row in response.data]
+
+    async def find_all_with_relations(
+        self,
+        company_id: UUID | None = None,
+        job_position_id: UUID | None = None,
+        agent_id: UUID | None = None,
+        owner_user_id: UUID | None = None,
+        columns: Iterable[str] | None = None,
+        relations: Iterable[str] = RELATION_KEYS,
+    ) -> list[tuple[Candidate, dict]]:
+        query = self._filtered_query(
+            relations_select(columns, relations),
+            company_id,
+            job_position_id,
+            agent_id,
+            owner_user_id,
+        )
+        response = await query.order("created_at", desc=True).execute()
+        return [self._split_relations(row) for row in response.data]
+
+    async def find_page(
+        self,
+        cursor: str | None,
+        limit: int,
+        include_count: bool = False,
+        company_id: UUID | None = None,
+        job_position_id: UUID | None = None,
+        columns: Iterable[str] | None = None,
+    ) -> tuple[list[Candidate], str | None, int | None]:
+        query = self._filtered_query(
+            select_columns(Candidate, columns),
+            company_id,
+            job_position_id,
+            None,
+            None,
+            count=count_method(include_count),
+        )
+        rows, next_cursor, total = await fetch_keyset_page(query, cursor, limit)
+        return [Candidate(**row) for row in rows], next_cursor, total
+
+    async def find_page_with_relations(
+        self,
+        cursor: str | None,
+        limit: int,
+        include_count: bool = False,
+        company_id: UUID | None = None,
+        job_position_id: UUID | None = None,
+        agent_id: UUID | None = None,
+        owner_user_id: UUID | None = None,
+        columns: Iterable[str] | None = None,
+        relations: Iterable[str] = RELATION_KEYS,
+    ) -> tuple[list[tuple[Candidate, dict]], str | None, int | None]:
+        query = self._filtered_query(
+            relations_select(columns, relations),
+            company_id,
+            job_position_id,
+            agent_id,
+            owner_user_id,
+            count=count_method(include_count),
+        )
+        rows, next_cursor, total = await fetch_keyset_page(query, cursor, limit)
+        return [self._split_relations(row) for row in rows], next_cursor, total
+
+    def _filtered_query(
+        self,
+        columns: str,
+        company_id: UUID | None,
+        job_position_id: UUID | None,
+        agent_id: UUID | None,
+        owner_user_id: UUID | None,
+        count: CountMethod | None = None,
+    ):
+        query = (
+            self.client.table(self.table).select(columns, count=count).eq("deleted_flag", False)
+        )
         if company_id:
             query = query.eq("company_id", str(company_id))
         if job_position_id:
@@ -38,23 +159,27 @@ class CandidateRepository:
             query = query.eq("agent_id", str(agent_id))
         if owner_user_id:
             query = query.eq("owner_user_id", str(owner_user_id))
-        response = query.order("created_at", desc=True).execute()
-        return [Candidate(**row) for row in response.data]
+        return query
+
+    def _split_relations(self, row: dict) -> tuple[Candidate, dict]:
+        relations = {key: row.get(key) or {} for key in RELATION_KEYS}
+        candidate = Candidate(**{k: v for k, v in row.items() if k not in RELATION_KEYS})
+        return candidate, relations
 
     async def create(self, candidate: Candidate) -> Candidate:
         data = candidate.model_dump(mode="json")
-        response = self.client.table(self.table).insert(data).execute()
+        response = await self.client.table(self.table).insert(data).execute()
         return Candidate(**response.data[0])
 
     async def update(self, candidate: Candidate) -> Candidate:
         data = candidate.model_dump(mode="json")
-        response = (
+        response = await (
             self.client.table(self.table).update(data).eq("id", str(candidate.id)).execute()
         )
         return Candidate(**response.data[0])
 
     async def delete(self, id: UUID) -> bool:
-        response = (
+        response = await (
             self.client.table(self.table)
             .update({"deleted_flag": True})
             .eq("id", str(id))
@@ -62,123 +187,21 @@ class CandidateRepository:
         )
         return len(response.data) > 0
 
-    async def get_funnel_stats(self, company_id: UUID | None = None) -> dict:
-        query = self.client.table(self.table).select("*").eq("deleted_flag", False)
-        if company_id:
-            query = query.eq("company_id", str(company_id))
-        response = query.execute()
-        candidates = response.data
-
-        stats = {
-            "total": len(candidates),
-            "stage_0_5_done": 0,
-            "stage_0_5_passed": 0,
-            "stage_first_done": 0,
-            "stage_first_passed": 0,
-            "stage_second_done": 0,
-            "stage_second_passed": 0,
-            "stage_final_done": 0,
-            "stage_final_offer": 0,
-            "hired": 0,
-            "mismatch": 0,
-        }
-
-        for c in candidates:
-            if c.get("stage_0_5_result") != "not_done":
-                stats["stage_0_5_done"] += 1
-            if c.get("stage_0_5_result") == "passed":
-                stats["stage_0_5_passed"] += 1
-            if c.get("stage_first_result") != "not_done":
-                stats["stage_first_done"] += 1
-            if c.get("stage_first_result") == "passed":
-                stats["stage_first_passed"] += 1
-            if c.get("stage_second_result") != "not_done":
-                stats["stage_second_done"] += 1
-            if c.get("stage_second_result") == "passed":
-                stats["stage_second_passed"] += 1
-            if c.get("stage_final_result") != "not_done":
-                stats["stage_final_done"] += 1
-            if c.get("stage_final_result") == "offer":
-                stats["stage_final_offer"] += 1
-            if c.get("hire_status") == "hired":
-                stats["hired"] += 1
-            if c.get("mismatch_flag"):
-                stats["mismatch"] += 1
-
-        return stats
-
-    async def get_active_candidates_count(self) -> int:
-        response = (
-            self.client.table(self.table)
-            .select("id", count="exact")
-            .eq("deleted_flag", False)
-            .eq("hire_status", "undecided")
-            .neq("stage_final_result", "rejected")
-            .execute()
-        )
-        return response.count or 0
-
-    async def get_pending_interviews_count(self) -> int:
-        response = (
-            self.client.table(self.table)
-            .select("id", count="exact")
-            .eq("deleted_flag", False)
-            .eq("stage_0_5_result", "not_done")
-            .not_.is_("stage_0_5_date", "null")
-            .execute()
-        )
-        return response.count or 0
-
-    async def get_monthly_stats(self, year: int, month: int) -> dict:
-        first_day = date(year, month, 1)
-        if month == 12:
-            last_day = date(year + 1, 1, 1) - timedelta(days=1)
-        else:
-            last_day = date(year, month + 1, 1) - timedelta(days=1)
-
-        response = (
-            self.client.table(self.table)
-            .select("*")
-            .eq("deleted_flag", False)
-            .gte("created_at", first_day.isoformat())
-            .lte("created_at", f"{last_day.isoformat()}T23:59:59")
-            .execute()
-        )
-        candidates = response.data
-
-        hired_response = (
-            self.client.table(self.table)
-            .select("id", count="exact")
-            .eq("deleted_flag", False)
-            .eq("hire_status", "hired")
-            .gte("updated_at", first_day.isoformat())
-            .lte("updated_at", f"{last_day.isoformat()}T23:59:59")
-            .execute()
-        )
-
-        mismatch_response = (
-            self.client.table(self.table)
-            .select("id", count="exact")
-            .eq("deleted_flag", False)
-            .eq("mismatch_flag", True)
-            .gte("updated_at", first_day.isoformat())
-            .lte("updated_at", f"{last_day.isoformat()}T23:59:59")
-            .execute()
-        )
-
-        stats = {
-            "active_candidates": len(candidates),
-            "hired": hired_response.count or 0,
-            "mismatch": mismatch_response.count or 0,
-            "stage_0_5_done": 0,
-            "stage_0_5_passed": 0,
+    async def get_funnel_stats(
+        self,
+        company_id: UUID | None = None,
+        job_position_id: UUID | None = None,
+        agent_id: UUID | None = None,
+        date_from: date | None = None,
+        date_to: date | None = None,
+    ) -> dict:
+        # 集計は get_funnel_stats() (005_funnel_stats_function.sql) でDB側で行う
+        params = {
+            "p_company_id": str(company_id) if company_id else None,
+            "p_job_position_id": str(job_position_id) if job_position_id else None,
+            "p_agent_id": str(agent_id) if agent_id else None,
+            "p_created_from": date_from.isoformat() if date_from else None,
+            "p_created_to": (date_to + timedelta(days=1)).isoformat() if date_to else None,
         }
-
-        for c in candidates:
-            if c.get("stage_0_5_result") != "not_done":
-                stats["stage_0_5_done"] += 1
-            if c.get("stage_0_5_result") == "passed":
-                stats["stage_0_5_passed"] += 1
-
-        return stats
-
+        response = await self.client.rpc("get_funnel_stats", params).execute()
+        return response.data[0]
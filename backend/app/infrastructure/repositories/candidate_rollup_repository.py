@@ -0,0 +1,56 @@
+from datetime import date
+from uuid import UUID
+
+from app.infrastructure.database import get_supabase_client
+
+MONTHLY_COUNTERS = ("total", "stage_0_5_done", "stage_0_5_passed", "hired_updated", "mismatch_updated")
+
+
+class CandidateRollupRepository:
+    """候補者ステージ集計テーブル (006_candidate_stage_rollups.sql) の読み出し"""
+
+    def __init__(self):
+        self.client = get_supabase_client()
+        self.table = "candidate_stage_rollups"
+
+    async def get_totals(
+        self,
+        company_id: UUID | None = None,
+        job_position_id: UUID | None = None,
+        agent_id: UUID | None = None,
+    ) -> dict:
+        params = {
+            "p_company_id": str(company_id) if company_id else None,
+            "p_job_position_id": str(job_position_id) if job_position_id else None,
+            "p_agent_id": str(agent_id) if agent_id else None,
+        }
+        response = await self.client.rpc("get_candidate_rollup_totals", params).execute()
+        return response.data[0]
+
+    async def get_monthly_stats(self, months: list[date]) -> dict[date, dict]:
+        response = await (
+            self.client.table(self.table)
+            .select(",".join(("month",) + MONTHLY_COUNTERS))
+            .in_("month", [m.replace(day=1).isoformat() for m in months])
+            .execute()
+        )
+        sums = {m.replace(day=1): dict.fromkeys(MONTHLY_COUNTERS, 0) for m in months}
+        for row in response.data:
+            bucket = sums[date.fromisoformat(row["month"])]
+            for key in MONTHLY_COUNTERS:
+                bucket[key] += row[key]
+
+        return {
+            month: {
+                "active_candidates": s["total"],
+                "hired": s["hired_updated"],
+                "mismatch": s["mismatch_updated"],
+                "stage_0_5_done": s["stage_0_5_done"],
+                "stage_0_5_passed": s["stage_0_5_passed"],
+            }
+            for month, s in sums.items()
+        }
+
+    async def rebuild(self) -> int:
+        response = await self.client.rpc("rebuild_candidate_rollups", {}).execute()
+        return response.data
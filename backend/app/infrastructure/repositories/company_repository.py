@@ -1,7 +1,13 @@
+from collections.abc import Iterable
 from uuid import UUID
 
 from app.domain.entities.company import Company
+from app.infrastructure.cache import TTLCache
 from app.infrastructure.database import get_supabase_client
+from app.infrastructure.pagination import count_method, fetch_keyset_page
+from app.infrastructure.projection import select_columns
+
+_cache: TTLCache[UUID, Company] = TTLCache("companies")
 
 
 class CompanyRepository:
@@ -9,8 +15,11 @@ class CompanyRepository:
         self.client = get_supabase_client()
         self.table = "companies"
 
-    async def find_by_id(self, id: UUID) -> Company | None:
-        response = (
+    async def find_by_id(self, id: UUID, use_cache: bool = True) -> Company | None:
+        cached = _cache.get(id) if use_cache else None
+        if cached is not None:
+            return cached.model_copy()
+        response = await (
             self.client.table(self.table)
             .select("*")
             .eq("id", str(id))
@@ -18,37 +27,80 @@ class CompanyRepository:
             .execute()
         )
         if response.data:
-            return Company(**response.data[0])
+            company = Company(**response.data[0])
+            _cache.set(company.id, company.model_copy())
+            return company
         return None
 
-    async def find_all(self) -> list[Company]:
-        response = (
+    async def find_by_ids(self, ids: list[UUID]) -> list[Company]:
+        found: list[Company] = []
+        missing: list[UUID] = []
+        for id in ids:
+            cached = _cache.get(id)
+            if cached is None:
+                missing.append(id)
+            else:
+                found.append(cached.model_copy())
+        if not missing:
+            return found
+        response = await (
             self.client.table(self.table)
             .select("*")
+            .in_("id", [str(id) for id in missing])
+            .eq("deleted_flag", False)
+            .execute()
+        )
+        for row in response.data:
+            company = Company(**row)
+            _cache.set(company.id, company.model_copy())
+            found.append(company)
+        return found
+
+    async def find_all(self, columns: Iterable[str] | None = None) -> list[Company]:
+        response = await (
+            self.client.table(self.table)
+            .select(select_columns(Company, columns))
             .eq("deleted_flag", False)
             .order("created_at", desc=True)
             .execute()
         )
         return [Company(**row) for row in response.data]
 
+    async def find_page(
+        self,
+        cursor: str | None,
+        limit: int,
+        include_count: bool = False,
+        columns: Iterable[str] | None = None,
+    ) -> tuple[list[Company], str | None, int | None]:
+        query = (
+            self.client.table(self.table)
+            .select(select_columns(Company, columns), count=count_method(include_count))
+            .eq("deleted_flag", False)
+        )
+        rows, next_cursor, total = await fetch_keyset_page(query, cursor, limit)
+        return [Company(**row) for row in rows], next_cursor, total
+
     async def create(self, company: Company) -> Company:
         data = company.model_dump(mode="json")
-        response = self.client.table(self.table).insert(data).execute()
+        response = await self.client.table(self.table).insert(data).execute()
         return Company(**response.data[0])
 
     async def update(self, company: Company) -> Company:
         data = company.model_dump(mode="json")
-        response = (
+        response = await (
             self.client.table(self.table).update(data).eq("id", str(company.id)).execute()
         )
+        _cache.invalidate(company.id)
         return Company(**response.data[0])
 
     async def delete(self, id: UUID) -> bool:
-        response = (
+        response = await (
             self.client.table(self.table)
             .update({"deleted_flag": True})
             .eq("id", str(id))
             .execute()
         )
+        _cache.invalidate(id)
         return len(response.data) > 0
 
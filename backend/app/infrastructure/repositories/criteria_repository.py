@@ -10,7 +10,7 @@ class CriteriaGroupRepository:
         self.table = "criteria_groups"
 
     async def find_by_id(self, id: UUID) -> CriteriaGroup | None:
-        response = (
+        response = await (
             self.client.table(self.table)
             .select("*")
             .eq("id", str(id))
@@ -22,7 +22,7 @@ class CriteriaGroupRepository:
         return None
 
     async def find_by_job_position_id(self, job_position_id: UUID) -> list[CriteriaGroup]:
-        response = (
+        response = await (
             self.client.table(self.table)
             .select("*")
             .eq("job_position_id", str(job_position_id))
@@ -32,20 +32,40 @@ class CriteriaGroupRepository:
         )
         return [CriteriaGroup(**row) for row in response.data]
 
+    async def find_tree_by_job_position_id(
+        self, job_position_id: UUID
+    ) -> list[tuple[CriteriaGroup, list[CriteriaItem]]]:
+        response = await (
+            self.client.table(self.table)
+            .select("*, criteria_items(*)")
+            .eq("job_position_id", str(job_position_id))
+            .eq("deleted_flag", False)
+            .order("sort_order")
+            .order("sort_order", foreign_table="criteria_items")
+            .execute()
+        )
+        return [
+            (
+                CriteriaGroup(**{k: v for k, v in row.items() if k != "criteria_items"}),
+                [CriteriaItem(**item) for item in row.get("criteria_items") or []],
+            )
+            for row in response.data
+        ]
+
     async def create(self, group: CriteriaGroup) -> CriteriaGroup:
         data = group.model_dump(mode="json")
-        response = self.client.table(self.table).insert(data).execute()
+        response = await self.client.table(self.table).insert(data).execute()
         return CriteriaGroup(**response.data[0])
 
     async def update(self, group: CriteriaGroup) -> CriteriaGroup:
         data = group.model_dump(mode="json")
-        response = (
+        response = await (
             self.client.table(self.table).update(data).eq("id", str(group.id)).execute()
         )
         return CriteriaGroup(**response.data[0])
 
     async def delete(self, id: UUID) -> bool:
-        response = (
+        response = await (
             self.client.table(self.table)
             .update({"deleted_flag": True})
             .eq("id", str(id))
@@ -60,13 +80,13 @@ class CriteriaItemRepository:
         self.table = "criteria_items"
 
     async def find_by_id(self, id: UUID) -> CriteriaItem | None:
-        response = self.client.table(self.table).select("*").eq("id", str(id)).execute()
+        response = await self.client.table(self.table).select("*").eq("id", str(id)).execute()
         if response.data:
             return CriteriaItem(**response.data[0])
         return None
 
     async def find_by_group_id(self, criteria_group_id: UUID) -> list[CriteriaItem]:
-        response = (
+        response = await (
             self.client.table(self.table)
             .select("*")
             .eq("criteria_group_id", str(criteria_group_id))
@@ -76,7 +96,7 @@ class CriteriaItemRepository:
         return [CriteriaItem(**row) for row in response.data]
 
     async def find_by_job_position_id(self, job_position_id: UUID) -> list[CriteriaItem]:
-        response = (
+        response = await (
             self.client.table(self.table)
             .select("*, criteria_groups!inner(job_position_id)")
             .eq("criteria_groups.job_position_id", str(job_position_id))
@@ -87,12 +107,12 @@ class CriteriaItemRepository:
 
     async def create(self, item: CriteriaItem) -> CriteriaItem:
         data = item.model_dump(mode="json")
-        response = self.client.table(self.table).insert(data).execute()
+        response = await self.client.table(self.table).insert(data).execute()
         return CriteriaItem(**response.data[0])
 
     async def update(self, item: CriteriaItem) -> CriteriaItem:
         data = item.model_dump(mode="json")
-        response = (
+        response = await (
             self.client.table(self.table).update(data).eq("id", str(item.id)).execute()
         )
         return CriteriaItem(**response.data[0])
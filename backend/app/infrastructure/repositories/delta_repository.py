@@ -0,0 +1,91 @@
+from datetime import datetime
+
+from app.domain.entities.candidate import Candidate
+from app.domain.entities.interview import InterviewDetail, InterviewQuestionResponse
+from app.infrastructure.database import get_supabase_client
+from app.infrastructure.projection import select_columns
+from app.infrastructure.repositories.interview_repository import INTERVIEW_LIGHT_COLUMNS
+
+# 差分エクスポートの対象テーブルと読み出す列（面談の文字起こし・レポートは含めない）
+# 子テーブルは親候補者の deleted_flag を埋め込みで一緒に読む（論理削除後の子の更新を削除として返すため）
+DELTA_TABLES = {
+    "candidates": select_columns(Candidate),
+    "interviews": ",".join(INTERVIEW_LIGHT_COLUMNS) + ",candidates(deleted_flag)",
+    "interview_details": select_columns(InterviewDetail)
+    + ",interviews(candidates(deleted_flag))",
+    "interview_question_responses": select_columns(InterviewQuestionResponse)
+    + ",interviews(candidates(deleted_flag))",
+}
+
+
+class DeltaRepository:
+    """差分エクスポート (010_delta_export.sql) の読み出し"""
+
+    def __init__(self):
+        self.client = get_supabase_client()
+
+    async def get_watermark(self, lag_seconds: int) -> datetime:
+        response = await self.client.rpc(
+            "delta_export_watermark", {"p_lag_seconds": lag_seconds}
+        ).execute()
+        return datetime.fromisoformat(response.data)
+
+    async def find_changed(
+        self,
+        table: str,
+        since: datetime | None,
+        until: datetime,
+        after: tuple[str, str] | None,
+        limit: int,
+    ) -> list[dict]:
+        """(since, until] に更新された行を (updated_at, id) 順に、after の次から読む"""
+        return await self._fetch_window(
+            self.client.table(table).select(DELTA_TABLES[table]),
+            "updated_at",
+            since,
+            until,
+            after,
+            limit,
+        )
+
+    async def find_deleted(
+        self,
+        since: datetime | None,
+        until: datetime,
+        after: tuple[str, str] | None,
+        limit: int,
+    ) -> list[dict]:
+        """(since, until] に物理削除された行の記録"""
+        return await self._fetch_window(
+            self.client.table("deleted_records").select("id,table_name,record_id,deleted_at"),
+            "deleted_at",
+            since,
+            until,
+            after,
+            limit,
+        )
+
+    async def purge_deleted(self, before: datetime) -> int:
+        """before より前の削除記録を消し、消した件数を返す"""
+        response = await self.client.rpc(
+            "purge_deleted_records", {"p_before": before.isoformat()}
+        ).execute()
+        return response.data
+
+    async def _fetch_window(
+        self,
+        query,
+        column: str,
+        since: datetime | None,
+        until: datetime,
+        after: tuple[str, str] | None,
+        limit: int,
+    ) -> list[dict]:
+        query = query.lte(column, until.isoformat())
+        if after:
+            value, id = after
+            query = query.or_(f'{column}.gt."{value}",and({column}.eq."{value}",id.gt.{id})')
+        elif since:
+            query = query.gt(column, since.isoformat())
+        response = await query.order(column).order("id").limit(limit).execute()
+        return response.data
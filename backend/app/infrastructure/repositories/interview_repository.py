@@ -1,7 +1,17 @@
+from collections.abc import Iterable
 from uuid import UUID
 
+from app.domain.entities.candidate import Candidate
 from app.domain.entities.interview import Interview, InterviewDetail, InterviewQuestionResponse
 from app.infrastructure.database import get_supabase_client
+from app.infrastructure.pagination import count_method, fetch_all_pages, fetch_keyset_page
+from app.infrastructure.projection import select_columns
+
+# 文字起こし全文と生成済みレポートは詳細取得時のみ読む
+INTERVIEW_HEAVY_COLUMNS = ("transcript_raw_text", "client_report_markdown", "agent_report_markdown")
+INTERVIEW_LIGHT_COLUMNS = tuple(
+    name for name in Interview.model_fields if name not in INTERVIEW_HEAVY_COLUMNS
+)
 
 
 class InterviewRepository:
@@ -9,16 +19,44 @@ class InterviewRepository:
         self.client = get_supabase_client()
         self.table = "interviews"
 
-    async def find_by_id(self, id: UUID) -> Interview | None:
-        response = self.client.table(self.table).select("*").eq("id", str(id)).execute()
+    async def find_by_id(
+        self, id: UUID, columns: Iterable[str] | None = None
+    ) -> Interview | None:
+        response = await (
+            self.client.table(self.table)
+            .select(select_columns(Interview, columns))
+            .eq("id", str(id))
+            .execute()
+        )
         if response.data:
             return Interview(**response.data[0])
         return None
 
-    async def find_by_candidate_id(self, candidate_id: UUID) -> Interview | None:
-        response = (
+    async def find_by_id_with_candidate(
+        self, id: UUID, columns: Iterable[str] | None = None
+    ) -> tuple[Interview, Candidate | None] | None:
+        """面談と候補者を1リクエストで取得する（削除済みの候補者は None）"""
+        response = await (
             self.client.table(self.table)
-            .select("*")
+            .select(f"{select_columns(Interview, columns)},candidates(*)")
+            .eq("id", str(id))
+            .execute()
+        )
+        if not response.data:
+            return None
+        row = response.data[0]
+        candidate_row = row.pop("candidates", None)
+        candidate = None
+        if candidate_row and not candidate_row.get("deleted_flag"):
+            candidate = Candidate(**candidate_row)
+        return Interview(**row), candidate
+
+    async def find_by_candidate_id(
+        self, candidate_id: UUID, columns: Iterable[str] | None = None
+    ) -> Interview | None:
+        response = await (
+            self.client.table(self.table)
+            .select(select_columns(Interview, columns))
             .eq("candidate_id", str(candidate_id))
             .execute()
         )
@@ -26,27 +64,86 @@ class InterviewRepository:
             return Interview(**response.data[0])
         return None
 
-    async def find_all(self) -> list[Interview]:
-        response = (
+    async def find_by_ids(
+        self, ids: list[UUID], columns: Iterable[str] | None = None
+    ) -> list[Interview]:
+        response = await (
             self.client.table(self.table)
-            .select("*")
+            .select(select_columns(Interview, columns))
+            .in_("id", [str(id) for id in ids])
+            .execute()
+        )
+        return [Interview(**row) for row in response.data]
+
+    async def find_by_candidate_ids(
+        self, candidate_ids: list[UUID], columns: Iterable[str] | None = None
+    ) -> list[Interview]:
+        response = await (
+            self.client.table(self.table)
+            .select(select_columns(Interview, columns))
+            .in_("candidate_id", [str(id) for id in candidate_ids])
+            .execute()
+        )
+        return [Interview(**row) for row in response.data]
+
+    async def find_all(self, columns: Iterable[str] | None = None) -> list[Interview]:
+        response = await (
+            self.client.table(self.table)
+            .select(select_columns(Interview, columns))
             .order("interview_date", desc=True)
             .execute()
         )
         return [Interview(**row) for row in response.data]
 
+    async def find_page(
+        self,
+        cursor: str | None,
+        limit: int,
+        include_count: bool = False,
+        columns: Iterable[str] | None = None,
+    ) -> tuple[list[Interview], str | None, int | None]:
+        query = self.client.table(self.table).select(
+            select_columns(Interview, columns), count=count_method(include_count)
+        )
+        rows, next_cursor, total = await fetch_keyset_page(query, cursor, limit)
+        return [Interview(**row) for row in rows], next_cursor, total
+
     async def create(self, interview: Interview) -> Interview:
         data = interview.model_dump(mode="json")
-        response = self.client.table(self.table).insert(data).execute()
+        response = await self.client.table(self.table).insert(data).execute()
         return Interview(**response.data[0])
 
     async def update(self, interview: Interview) -> Interview:
         data = interview.model_dump(mode="json")
-        response = (
+        response = await (
             self.client.table(self.table).update(data).eq("id", str(interview.id)).execute()
         )
         return Interview(**response.data[0])
 
+    async def get_report_cache(self, interview_id: UUID) -> dict | None:
+        # 保存済みレポートと現在の入力フィンガープリント (008_interview_report_cache.sql)
+        response = await self.client.rpc(
+            "get_interview_report_cache", {"p_interview_id": str(interview_id)}
+        ).execute()
+        if response.data:
+            return response.data[0]
+        return None
+
+    async def save_report(
+        self, interview_id: UUID, report_type: str, markdown: str, fingerprint: str
+    ) -> None:
+        await (
+            self.client.table(self.table)
+            .update(
+                {
+                    f"{report_type}_report_markdown": markdown,
+                    f"{report_type}_report_fingerprint": fingerprint,
+                }
+            )
+            .eq("id", str(interview_id))
+            .execute()
+        )
+
 
 class InterviewDetailRepository:
     def __init__(self):
@@ -54,7 +151,7 @@ class InterviewDetailRepository:
         self.table = "interview_details"
 
     async def find_by_interview_id(self, interview_id: UUID) -> list[InterviewDetail]:
-        response = (
+        response = await (
             self.client.table(self.table)
             .select("*")
             .eq("interview_id", str(interview_id))
@@ -62,6 +159,19 @@ class InterviewDetailRepository:
         )
         return [InterviewDetail(**row) for row in response.data]
 
+    async def find_by_interview_ids(
+        self, interview_ids: list[UUID], columns: Iterable[str] | None = None
+    ) -> list[InterviewDetail]:
+        # 面談数×評価項目数は max-rows を超えうるため、一意キーの順でページに分けて読む
+        rows = await fetch_all_pages(
+            lambda: self.client.table(self.table)
+            .select(select_columns(InterviewDetail, columns))
+            .in_("interview_id", [str(id) for id in interview_ids])
+            .order("interview_id")
+            .order("criteria_item_id")
+        )
+        return [InterviewDetail(**row) for row in rows]
+
     async def upsert(self, detail: InterviewDetail) -> InterviewDetail:
         # Upsert by the composite unique key (interview_id, criteria_item_id).
         # Avoid sending id/created_at/updated_at so existing rows keep their identity/timestamps.
@@ -72,7 +182,7 @@ class InterviewDetailRepository:
             "comment_external": detail.comment_external,
             "comment_internal": detail.comment_internal,
         }
-        response = (
+        response = await (
             self.client.table(self.table)
             .upsert(data, on_conflict="interview_id,criteria_item_id")
             .execute()
@@ -90,7 +200,7 @@ class InterviewDetailRepository:
             }
             for d in details
         ]
-        response = (
+        response = await (
             self.client.table(self.table)
             .upsert(data, on_conflict="interview_id,criteria_item_id")
             .execute()
@@ -104,7 +214,7 @@ class InterviewQuestionResponseRepository:
         self.table = "interview_question_responses"
 
     async def find_by_interview_id(self, interview_id: UUID) -> list[InterviewQuestionResponse]:
-        response = (
+        response = await (
             self.client.table(self.table)
             .select("*")
             .eq("interview_id", str(interview_id))
@@ -113,18 +223,31 @@ class InterviewQuestionResponseRepository:
         )
         return [InterviewQuestionResponse(**row) for row in response.data]
 
+    async def find_by_interview_ids(
+        self, interview_ids: list[UUID]
+    ) -> list[InterviewQuestionResponse]:
+        # 面談ごとのQ&Aの合計は max-rows を超えうるため、ページに分けて読む
+        rows = await fetch_all_pages(
+            lambda: self.client.table(self.table)
+            .select("*")
+            .in_("interview_id", [str(id) for id in interview_ids])
+            .order("created_at")
+            .order("id")
+        )
+        return [InterviewQuestionResponse(**row) for row in rows]
+
     async def create(self, qr: InterviewQuestionResponse) -> InterviewQuestionResponse:
         data = qr.model_dump(mode="json")
-        response = self.client.table(self.table).insert(data).execute()
+        response = await self.client.table(self.table).insert(data).execute()
         return InterviewQuestionResponse(**response.data[0])
 
     async def update(self, qr: InterviewQuestionResponse) -> InterviewQuestionResponse:
         data = qr.model_dump(mode="json")
-        response = (
+        response = await (
             self.client.table(self.table).update(data).eq("id", str(qr.id)).execute()
         )
         return InterviewQuestionResponse(**response.data[0])
 
     async def delete(self, id: UUID) -> bool:
-        response = self.client.table(self.table).delete().eq("id", str(id)).execute()
+        response = await self.client.table(self.table).delete().eq("id", str(id)).execute()
         return len(response.data) > 0
@@ -1,22 +1,50 @@
 from uuid import UUID
 
 from app.domain.entities.job_position import JobPosition
+from app.infrastructure.cache import TTLCache
 from app.infrastructure.database import get_supabase_client
 
+_cache: TTLCache[UUID, JobPosition] = TTLCache("job_positions")
+
 
 class JobPositionRepository:
     def __init__(self):
         self.client = get_supabase_client()
         self.table = "job_positions"
 
-    async def find_by_id(self, id: UUID) -> JobPosition | None:
-        response = self.client.table(self.table).select("*").eq("id", str(id)).execute()
+    async def find_by_id(self, id: UUID, use_cache: bool = True) -> JobPosition | None:
+        cached = _cache.get(id) if use_cache else None
+        if cached is not None:
+            return cached.model_copy()
+        response = await self.client.table(self.table).select("*").eq("id", str(id)).execute()
         if response.data:
-            return JobPosition(**response.data[0])
+            position = JobPosition(**response.data[0])
+            _cache.set(position.id, position.model_copy())
+            return position
         return None
 
+    async def find_by_ids(self, ids: list[UUID]) -> list[JobPosition]:
+        found: list[JobPosition] = []
+        missing: list[UUID] = []
+        for id in ids:
+            cached = _cache.get(id)
+            if cached is None:
+                missing.append(id)
+            else:
+                found.append(cached.model_copy())
+        if not missing:
+            return found
+        response = await (
+            self.client.table(self.table).select("*").in_("id", [str(id) for id in missing]).execute()
+        )
+        for row in response.data:
+            position = JobPosition(**row)
+            _cache.set(position.id, position.model_copy())
+            found.append(position)
+        return found
+
     async def find_by_company_id(self, company_id: UUID) -> list[JobPosition]:
-        response = (
+        response = await (
             self.client.table(self.table)
             .select("*")
             .eq("company_id", str(company_id))
@@ -26,7 +54,7 @@ class JobPositionRepository:
         return [JobPosition(**row) for row in response.data]
 
     async def find_all(self) -> list[JobPosition]:
-        response = (
+        response = await (
             self.client.table(self.table)
             .select("*")
             .order("created_at", desc=True)
@@ -36,13 +64,14 @@ class JobPositionRepository:
 
     async def create(self, position: JobPosition) -> JobPosition:
         data = position.model_dump(mode="json")
-        response = self.client.table(self.table).insert(data).execute()
+        response = await self.client.table(self.table).insert(data).execute()
         return JobPosition(**response.data[0])
 
     async def update(self, position: JobPosition) -> JobPosition:
         data = position.model_dump(mode="json")
-        response = (
+        response = await (
             self.client.table(self.table).update(data).eq("id", str(position.id)).execute()
         )
+        _cache.invalidate(position.id)
         return JobPosition(**response.data[0])
 
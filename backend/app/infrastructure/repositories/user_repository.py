@@ -3,8 +3,11 @@ from uuid import UUID
 from postgrest.exceptions import APIError
 
 from app.domain.entities.user import User, UserCreate
+from app.infrastructure.cache import TTLCache
 from app.infrastructure.database import get_supabase_client
 
+_cache: TTLCache[UUID, User] = TTLCache("users")
+
 
 class UserRepository:
     def __init__(self):
@@ -12,36 +15,65 @@ class UserRepository:
         self.table = "users"
 
     async def find_by_id(self, id: UUID) -> User | None:
-        response = self.client.table(self.table).select("*").eq("id", str(id)).execute()
+        cached = _cache.get(id)
+        if cached is not None:
+            return cached.model_copy()
+        response = await self.client.table(self.table).select("*").eq("id", str(id)).execute()
         if response.data:
-            return User(**response.data[0])
+            user = User(**response.data[0])
+            _cache.set(user.id, user.model_copy())
+            return user
         return None
 
+    async def find_by_ids(self, ids: list[UUID]) -> list[User]:
+        found: list[User] = []
+        missing: list[UUID] = []
+        for id in ids:
+            cached = _cache.get(id)
+            if cached is None:
+                missing.append(id)
+            else:
+                found.append(cached.model_copy())
+        if not missing:
+            return found
+        response = await (
+            self.client.table(self.table).select("*").in_("id", [str(id) for id in missing]).execute()
+        )
+        for row in response.data:
+            user = User(**row)
+            _cache.set(user.id, user.model_copy())
+            found.append(user)
+        return found
+
     async def find_by_clerk_id(self, clerk_id: str) -> User | None:
-        response = self.client.table(self.table).select("*").eq("clerk_id", clerk_id).execute()
+        response = await self.client.table(self.table).select("*").eq("clerk_id", clerk_id).execute()
         if response.data:
             return User(**response.data[0])
         return None
 
     async def find_by_email(self, email: str) -> User | None:
-        response = self.client.table(self.table).select("*").eq("email", email).execute()
+        response = await self.client.table(self.table).select("*").eq("email", email).execute()
         if response.data:
             return User(**response.data[0])
         return None
 
     async def find_all(self) -> list[User]:
-        response = self.client.table(self.table).select("*").execute()
+        response = await self.client.table(self.table).select("*").execute()
         return [User(**row) for row in response.data]
 
+    async def exists_any(self) -> bool:
+        response = await self.client.table(self.table).select("id").limit(1).execute()
+        return bool(response.data)
+
     async def create(self, user: User) -> User:
         data = user.model_dump(mode="json", exclude_none=True)
-        response = self.client.table(self.table).insert(data).execute()
+        response = await self.client.table(self.table).insert(data).execute()
         return User(**response.data[0])
 
     async def create_from_clerk(self, user_data: UserCreate) -> User:
         data = user_data.model_dump(mode="json")
         try:
-            response = self.client.table(self.table).insert(data).execute()
+            response = await self.client.table(self.table).insert(data).execute()
             return User(**response.data[0])
         except APIError as e:
             if "23505" in str(e):
@@ -51,28 +83,44 @@ class UserRepository:
                 existing_by_email = await self.find_by_email(user_data.email)
                 if existing_by_email:
                     update_data = {"clerk_id": user_data.clerk_id, "name": user_data.name}
-                    response = (
+                    response = await (
                         self.client.table(self.table)
                         .update(update_data)
                         .eq("email", user_data.email)
                         .execute()
                     )
+                    _cache.invalidate(existing_by_email.id)
                     return User(**response.data[0])
             raise
 
     async def upsert_from_clerk(self, user_data: UserCreate) -> User:
         """clerk_idをキーにしてupsertする"""
         data = user_data.model_dump(mode="json")
-        response = (
+        response = await (
             self.client.table(self.table)
             .upsert(data, on_conflict="clerk_id")
             .execute()
         )
-        return User(**response.data[0])
+        user = User(**response.data[0])
+        _cache.invalidate(user.id)
+        return user
 
     async def update(self, user: User) -> User:
         data = user.model_dump(mode="json", exclude_none=True)
-        response = (
+        response = await (
             self.client.table(self.table).update(data).eq("id", str(user.id)).execute()
         )
+        _cache.invalidate(user.id)
         return User(**response.data[0])
+
+    async def sync_client_names(self, company_id: UUID, name: str) -> None:
+        """企業に紐づくクライアントユーザーの表示名を企業名に揃える（差分がある行のみ更新）"""
+        await (
+            self.client.table(self.table)
+            .update({"name": name})
+            .eq("company_id", str(company_id))
+            .eq("role", "client")
+            .neq("name", name)
+            .execute()
+        )
+        _cache.invalidate_where(lambda _, user: user.company_id == company_id)
@@ -1,11 +1,32 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.api.v1.router import api_router
+from app.application.services.delta_retention import get_delta_retention
+from app.application.services.export_job_runner import get_export_job_runner
+from app.application.services.report_renderer import get_report_renderer
 from app.core.config import get_settings
+from app.infrastructure.database import close_supabase_client
+from app.infrastructure.http_client import close_outbound_http_client, get_outbound_http_client
 
 settings = get_settings()
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    get_outbound_http_client()
+    get_export_job_runner().start()
+    get_delta_retention().start()
+    yield
+    await get_delta_retention().shutdown()
+    await get_export_job_runner().shutdown()
+    get_report_renderer().shutdown()
+    await close_outbound_http_client()
+    await close_supabase_client()
+
+
 app = FastAPI(
     title=settings.app_name,
     description="ポテンシャル採用評価ログシステム API",
@@ -13,6 +34,7 @@ app = FastAPI(
     openapi_url="/api/v1/openapi.json",
     docs_url="/api/docs",
     redoc_url="/api/redoc",
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -21,6 +43,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Next-Cursor", "X-Total-Count"],
 )
 
 app.include_router(api_router, prefix="/api/v1")
@@ -0,0 +1,131 @@
+"""
+リポジトリ層の同時実行ベンチマーク
+
+PostgRESTへの1往復を一定のレイテンシで応答するモックトランスポートに置き換え、
+旧実装（同期クライアントをasync関数内で呼ぶ）と現行の非同期クライアントで
+同時リクエスト数ごとのp50/p99レイテンシを比較する。
+
+    uv run python scripts/bench_repository_concurrency.py --latency-ms 20 --concurrency 1 10 25 50
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from uuid import uuid4
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("SUPABASE_URL", "http://bench.local")
+os.environ.setdefault("SUPABASE_SERVICE_ROLE_KEY", "bench")
+
+from postgrest import SyncPostgrestClient  # noqa: E402
+from supabase import AsyncClient, AsyncClientOptions  # noqa: E402
+
+from app.core.config import get_settings  # noqa: E402
+from app.infrastructure.repositories.company_repository import CompanyRepository  # noqa: E402
+
+BASE_URL = "http://bench.local"
+
+
+def _rows() -> list[dict]:
+    now = datetime.now(timezone.utc).isoformat()
+    return [
+        {
+            "id": str(uuid4()),
+            "name": f"企業{i}",
+            "note": None,
+            "created_at": now,
+            "updated_at": now,
+            "deleted_flag": False,
+        }
+        for i in range(20)
+    ]
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+async def _measure(call, concurrency: int) -> list[float]:
+    # 全リクエストが同時に到着したとみなし、到着時刻からの完了時間を計測する
+    started = time.perf_counter()
+
+    async def one() -> float:
+        await call()
+        return (time.perf_counter() - started) * 1000
+
+    return await asyncio.gather(*(one() for _ in range(concurrency)))
+
+
+def _blocking_call(latency: float, rows: list[dict]):
+    def handler(request: httpx.Request) -> httpx.Response:
+        time.sleep(latency)
+        return httpx.Response(200, json=rows)
+
+    client = SyncPostgrestClient(
+        f"{BASE_URL}/rest/v1",
+        http_client=httpx.Client(transport=httpx.MockTransport(handler)),
+    )
+
+    async def call():
+        # 旧実装: async def内で同期クライアントを呼び出す
+        client.table("companies").select("*").eq("deleted_flag", False).execute()
+
+    return call
+
+
+def _async_call(latency: float, rows: list[dict]):
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(latency)
+        return httpx.Response(200, json=rows)
+
+    settings = get_settings()
+    http_client = httpx.AsyncClient(
+        transport=httpx.MockTransport(handler),
+        limits=httpx.Limits(
+            max_connections=settings.supabase_max_connections,
+            max_keepalive_connections=settings.supabase_max_keepalive_connections,
+        ),
+    )
+    repository = CompanyRepository()
+    repository.client = AsyncClient(
+        BASE_URL,
+        settings.supabase_service_role_key,
+        AsyncClientOptions(httpx_client=http_client),
+    )
+    return repository.find_all
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 10, 25, 50])
+    args = parser.parse_args()
+
+    latency = args.latency_ms / 1000
+    rows = _rows()
+    calls = {
+        "blocking": _blocking_call(latency, rows),
+        "async": _async_call(latency, rows),
+    }
+
+    print(f"{'mode':<10}{'concurrency':>12}{'p50 (ms)':>12}{'p99 (ms)':>12}")
+    for mode, call in calls.items():
+        for concurrency in args.concurrency:
+            latencies = await _measure(call, concurrency)
+            print(
+                f"{mode:<10}{concurrency:>12}"
+                f"{statistics.median(latencies):>12.1f}{_percentile(latencies, 99):>12.1f}"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,31 @@
+"""
+候補者ステージ集計テーブルの再構築
+
+トリガーで差分更新している candidate_stage_rollups を candidates から作り直し、
+ドリフト（手動でのデータ修正やトリガー無効化中の更新など）を解消する。
+
+    uv run python scripts/rebuild_candidate_rollups.py
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.infrastructure.database import close_supabase_client  # noqa: E402
+from app.infrastructure.repositories.candidate_rollup_repository import (  # noqa: E402
+    CandidateRollupRepository,
+)
+
+
+async def main() -> None:
+    try:
+        bucket_count = await CandidateRollupRepository().rebuild()
+        print(f"Rebuilt candidate_stage_rollups: {bucket_count} buckets")
+    finally:
+        await close_supabase_client()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,80 @@
+"""
+ローカル向けのClerk Webhook送信スクリプト
+
+CLERK_WEBHOOK_SECRET で署名した user.created / user.updated イベントを送信し、
+/api/v1/webhooks/clerk によるユーザー事前作成を確認する。
+
+    uv run python scripts/send_clerk_webhook.py --email taro@bandq.jp --first-name 太郎
+    uv run python scripts/send_clerk_webhook.py --type user.updated --clerk-id user_xxx \\
+        --email client@example.com --role client --company-id <company uuid>
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from uuid import uuid4
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.core.clerk import sign_webhook  # noqa: E402
+from app.core.config import get_settings  # noqa: E402
+
+
+def build_event(args: argparse.Namespace) -> dict:
+    email_id = f"idn_{uuid4().hex}"
+    public_metadata = {}
+    if args.role:
+        public_metadata["role"] = args.role
+    if args.company_id:
+        public_metadata["company_id"] = args.company_id
+    return {
+        "type": args.type,
+        "object": "event",
+        "data": {
+            "id": args.clerk_id or f"user_{uuid4().hex}",
+            "object": "user",
+            "first_name": args.first_name,
+            "last_name": args.last_name,
+            "primary_email_address_id": email_id,
+            "email_addresses": [{"id": email_id, "email_address": args.email}],
+            "public_metadata": public_metadata,
+        },
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://localhost:8000/api/v1/webhooks/clerk")
+    parser.add_argument("--secret", default=None, help="省略時は CLERK_WEBHOOK_SECRET")
+    parser.add_argument("--type", default="user.created", choices=["user.created", "user.updated"])
+    parser.add_argument("--clerk-id", default=None)
+    parser.add_argument("--email", required=True)
+    parser.add_argument("--first-name", default="")
+    parser.add_argument("--last-name", default="")
+    parser.add_argument("--role", default=None)
+    parser.add_argument("--company-id", default=None)
+    args = parser.parse_args()
+
+    secret = args.secret or get_settings().clerk_webhook_secret
+    if not secret:
+        parser.error("--secret または CLERK_WEBHOOK_SECRET を指定してください")
+
+    body = json.dumps(build_event(args), ensure_ascii=False).encode()
+    msg_id = f"msg_{uuid4().hex}"
+    timestamp = str(int(time.time()))
+    headers = {
+        "content-type": "application/json",
+        "svix-id": msg_id,
+        "svix-timestamp": timestamp,
+        "svix-signature": sign_webhook(secret, msg_id, timestamp, body),
+    }
+    response = httpx.post(args.url, content=body, headers=headers)
+    print(response.status_code, response.text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+import json
+from datetime import datetime, timezone
+from uuid import uuid4
+
+import httpx
+import pytest
+
+from app.core.config import get_settings
+from app.infrastructure import database
+
+
+class FakeUsersTable:
+    """PostgRESTの users テーブルの最小限の代役（clerk_id / email の一意制約を持つ）"""
+
+    def __init__(self):
+        self.rows: list[dict] = []
+        self.writes = 0
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        assert request.url.path == "/rest/v1/users"
+        filters = {
+            key: value.removeprefix("eq.")
+            for key, value in request.url.params.multi_items()
+            if value.startswith("eq.")
+        }
+        matched = [r for r in self.rows if all(str(r[k]) == v for k, v in filters.items())]
+
+        if request.method == "GET":
+            limit = request.url.params.get("limit")
+            return httpx.Response(200, json=matched[: int(limit)] if limit else matched)
+
+        self.writes += 1
+        body = json.loads(request.content)
+        if request.method == "PATCH":
+            for row in matched:
+                row.update(body)
+            return httpx.Response(200, json=matched)
+
+        upsert = "merge-duplicates" in request.headers.get("prefer", "")
+        created = []
+        for data in body if isinstance(body, list) else [body]:
+            existing = next((r for r in self.rows if r["clerk_id"] == data["clerk_id"]), None)
+            if upsert and existing is not None:
+                existing.update(data)
+                created.append(existing)
+                continue
+            conflict = any(
+                r["clerk_id"] == data["clerk_id"] or r["email"] == data["email"] for r in self.rows
+            )
+            if conflict:
+                return httpx.Response(
+                    409,
+                    json={
+                        "code": "23505",
+                        "message": "duplicate key value violates unique constraint",
+                        "details": None,
+                        "hint": None,
+                    },
+                )
+            now = datetime.now(timezone.utc).isoformat()
+            row = {"id": str(uuid4()), "created_at": now, "updated_at": now, **data}
+            self.rows.append(row)
+            created.append(row)
+        return httpx.Response(201, json=created)
+
+
+@pytest.fixture
+def settings_env(monkeypatch):
+    monkeypatch.setenv("SUPABASE_URL", "http://supabase.test")
+    monkeypatch.setenv("SUPABASE_SERVICE_ROLE_KEY", "service-role-key")
+    get_settings.cache_clear()
+    yield monkeypatch
+    get_settings.cache_clear()
+
+
+@pytest.fixture
+def users_table(settings_env):
+    """リポジトリが使うSupabaseクライアントの通信先を FakeUsersTable に差し替える"""
+    table = FakeUsersTable()
+    http_client = httpx.AsyncClient(transport=httpx.MockTransport(table))
+    database.get_supabase_client.cache_clear()
+    settings_env.setattr(database, "get_supabase_http_client", lambda: http_client)
+    yield table
+    database.get_supabase_client.cache_clear()
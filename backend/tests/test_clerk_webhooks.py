@@ -0,0 +1,118 @@
+import base64
+import json
+import time
+from uuid import uuid4
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.clerk import (
+    WEBHOOK_TOLERANCE_SECONDS,
+    WebhookVerificationError,
+    sign_webhook,
+    verify_webhook,
+)
+
+SECRET = "whsec_" + base64.b64encode(b"local-webhook-secret").decode()
+
+
+def signed_headers(body: bytes, msg_id: str | None = None, timestamp: int | None = None) -> dict:
+    """scripts/send_clerk_webhook.py と同じ形式のSvixヘッダー"""
+    msg_id = msg_id or f"msg_{uuid4().hex}"
+    sent_at = str(timestamp if timestamp is not None else int(time.time()))
+    return {
+        "content-type": "application/json",
+        "svix-id": msg_id,
+        "svix-timestamp": sent_at,
+        "svix-signature": sign_webhook(SECRET, msg_id, sent_at, body),
+    }
+
+
+def user_event(clerk_id: str, email: str, event_type: str = "user.created") -> bytes:
+    return json.dumps(
+        {
+            "type": event_type,
+            "object": "event",
+            "data": {
+                "id": clerk_id,
+                "object": "user",
+                "first_name": "太郎",
+                "last_name": "山田",
+                "primary_email_address_id": "idn_1",
+                "email_addresses": [{"id": "idn_1", "email_address": email}],
+                "public_metadata": {},
+            },
+        },
+        ensure_ascii=False,
+    ).encode()
+
+
+@pytest.fixture
+def client(users_table, settings_env):
+    settings_env.setenv("CLERK_WEBHOOK_SECRET", SECRET)
+    import main
+
+    return TestClient(main.app)
+
+
+def test_valid_signature_is_accepted():
+    body = user_event("user_1", "taro@bandq.jp")
+
+    event = verify_webhook(SECRET, signed_headers(body), body)
+
+    assert event["data"]["id"] == "user_1"
+
+
+def test_tampered_body_is_rejected():
+    body = user_event("user_1", "taro@bandq.jp")
+    headers = signed_headers(body)
+    tampered = body.replace(b"taro@bandq.jp", b"evil@bandq.jp")
+
+    with pytest.raises(WebhookVerificationError, match="Signature mismatch"):
+        verify_webhook(SECRET, headers, tampered)
+
+
+def test_stale_timestamp_is_rejected():
+    body = user_event("user_1", "taro@bandq.jp")
+    stale = int(time.time()) - WEBHOOK_TOLERANCE_SECONDS - 1
+
+    with pytest.raises(WebhookVerificationError, match="Timestamp outside tolerance"):
+        verify_webhook(SECRET, signed_headers(body, timestamp=stale), body)
+
+
+def test_replayed_message_is_not_processed_again(client, users_table):
+    body = user_event("user_replay", "replay@bandq.jp")
+    headers = signed_headers(body)
+
+    first = client.post("/api/v1/webhooks/clerk", content=body, headers=headers)
+    writes = users_table.writes
+    replayed = client.post("/api/v1/webhooks/clerk", content=body, headers=headers)
+
+    assert first.json()["status"] == "ok"
+    assert replayed.status_code == 200
+    assert replayed.json() == {"status": "duplicate"}
+    assert users_table.writes == writes
+
+
+def test_same_event_delivered_twice_does_not_duplicate_user(client, users_table):
+    # 別インスタンスへの再送などで svix-id の記録をすり抜けても、ユーザーは1件のまま
+    body = user_event("user_twice", "twice@bandq.jp")
+
+    first = client.post("/api/v1/webhooks/clerk", content=body, headers=signed_headers(body))
+    second = client.post("/api/v1/webhooks/clerk", content=body, headers=signed_headers(body))
+
+    assert first.json()["status"] == second.json()["status"] == "ok"
+    assert first.json()["user_id"] == second.json()["user_id"]
+    assert [r["clerk_id"] for r in users_table.rows] == ["user_twice"]
+
+
+def test_update_after_create_updates_the_same_user(client, users_table):
+    created = user_event("user_updated", "updated@bandq.jp")
+    updated = user_event("user_updated", "updated@bandq.jp", event_type="user.updated")
+    updated = updated.replace("太郎".encode(), "次郎".encode())
+
+    client.post("/api/v1/webhooks/clerk", content=created, headers=signed_headers(created))
+    client.post("/api/v1/webhooks/clerk", content=updated, headers=signed_headers(updated))
+
+    assert len(users_table.rows) == 1
+    assert users_table.rows[0]["name"] == "次郎 山田"
@@ -0,0 +1,68 @@
+import io
+from datetime import datetime, timezone
+from uuid import uuid4
+
+import pytest
+
+from app.application.dto.criteria import CriteriaGroupWithItems, CriteriaItemResponse
+
+pytest.importorskip("pyarrow")
+
+import pyarrow.parquet as pq  # noqa: E402
+
+from app.application.services.columnar_export import (  # noqa: E402
+    CANDIDATE_FIELDS,
+    ParquetChunkWriter,
+    build_schema,
+)
+
+NOW = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def criteria_group(label: str, item_labels: list[str]) -> CriteriaGroupWithItems:
+    group_id = uuid4()
+    return CriteriaGroupWithItems(
+        id=group_id,
+        job_position_id=uuid4(),
+        label=label,
+        description=None,
+        sort_order=0,
+        items=tuple(
+            CriteriaItemResponse(
+                id=uuid4(),
+                criteria_group_id=group_id,
+                label=item_label,
+                description=None,
+                behavior_examples_text=None,
+                sort_order=i,
+                is_active=True,
+                created_at=NOW,
+                updated_at=NOW,
+            )
+            for i, item_label in enumerate(item_labels)
+        ),
+    )
+
+
+def test_duplicate_criteria_labels_get_separate_score_columns():
+    groups = [criteria_group("主体性", ["行動", "行動", "発信"]), criteria_group("主体性", ["行動"])]
+    criteria = [(group, item) for group in groups for item in group.items]
+    schema = build_schema(criteria)
+    score_names = schema.names[len(CANDIDATE_FIELDS) :]
+
+    assert len(set(score_names)) == len(criteria)
+    assert "score:主体性/発信" in score_names
+
+    writer = ParquetChunkWriter(schema)
+    columns = {field.name: [None] for field in CANDIDATE_FIELDS}
+    columns.update({"candidate_id": ["c1"], "name": ["候補者"], "mismatch_flag": [False]})
+    columns.update({f"stage_{s}_result": ["未実施"] for s in ("0_5", "first", "second", "final")})
+    columns.update({"hire_status": ["選考中"], "created_at": [NOW]})
+    columns.update({name: [score] for score, name in enumerate(score_names, start=1)})
+    data = writer.write(columns) + writer.close()
+
+    table = pq.read_table(io.BytesIO(data))
+    for score, (name, (_, item)) in enumerate(zip(score_names, criteria), start=1):
+        field = table.schema.field(name)
+        assert field.metadata[b"criteria_item_id"] == str(item.id).encode()
+        assert table.column(name).to_pylist() == [score]
@@ -0,0 +1,93 @@
+from uuid import uuid4
+
+import httpx
+import pytest
+
+from app.infrastructure import database
+from app.infrastructure.repositories.interview_repository import (
+    InterviewDetailRepository,
+    InterviewQuestionResponseRepository,
+)
+
+MAX_ROWS = 5
+INTERVIEW_IDS = [str(uuid4()) for _ in range(2)]
+
+
+class FakeTable:
+    """max-rows で結果を切り詰めるPostgRESTのテーブルの代役（interview_id の in. 絞り込みのみ）"""
+
+    def __init__(self, name: str, rows: list[dict]):
+        self.name = name
+        self.rows = rows
+        self.requests = 0
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        assert request.url.path == f"/rest/v1/{self.name}"
+        self.requests += 1
+        params = request.url.params
+        ids = params["interview_id"].removeprefix("in.(").removesuffix(")").split(",")
+        matched = [r for r in self.rows if r["interview_id"] in ids]
+        for key in reversed(params["order"].split(",")):
+            matched.sort(key=lambda r: r[key.split(".")[0]])
+        offset = int(params.get("offset", 0))
+        limit = min(int(params.get("limit", MAX_ROWS)), MAX_ROWS)
+        return httpx.Response(200, json=matched[offset : offset + limit])
+
+
+def detail_row(interview_id: str) -> dict:
+    return {
+        "id": str(uuid4()),
+        "interview_id": interview_id,
+        "criteria_item_id": str(uuid4()),
+        "score_value": 3,
+        "comment_external": None,
+        "comment_internal": None,
+        "created_at": "2026-01-01T00:00:00+00:00",
+        "updated_at": "2026-01-01T00:00:00+00:00",
+    }
+
+
+def question_response_row(interview_id: str) -> dict:
+    # created_at が同じ行も id で順序が決まり、ページの境目で重複・欠落しない
+    return {
+        "id": str(uuid4()),
+        "interview_id": interview_id,
+        "question_text": "志望動機",
+        "created_at": "2026-01-01T00:00:00+00:00",
+        "updated_at": "2026-01-01T00:00:00+00:00",
+    }
+
+
+@pytest.fixture
+def serve_table(settings_env):
+    """リポジトリが使うSupabaseクライアントの通信先を FakeTable に差し替える"""
+
+    def serve(table: FakeTable) -> FakeTable:
+        http_client = httpx.AsyncClient(transport=httpx.MockTransport(table))
+        settings_env.setattr(database, "get_supabase_http_client", lambda: http_client)
+        return table
+
+    settings_env.setenv("SUPABASE_MAX_ROWS", str(MAX_ROWS))
+    database.get_supabase_client.cache_clear()
+    yield serve
+    database.get_supabase_client.cache_clear()
+
+
+async def test_find_details_by_interview_ids_reads_past_max_rows(serve_table):
+    rows = [detail_row(i) for i in INTERVIEW_IDS for _ in range(7)]
+    table = serve_table(FakeTable("interview_details", rows))
+
+    details = await InterviewDetailRepository().find_by_interview_ids(INTERVIEW_IDS)
+
+    assert sorted(str(d.id) for d in details) == sorted(r["id"] for r in rows)
+    assert table.requests == 3
+
+
+async def test_find_question_responses_by_interview_ids_reads_past_max_rows(serve_table):
+    rows = [question_response_row(i) for i in INTERVIEW_IDS for _ in range(6)]
+    table = serve_table(FakeTable("interview_question_responses", rows))
+
+    qrs = await InterviewQuestionResponseRepository().find_by_interview_ids(INTERVIEW_IDS)
+
+    assert sorted(str(q.id) for q in qrs) == sorted(r["id"] for r in rows)
+    assert table.requests == 3
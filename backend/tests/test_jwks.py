@@ -0,0 +1,58 @@
+import asyncio
+
+import httpx
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jose.backends import RSAKey
+
+from app.core.jwks import JWKSKeyManager
+
+
+class FakeJWKSEndpoint:
+    def __init__(self):
+        key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        self.jwk = RSAKey(key.public_key(), "RS256").to_dict() | {"kid": "key-1"}
+        self.available = True
+        self.calls = 0
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.calls += 1
+        if not self.available:
+            return httpx.Response(503)
+        return httpx.Response(200, json={"keys": [self.jwk]})
+
+
+def make_manager(endpoint: FakeJWKSEndpoint, ttl: float, interval: float) -> JWKSKeyManager:
+    return JWKSKeyManager(
+        "https://clerk.example.com",
+        ttl=ttl,
+        forced_refresh_interval=interval,
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(endpoint)),
+    )
+
+
+async def test_initial_fetch_failure_is_not_retried_per_request():
+    endpoint = FakeJWKSEndpoint()
+    endpoint.available = False
+    manager = make_manager(endpoint, ttl=3600, interval=60)
+
+    keys = await asyncio.gather(*(manager.get_key("key-1") for _ in range(20)))
+
+    assert keys == [None] * 20
+    assert endpoint.calls == 1
+
+
+async def test_expired_keys_are_kept_and_refresh_is_rate_limited_during_outage():
+    endpoint = FakeJWKSEndpoint()
+    manager = make_manager(endpoint, ttl=0.01, interval=60)
+    assert await manager.get_key("key-1") is not None
+
+    endpoint.available = False
+    await asyncio.sleep(0.02)
+    # 初回取得から強制再取得の間隔が過ぎた状態にする（TTL切れの再取得は1回だけ走る）
+    manager._last_attempt -= 60
+    for _ in range(50):
+        assert await manager.get_key("key-1") is not None
+        await asyncio.sleep(0)
+    await asyncio.sleep(0.01)
+
+    assert endpoint.calls == 2
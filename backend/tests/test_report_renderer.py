@@ -0,0 +1,44 @@
+import os
+
+import pytest
+
+from app.application.services import report_renderer
+from app.application.services.report_renderer import ReportRenderer, RenderWorkerCrashedError
+from app.infrastructure.cache import TTLCache
+
+
+def _crash(markdown: str) -> bytes:
+    # OOM killer や reportlab 内のセグフォでワーカーが落ちた状態を再現する
+    os._exit(1)
+
+
+@pytest.fixture
+def renderer():
+    renderer = ReportRenderer(
+        workers=1, queue_size=0, cache=TTLCache("test_rendered_reports", maxsize=8, ttl=60)
+    )
+    yield renderer
+    renderer.shutdown()
+
+
+async def test_worker_crash_fails_render_and_replaces_pool(renderer, monkeypatch):
+    monkeypatch.setitem(report_renderer.RENDERERS, "pdf", _crash)
+
+    with pytest.raises(RenderWorkerCrashedError):
+        await renderer.render("# 落ちる", "pdf")
+
+    # 壊れたプールは破棄され、以降の変換は新しいプールで成功する
+    assert renderer._executor is None
+    html = await renderer.render("# 評価レポート", "html")
+    assert "<h1>評価レポート</h1>" in html.decode()
+    assert not renderer._inflight
+
+
+async def test_crashed_render_is_not_cached(renderer, monkeypatch):
+    monkeypatch.setitem(report_renderer.RENDERERS, "html", _crash)
+    with pytest.raises(RenderWorkerCrashedError):
+        await renderer.render("# 評価レポート", "html")
+
+    monkeypatch.undo()
+    html = await renderer.render("# 評価レポート", "html")
+    assert "<h1>評価レポート</h1>" in html.decode()
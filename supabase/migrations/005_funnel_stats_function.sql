@@ -0,0 +1,47 @@
+-- Funnel statistics aggregated in the database (one row, no candidate rows over the wire)
+
+CREATE OR REPLACE FUNCTION get_funnel_stats(
+    p_company_id UUID DEFAULT NULL,
+    p_job_position_id UUID DEFAULT NULL,
+    p_agent_id UUID DEFAULT NULL,
+    p_created_from TIMESTAMPTZ DEFAULT NULL,
+    p_created_to TIMESTAMPTZ DEFAULT NULL
+)
+RETURNS TABLE (
+    total BIGINT,
+    stage_0_5_done BIGINT,
+    stage_0_5_passed BIGINT,
+    stage_first_done BIGINT,
+    stage_first_passed BIGINT,
+    stage_second_done BIGINT,
+    stage_second_passed BIGINT,
+    stage_final_done BIGINT,
+    stage_final_offer BIGINT,
+    hired BIGINT,
+    mismatch BIGINT
+)
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT
+        count(*),
+        count(*) FILTER (WHERE stage_0_5_result <> 'not_done'),
+        count(*) FILTER (WHERE stage_0_5_result = 'passed'),
+        count(*) FILTER (WHERE stage_first_result <> 'not_done'),
+        count(*) FILTER (WHERE stage_first_result = 'passed'),
+        count(*) FILTER (WHERE stage_second_result <> 'not_done'),
+        count(*) FILTER (WHERE stage_second_result = 'passed'),
+        count(*) FILTER (WHERE stage_final_result <> 'not_done'),
+        count(*) FILTER (WHERE stage_final_result = 'offer'),
+        count(*) FILTER (WHERE hire_status = 'hired'),
+        count(*) FILTER (WHERE mismatch_flag)
+    FROM candidates
+    WHERE deleted_flag = FALSE
+      AND (p_company_id IS NULL OR company_id = p_company_id)
+      AND (p_job_position_id IS NULL OR job_position_id = p_job_position_id)
+      AND (p_agent_id IS NULL OR agent_id = p_agent_id)
+      AND (p_created_from IS NULL OR created_at >= p_created_from)
+      AND (p_created_to IS NULL OR created_at < p_created_to);
+$$;
+
+GRANT EXECUTE ON FUNCTION get_funnel_stats(UUID, UUID, UUID, TIMESTAMPTZ, TIMESTAMPTZ) TO service_role;
@@ -0,0 +1,261 @@
+-- Pre-aggregated candidate stage counters per (company, position, agent, month)
+--
+-- Each candidate contributes to two buckets:
+--   * its created_at month: total / active / pending / stage counters (funnel and monthly intake)
+--   * its updated_at month: hired_updated / mismatch_updated (monthly hired / mismatch)
+-- Counters are maintained by a trigger on candidates; rebuild_candidate_rollups() reconciles drift.
+
+CREATE TABLE candidate_stage_rollups (
+    company_id UUID NOT NULL,
+    job_position_id UUID NOT NULL,
+    agent_id UUID,
+    month DATE NOT NULL,
+    total INTEGER NOT NULL DEFAULT 0,
+    active INTEGER NOT NULL DEFAULT 0,
+    pending_interviews INTEGER NOT NULL DEFAULT 0,
+    stage_0_5_done INTEGER NOT NULL DEFAULT 0,
+    stage_0_5_passed INTEGER NOT NULL DEFAULT 0,
+    stage_first_done INTEGER NOT NULL DEFAULT 0,
+    stage_first_passed INTEGER NOT NULL DEFAULT 0,
+    stage_second_done INTEGER NOT NULL DEFAULT 0,
+    stage_second_passed INTEGER NOT NULL DEFAULT 0,
+    stage_final_done INTEGER NOT NULL DEFAULT 0,
+    stage_final_offer INTEGER NOT NULL DEFAULT 0,
+    hired INTEGER NOT NULL DEFAULT 0,
+    mismatch INTEGER NOT NULL DEFAULT 0,
+    hired_updated INTEGER NOT NULL DEFAULT 0,
+    mismatch_updated INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    CONSTRAINT candidate_stage_rollups_key
+        UNIQUE NULLS NOT DISTINCT (company_id, job_position_id, agent_id, month)
+);
+
+CREATE INDEX idx_candidate_stage_rollups_month ON candidate_stage_rollups(month);
+
+ALTER TABLE candidate_stage_rollups ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Service role full access on candidate_stage_rollups"
+    ON candidate_stage_rollups FOR ALL
+    TO service_role
+    USING (true)
+    WITH CHECK (true);
+
+-- Add (direction = 1) or remove (direction = -1) one candidate's contribution
+CREATE OR REPLACE FUNCTION apply_candidate_rollup(c candidates, direction INTEGER)
+RETURNS VOID
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    IF c.deleted_flag THEN
+        RETURN;
+    END IF;
+
+    INSERT INTO candidate_stage_rollups AS r (
+        company_id, job_position_id, agent_id, month,
+        total, active, pending_interviews,
+        stage_0_5_done, stage_0_5_passed,
+        stage_first_done, stage_first_passed,
+        stage_second_done, stage_second_passed,
+        stage_final_done, stage_final_offer,
+        hired, mismatch
+    )
+    VALUES (
+        c.company_id, c.job_position_id, c.agent_id,
+        date_trunc('month', c.created_at AT TIME ZONE 'UTC')::date,
+        direction,
+        direction * (c.hire_status = 'undecided' AND c.stage_final_result <> 'rejected')::int,
+        direction * (c.stage_0_5_result = 'not_done' AND c.stage_0_5_date IS NOT NULL)::int,
+        direction * (c.stage_0_5_result <> 'not_done')::int,
+        direction * (c.stage_0_5_result = 'passed')::int,
+        direction * (c.stage_first_result <> 'not_done')::int,
+        direction * (c.stage_first_result = 'passed')::int,
+        direction * (c.stage_second_result <> 'not_done')::int,
+        direction * (c.stage_second_result = 'passed')::int,
+        direction * (c.stage_final_result <> 'not_done')::int,
+        direction * (c.stage_final_result = 'offer')::int,
+        direction * (c.hire_status = 'hired')::int,
+        direction * c.mismatch_flag::int
+    )
+    ON CONFLICT ON CONSTRAINT candidate_stage_rollups_key DO UPDATE SET
+        total = r.total + EXCLUDED.total,
+        active = r.active + EXCLUDED.active,
+        pending_interviews = r.pending_interviews + EXCLUDED.pending_interviews,
+        stage_0_5_done = r.stage_0_5_done + EXCLUDED.stage_0_5_done,
+        stage_0_5_passed = r.stage_0_5_passed + EXCLUDED.stage_0_5_passed,
+        stage_first_done = r.stage_first_done + EXCLUDED.stage_first_done,
+        stage_first_passed = r.stage_first_passed + EXCLUDED.stage_first_passed,
+        stage_second_done = r.stage_second_done + EXCLUDED.stage_second_done,
+        stage_second_passed = r.stage_second_passed + EXCLUDED.stage_second_passed,
+        stage_final_done = r.stage_final_done + EXCLUDED.stage_final_done,
+        stage_final_offer = r.stage_final_offer + EXCLUDED.stage_final_offer,
+        hired = r.hired + EXCLUDED.hired,
+        mismatch = r.mismatch + EXCLUDED.mismatch,
+        updated_at = NOW();
+
+    INSERT INTO candidate_stage_rollups AS r (
+        company_id, job_position_id, agent_id, month, hired_updated, mismatch_updated
+    )
+    VALUES (
+        c.company_id, c.job_position_id, c.agent_id,
+        date_trunc('month', c.updated_at AT TIME ZONE 'UTC')::date,
+        direction * (c.hire_status = 'hired')::int,
+        direction * c.mismatch_flag::int
+    )
+    ON CONFLICT ON CONSTRAINT candidate_stage_rollups_key DO UPDATE SET
+        hired_updated = r.hired_updated + EXCLUDED.hired_updated,
+        mismatch_updated = r.mismatch_updated + EXCLUDED.mismatch_updated,
+        updated_at = NOW();
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION candidates_rollup_trigger()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    IF TG_OP = 'UPDATE'
+        AND (
+            OLD.company_id, OLD.job_position_id, OLD.agent_id, OLD.deleted_flag,
+            OLD.stage_0_5_result, OLD.stage_0_5_date, OLD.stage_first_result,
+            OLD.stage_second_result, OLD.stage_final_result, OLD.hire_status, OLD.mismatch_flag,
+            date_trunc('month', OLD.created_at AT TIME ZONE 'UTC'),
+            date_trunc('month', OLD.updated_at AT TIME ZONE 'UTC')
+        ) IS NOT DISTINCT FROM (
+            NEW.company_id, NEW.job_position_id, NEW.agent_id, NEW.deleted_flag,
+            NEW.stage_0_5_result, NEW.stage_0_5_date, NEW.stage_first_result,
+            NEW.stage_second_result, NEW.stage_final_result, NEW.hire_status, NEW.mismatch_flag,
+            date_trunc('month', NEW.created_at AT TIME ZONE 'UTC'),
+            date_trunc('month', NEW.updated_at AT TIME ZONE 'UTC')
+        )
+    THEN
+        RETURN NULL;
+    END IF;
+
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM apply_candidate_rollup(OLD, -1);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM apply_candidate_rollup(NEW, 1);
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+CREATE TRIGGER candidates_stage_rollup
+    AFTER INSERT OR UPDATE OR DELETE ON candidates
+    FOR EACH ROW EXECUTE FUNCTION candidates_rollup_trigger();
+
+-- Recompute every bucket from candidates (drift reconciliation). Returns the number of buckets.
+CREATE OR REPLACE FUNCTION rebuild_candidate_rollups()
+RETURNS INTEGER
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    bucket_count INTEGER;
+BEGIN
+    LOCK TABLE candidates IN SHARE MODE;
+    DELETE FROM candidate_stage_rollups;
+
+    INSERT INTO candidate_stage_rollups (
+        company_id, job_position_id, agent_id, month,
+        total, active, pending_interviews,
+        stage_0_5_done, stage_0_5_passed,
+        stage_first_done, stage_first_passed,
+        stage_second_done, stage_second_passed,
+        stage_final_done, stage_final_offer,
+        hired, mismatch, hired_updated, mismatch_updated
+    )
+    SELECT
+        company_id, job_position_id, agent_id, month,
+        sum(total), sum(active), sum(pending_interviews),
+        sum(stage_0_5_done), sum(stage_0_5_passed),
+        sum(stage_first_done), sum(stage_first_passed),
+        sum(stage_second_done), sum(stage_second_passed),
+        sum(stage_final_done), sum(stage_final_offer),
+        sum(hired), sum(mismatch), sum(hired_updated), sum(mismatch_updated)
+    FROM (
+        SELECT
+            company_id, job_position_id, agent_id,
+            date_trunc('month', created_at AT TIME ZONE 'UTC')::date AS month,
+            1 AS total,
+            (hire_status = 'undecided' AND stage_final_result <> 'rejected')::int AS active,
+            (stage_0_5_result = 'not_done' AND stage_0_5_date IS NOT NULL)::int AS pending_interviews,
+            (stage_0_5_result <> 'not_done')::int AS stage_0_5_done,
+            (stage_0_5_result = 'passed')::int AS stage_0_5_passed,
+            (stage_first_result <> 'not_done')::int AS stage_first_done,
+            (stage_first_result = 'passed')::int AS stage_first_passed,
+            (stage_second_result <> 'not_done')::int AS stage_second_done,
+            (stage_second_result = 'passed')::int AS stage_second_passed,
+            (stage_final_result <> 'not_done')::int AS stage_final_done,
+            (stage_final_result = 'offer')::int AS stage_final_offer,
+            (hire_status = 'hired')::int AS hired,
+            mismatch_flag::int AS mismatch,
+            0 AS hired_updated,
+            0 AS mismatch_updated
+        FROM candidates
+        WHERE deleted_flag = FALSE
+        UNION ALL
+        SELECT
+            company_id, job_position_id, agent_id,
+            date_trunc('month', updated_at AT TIME ZONE 'UTC')::date,
+            0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+            (hire_status = 'hired')::int,
+            mismatch_flag::int
+        FROM candidates
+        WHERE deleted_flag = FALSE
+    ) contributions
+    GROUP BY company_id, job_position_id, agent_id, month;
+
+    GET DIAGNOSTICS bucket_count = ROW_COUNT;
+    RETURN bucket_count;
+END;
+$$;
+
+-- All-time totals summed over the buckets (funnel, active and pending counts)
+CREATE OR REPLACE FUNCTION get_candidate_rollup_totals(
+    p_company_id UUID DEFAULT NULL,
+    p_job_position_id UUID DEFAULT NULL,
+    p_agent_id UUID DEFAULT NULL
+)
+RETURNS TABLE (
+    total BIGINT,
+    active BIGINT,
+    pending_interviews BIGINT,
+    stage_0_5_done BIGINT,
+    stage_0_5_passed BIGINT,
+    stage_first_done BIGINT,
+    stage_first_passed BIGINT,
+    stage_second_done BIGINT,
+    stage_second_passed BIGINT,
+    stage_final_done BIGINT,
+    stage_final_offer BIGINT,
+    hired BIGINT,
+    mismatch BIGINT
+)
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT
+        coalesce(sum(total), 0)::bigint,
+        coalesce(sum(active), 0)::bigint,
+        coalesce(sum(pending_interviews), 0)::bigint,
+        coalesce(sum(stage_0_5_done), 0)::bigint,
+        coalesce(sum(stage_0_5_passed), 0)::bigint,
+        coalesce(sum(stage_first_done), 0)::bigint,
+        coalesce(sum(stage_first_passed), 0)::bigint,
+        coalesce(sum(stage_second_done), 0)::bigint,
+        coalesce(sum(stage_second_passed), 0)::bigint,
+        coalesce(sum(stage_final_done), 0)::bigint,
+        coalesce(sum(stage_final_offer), 0)::bigint,
+        coalesce(sum(hired), 0)::bigint,
+        coalesce(sum(mismatch), 0)::bigint
+    FROM candidate_stage_rollups
+    WHERE (p_company_id IS NULL OR company_id = p_company_id)
+      AND (p_job_position_id IS NULL OR job_position_id = p_job_position_id)
+      AND (p_agent_id IS NULL OR agent_id = p_agent_id);
+$$;
+
+GRANT EXECUTE ON FUNCTION rebuild_candidate_rollups() TO service_role;
+GRANT EXECUTE ON FUNCTION get_candidate_rollup_totals(UUID, UUID, UUID) TO service_role;
+
+SELECT rebuild_candidate_rollups();
@@ -0,0 +1,42 @@
+-- Per-agent referral statistics in one grouped query
+
+CREATE OR REPLACE FUNCTION get_agent_stats(
+    p_company_id UUID DEFAULT NULL,
+    p_created_from TIMESTAMPTZ DEFAULT NULL,
+    p_created_to TIMESTAMPTZ DEFAULT NULL
+)
+RETURNS TABLE (
+    id UUID,
+    company_name VARCHAR,
+    contact_name VARCHAR,
+    referral_count BIGINT,
+    stage_0_5_pass_rate NUMERIC,
+    final_offer_rate NUMERIC,
+    mismatch_rate NUMERIC
+)
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT
+        a.id,
+        a.company_name,
+        a.contact_name,
+        count(c.id),
+        coalesce(round(100.0 * count(c.id) FILTER (WHERE c.stage_0_5_result = 'passed') / nullif(count(c.id), 0), 1), 0),
+        coalesce(round(100.0 * count(c.id) FILTER (WHERE c.stage_final_result = 'offer') / nullif(count(c.id), 0), 1), 0),
+        coalesce(round(100.0 * count(c.id) FILTER (WHERE c.mismatch_flag) / nullif(count(c.id), 0), 1), 0)
+    FROM agents a
+    LEFT JOIN candidates c
+        ON c.agent_id = a.id
+       AND c.deleted_flag = FALSE
+       AND (p_company_id IS NULL OR c.company_id = p_company_id)
+       AND (p_created_from IS NULL OR c.created_at >= p_created_from)
+       AND (p_created_to IS NULL OR c.created_at < p_created_to)
+    WHERE a.deleted_flag = FALSE
+    GROUP BY a.id, a.company_name, a.contact_name
+    -- Same order as the previous per-agent loop over AgentRepository.find_all
+    -- (company_name); id breaks ties so the leaderboard is stable across calls
+    ORDER BY a.company_name, a.id;
+$$;
+
+GRANT EXECUTE ON FUNCTION get_agent_stats(UUID, TIMESTAMPTZ, TIMESTAMPTZ) TO service_role;
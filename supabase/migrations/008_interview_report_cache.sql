@@ -0,0 +1,73 @@
+-- Persisted report cache on interviews
+--
+-- client_report_markdown / agent_report_markdown hold the last rendered report together with a
+-- fingerprint of the inputs it was rendered from. get_interview_report_cache() returns the stored
+-- reports and the current fingerprint in one call, so a cached report is served only while
+-- the interview, its details and Q&A, the candidate/company/position and the criteria are unchanged.
+
+ALTER TABLE interviews
+    ADD COLUMN IF NOT EXISTS client_report_fingerprint TEXT,
+    ADD COLUMN IF NOT EXISTS agent_report_fingerprint TEXT;
+
+-- Storing a rendered report must not bump updated_at (it is part of the fingerprint)
+CREATE OR REPLACE FUNCTION update_interviews_updated_at_column()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF to_jsonb(NEW) - ARRAY[
+        'client_report_markdown', 'agent_report_markdown',
+        'client_report_fingerprint', 'agent_report_fingerprint', 'updated_at'
+    ] IS DISTINCT FROM to_jsonb(OLD) - ARRAY[
+        'client_report_markdown', 'agent_report_markdown',
+        'client_report_fingerprint', 'agent_report_fingerprint', 'updated_at'
+    ] THEN
+        NEW.updated_at = NOW();
+    ELSE
+        NEW.updated_at = OLD.updated_at;
+    END IF;
+    RETURN NEW;
+END;
+$$ language 'plpgsql';
+
+DROP TRIGGER IF EXISTS update_interviews_updated_at ON interviews;
+CREATE TRIGGER update_interviews_updated_at BEFORE UPDATE ON interviews FOR EACH ROW EXECUTE FUNCTION update_interviews_updated_at_column();
+
+CREATE OR REPLACE FUNCTION get_interview_report_cache(p_interview_id UUID)
+RETURNS TABLE (
+    client_report_markdown TEXT,
+    client_report_fingerprint TEXT,
+    agent_report_markdown TEXT,
+    agent_report_fingerprint TEXT,
+    current_fingerprint TEXT
+)
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT
+        i.client_report_markdown,
+        i.client_report_fingerprint,
+        i.agent_report_markdown,
+        i.agent_report_fingerprint,
+        md5(concat_ws('|',
+            i.updated_at,
+            c.updated_at,
+            co.updated_at,
+            jp.updated_at,
+            (SELECT concat(count(*), ':', max(d.updated_at))
+               FROM interview_details d WHERE d.interview_id = i.id),
+            (SELECT concat(count(*), ':', max(q.updated_at))
+               FROM interview_question_responses q WHERE q.interview_id = i.id),
+            (SELECT concat(count(*), ':', max(g.updated_at))
+               FROM criteria_groups g WHERE g.job_position_id = c.job_position_id),
+            (SELECT concat(count(*), ':', max(ci.updated_at))
+               FROM criteria_items ci
+               JOIN criteria_groups g ON g.id = ci.criteria_group_id
+              WHERE g.job_position_id = c.job_position_id)
+        ))
+    FROM interviews i
+    JOIN candidates c ON c.id = i.candidate_id
+    LEFT JOIN companies co ON co.id = c.company_id
+    LEFT JOIN job_positions jp ON jp.id = c.job_position_id
+    WHERE i.id = p_interview_id;
+$$;
+
+GRANT EXECUTE ON FUNCTION get_interview_report_cache(UUID) TO service_role;
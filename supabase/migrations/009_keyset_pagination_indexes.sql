@@ -0,0 +1,17 @@
+-- Keyset pagination indexes for list endpoints
+-- Pages are read in (created_at DESC, id DESC) order starting right after the cursor row
+
+CREATE INDEX IF NOT EXISTS idx_candidates_keyset
+    ON candidates(created_at DESC, id DESC)
+    WHERE deleted_flag = false;
+
+CREATE INDEX IF NOT EXISTS idx_companies_keyset
+    ON companies(created_at DESC, id DESC)
+    WHERE deleted_flag = false;
+
+CREATE INDEX IF NOT EXISTS idx_agents_keyset
+    ON agents(created_at DESC, id DESC)
+    WHERE deleted_flag = false;
+
+CREATE INDEX IF NOT EXISTS idx_interviews_keyset
+    ON interviews(created_at DESC, id DESC);
@@ -0,0 +1,97 @@
+-- Incremental (delta) export
+--
+-- A sync reads the rows whose updated_at falls in (since, until] in (updated_at, id) order.
+-- until comes from delta_export_watermark(): it lags NOW() a little so rows written by
+-- transactions that are still open (updated_at = their start time) are picked up next time
+-- instead of being skipped.
+--
+-- Hard-deleted rows leave no trace in their table, so deletions are logged to deleted_records
+-- by a trigger. Soft-deleted candidates (deleted_flag) are read from candidates itself; their
+-- interviews, details and Q&A are logged to deleted_records when the flag is set.
+--
+-- deleted_records is purged by purge_deleted_records(). Consumers must sync at least once per
+-- maximum sync gap (delta_export_max_gap_days); an older since is rejected and needs a full sync.
+
+CREATE INDEX IF NOT EXISTS idx_candidates_updated_at ON candidates(updated_at, id);
+CREATE INDEX IF NOT EXISTS idx_interviews_updated_at ON interviews(updated_at, id);
+CREATE INDEX IF NOT EXISTS idx_interview_details_updated_at ON interview_details(updated_at, id);
+CREATE INDEX IF NOT EXISTS idx_interview_qr_updated_at ON interview_question_responses(updated_at, id);
+
+CREATE TABLE deleted_records (
+    id BIGINT GENERATED ALWAYS AS IDENTITY PRIMARY KEY,
+    table_name TEXT NOT NULL,
+    record_id UUID NOT NULL,
+    deleted_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX idx_deleted_records_deleted_at ON deleted_records(deleted_at, id);
+
+ALTER TABLE deleted_records ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Service role full access on deleted_records"
+    ON deleted_records FOR ALL
+    TO service_role
+    USING (true)
+    WITH CHECK (true);
+
+CREATE OR REPLACE FUNCTION record_deletion()
+RETURNS TRIGGER AS $$
+BEGIN
+    INSERT INTO deleted_records (table_name, record_id) VALUES (TG_TABLE_NAME, OLD.id);
+    RETURN OLD;
+END;
+$$ language 'plpgsql';
+
+-- Cascaded deletes (candidate -> interview -> details / Q&A) fire these as well
+CREATE TRIGGER record_candidates_deletion AFTER DELETE ON candidates FOR EACH ROW EXECUTE FUNCTION record_deletion();
+CREATE TRIGGER record_interviews_deletion AFTER DELETE ON interviews FOR EACH ROW EXECUTE FUNCTION record_deletion();
+CREATE TRIGGER record_interview_details_deletion AFTER DELETE ON interview_details FOR EACH ROW EXECUTE FUNCTION record_deletion();
+CREATE TRIGGER record_interview_qr_deletion AFTER DELETE ON interview_question_responses FOR EACH ROW EXECUTE FUNCTION record_deletion();
+
+-- Soft-deleting a candidate does not touch its children, so log tombstones for them here
+CREATE OR REPLACE FUNCTION record_candidate_soft_deletion()
+RETURNS TRIGGER AS $$
+BEGIN
+    INSERT INTO deleted_records (table_name, record_id)
+    SELECT 'interviews', i.id FROM interviews i WHERE i.candidate_id = NEW.id
+    UNION ALL
+    SELECT 'interview_details', d.id
+    FROM interview_details d JOIN interviews i ON i.id = d.interview_id
+    WHERE i.candidate_id = NEW.id
+    UNION ALL
+    SELECT 'interview_question_responses', q.id
+    FROM interview_question_responses q JOIN interviews i ON i.id = q.interview_id
+    WHERE i.candidate_id = NEW.id;
+    RETURN NEW;
+END;
+$$ language 'plpgsql';
+
+CREATE TRIGGER record_candidates_soft_deletion
+    AFTER UPDATE OF deleted_flag ON candidates
+    FOR EACH ROW
+    WHEN (NEW.deleted_flag AND NOT OLD.deleted_flag)
+    EXECUTE FUNCTION record_candidate_soft_deletion();
+
+-- Upper bound for the next delta window, taken from the database clock
+CREATE OR REPLACE FUNCTION delta_export_watermark(p_lag_seconds INTEGER)
+RETURNS TIMESTAMPTZ
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT NOW() - make_interval(secs => p_lag_seconds);
+$$;
+
+GRANT EXECUTE ON FUNCTION delta_export_watermark(INTEGER) TO service_role;
+
+-- Drop deletion records older than p_before; returns the number of rows removed
+CREATE OR REPLACE FUNCTION purge_deleted_records(p_before TIMESTAMPTZ)
+RETURNS BIGINT
+LANGUAGE sql
+AS $$
+    WITH purged AS (
+        DELETE FROM deleted_records WHERE deleted_at < p_before RETURNING 1
+    )
+    SELECT count(*) FROM purged;
+$$;
+
+GRANT EXECUTE ON FUNCTION purge_deleted_records(TIMESTAMPTZ) TO service_role;